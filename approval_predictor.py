@@ -4,17 +4,414 @@ Análise Preditiva de Chances de Aprovação
 Avalia uma proposta e estima probabilidade de aprovação baseado em critérios históricos
 """
 
+import argparse
+import csv
+import glob
+import hashlib
 import json
+import math
+import os
 import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import re
 
+# Tentar importar NumPy (varredura vetorizada de pesos)
+NUMPY_AVAILABLE = False
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+# Palavras-chave procuradas nos documentos, por critério
+CRITERIA_KEYWORDS = {
+    "alignment_score": [
+        "atende", "requisitos", "elegível", "elegibilidade", "pontuação", "go", "no-go"
+    ],
+    "budget_adequacy": [
+        "orçamento", "pessoal", "material", "serviço", "equipamento", "justificat", "orçament"
+    ],
+    "team_qualification": [
+        "coordenador", "coordenação", "qualificação", "currículo", "experiência",
+        "equipe técnica", "responsável"
+    ],
+    "innovation": [
+        "inovação", "inovador", "novo", "inédito",
+        "tecnologia", "metodologia inovadora", "abordagem diferenciada"
+    ],
+    "social_impact": [
+        "beneficiários", "impacto social", "transformação social", "ods",
+        "objetivos de desenvolvimento", "indicadores"
+    ],
+    "sustainability": [
+        "sustentabilidade", "continuidade", "longo prazo", "parcerias", "parceiros"
+    ],
+}
+
+# Padrões (regex) procurados junto com as palavras-chave
+CRITERIA_PATTERNS = {
+    "beneficiarios_quantificados": r'(?<!\d)\d+\s*(?:pessoas|beneficiários|famílias)',
+}
+
+
+def _trie_regex(words: List[str]) -> str:
+    """
+    Monta uma regex em forma de trie para um conjunto de palavras
+    
+    Prefixos comuns são fatorados (ex.: "orçament(?:o)?"), de modo que em cada
+    posição o motor de regex percorre um único ramo em vez de testar cada
+    palavra. Quando várias palavras casam na mesma posição, vence a mais longa.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+    
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+    
+    return build(trie)
+
+
+class KeywordScanner:
+    """
+    Busca simultânea de várias palavras-chave com uma única regex compilada
+    
+    Cada posição do texto é testada uma vez (lookahead de largura zero), de
+    modo que ocorrências sobrepostas também são encontradas, com a mesma
+    semântica de `palavra in texto` / `texto.count(palavra)`.
+    """
+    
+    def __init__(self, keywords: List[str], patterns: Optional[Dict[str, str]] = None):
+        self._keywords = sorted(set(keywords))
+        self._patterns = [(label, re.compile(pattern)) for label, pattern in (patterns or {}).items()]
+        alternatives = [f"({_trie_regex(self._keywords)})"]
+        # Padrões não podem começar como uma palavra-chave (teriam a mesma posição)
+        if self._patterns:
+            alternatives.append("(" + "|".join(f"(?:{p.pattern})" for _, p in self._patterns) + ")")
+        self._regex = re.compile("(?=" + "|".join(alternatives) + ")")
+        # Numa posição, todas as palavras que casam são prefixos da mais longa
+        self._prefixes = {
+            keyword: [other for other in self._keywords if other != keyword and keyword.startswith(other)]
+            for keyword in self._keywords
+        }
+    
+    def scan(self, text: str) -> Counter:
+        """
+        Conta as ocorrências de todas as palavras-chave e padrões em uma passada
+        
+        Returns:
+            Counter palavra-chave/rótulo do padrão -> número de ocorrências
+        """
+        counts: Counter = Counter()
+        for match in self._regex.finditer(text):
+            keyword = match.group(1)
+            if keyword:
+                counts[keyword] += 1
+                for prefix in self._prefixes[keyword]:
+                    counts[prefix] += 1
+                continue
+            found = match.group(2)
+            for label, pattern in self._patterns:
+                if pattern.fullmatch(found):
+                    counts[label] += 1
+                    break
+        return counts
+
+
+# Critério -> (arquivo de fase analisado, método de análise), na ordem do relatório
+CRITERIA_ANALYZERS = [
+    ("alignment_score", "fase1", "_analyze_alignment"),
+    ("budget_adequacy", "fase4", "_analyze_budget"),
+    ("team_qualification", "fase4", "_analyze_team"),
+    ("innovation", "fase3", "_analyze_innovation"),
+    ("social_impact", "fase3", "_analyze_social_impact"),
+    ("sustainability", "fase3", "_analyze_sustainability"),
+]
+
+CRITERIA = [criterion for criterion, _, _ in CRITERIA_ANALYZERS]
+
+# Classificações em ordem crescente de probabilidade (ver _classify_probability)
+CLASSIFICATION_LABELS = ["BAIXA", "MÉDIA", "MÉDIA-ALTA", "ALTA"]
+
+# Versão das regras de pontuação; altere ao mudar a lógica dos _analyze_*
+# para invalidar scores em cache
+SCORING_VERSION = 1
+
+DEFAULT_SCORE_CACHE = "memories/cache/approval_scores.json"
+
+
+def resolve_score_cache(cache_path: Optional[str], paths: List[str]) -> Optional[str]:
+    """
+    Localiza o cache de scores padrão no workspace dos projetos analisados
+
+    DEFAULT_SCORE_CACHE é relativo à raiz do workspace: o diretório atual, se
+    tiver memories/, ou o diretório que contém a pasta memories/ de `paths`.
+    Fora de um workspace o cache não é usado, para não criar memories/ em
+    qualquer diretório. Um caminho informado com --cache é usado como está.
+    
+    Returns:
+        Caminho do cache, ou None para analisar sem cache
+    """
+    if cache_path != DEFAULT_SCORE_CACHE or Path("memories").is_dir():
+        return cache_path
+    for pattern in paths:
+        path = Path(pattern).absolute()
+        for candidate in (path, *path.parents):
+            if candidate.name == "memories" and candidate.is_dir():
+                return str(candidate.parent / DEFAULT_SCORE_CACHE)
+    return None
+
+
+def _scoring_fingerprint() -> str:
+    """Identifica as regras de pontuação (palavras-chave, padrões e versão)"""
+    rules = json.dumps([SCORING_VERSION, CRITERIA_KEYWORDS, CRITERIA_PATTERNS], sort_keys=True)
+    return hashlib.sha256(rules.encode("utf-8")).hexdigest()
+
+
+class ScoreCache:
+    """
+    Cache em disco dos scores por critério, indexado pelo conteúdo de cada arquivo de fase
+    
+    Os scores dependem apenas do texto do arquivo e das regras de pontuação;
+    pesos e limiares são aplicados depois (`analyze_scores`) e, por isso, não
+    invalidam o cache. Para evitar reler arquivos inalterados, o hash de cada
+    caminho é reaproveitado enquanto tamanho e mtime não mudarem.
+    
+    Ao salvar, entradas de arquivos removidos ou alterados (e os scores que só
+    elas referenciavam) são descartadas, para que o cache não cresça sem limite.
+    """
+    
+    def __init__(self, path: str = DEFAULT_SCORE_CACHE, data: Optional[Dict] = None):
+        """
+        Args:
+            path: Arquivo do cache
+            data: Conteúdo já carregado (`snapshot()` de outro ScoreCache); evita
+                reler o JSON, ex.: em cada processo do pool
+        """
+        self.path = Path(path)
+        self.files: Dict[str, Dict] = {}
+        self.scores: Dict[str, Dict[str, float]] = {}
+        self._new_files: Dict[str, Dict] = {}
+        self._new_scores: Dict[str, Dict[str, float]] = {}
+        if data is None:
+            self._load()
+        else:
+            self.files = dict(data.get("files", {}))
+            self.scores = dict(data.get("scores", {}))
+    
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            print(f"Aviso: Erro ao carregar cache de scores: {e}", file=sys.stderr)
+            return
+        if data.get("scoring") != _scoring_fingerprint():
+            return
+        self.files = data.get("files", {})
+        self.scores = data.get("scores", {})
+    
+    def lookup(self, fase: str, filepath: str) -> Tuple[Optional[str], Optional[Dict[str, float]]]:
+        """
+        Busca os scores de um arquivo de fase
+        
+        Returns:
+            Tupla (hash do conteúdo, scores em cache ou None)
+        """
+        path = Path(filepath)
+        try:
+            st = path.stat()
+        except OSError:
+            return None, None
+        key = str(path.absolute())
+        record = self.files.get(key)
+        if record and record.get("size") == st.st_size and record.get("mtime_ns") == st.st_mtime_ns:
+            digest = record["sha256"]
+        else:
+            try:
+                digest = hashlib.sha256(path.read_bytes()).hexdigest()
+            except OSError:
+                return None, None
+            record = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest}
+            self.files[key] = record
+            self._new_files[key] = record
+        return digest, self.scores.get(f"{fase}:{digest}")
+    
+    def store(self, fase: str, digest: str, scores: Dict[str, float]):
+        """Guarda os scores calculados para um arquivo de fase"""
+        self.scores[f"{fase}:{digest}"] = scores
+        self._new_scores[f"{fase}:{digest}"] = scores
+    
+    def snapshot(self) -> Dict:
+        """Conteúdo atual, para criar cópias do cache sem reler o arquivo"""
+        return {"files": self.files, "scores": self.scores}
+    
+    def take_updates(self) -> Dict:
+        """Entradas adicionadas desde a última chamada (para mesclar entre processos)"""
+        updates = {"files": self._new_files, "scores": self._new_scores}
+        self._new_files = {}
+        self._new_scores = {}
+        return updates
+    
+    def merge(self, updates: Dict):
+        """Incorpora entradas calculadas em outro processo"""
+        for key, record in updates.get("files", {}).items():
+            self.files[key] = record
+            self._new_files[key] = record
+        for key, scores in updates.get("scores", {}).items():
+            self.scores[key] = scores
+            self._new_scores[key] = scores
+    
+    def prune(self) -> int:
+        """
+        Descarta entradas de arquivos que não existem mais ou mudaram desde o
+        hash registrado, e os scores sem nenhum arquivo atual correspondente
+        
+        Returns:
+            Número de entradas removidas
+        """
+        stale = []
+        for key, record in self.files.items():
+            try:
+                st = os.stat(key)
+            except OSError:
+                stale.append(key)
+                continue
+            if record.get("size") != st.st_size or record.get("mtime_ns") != st.st_mtime_ns:
+                stale.append(key)
+        for key in stale:
+            del self.files[key]
+        
+        digests = {record["sha256"] for record in self.files.values()}
+        orphans = [key for key in self.scores if key.split(":", 1)[-1] not in digests]
+        for key in orphans:
+            del self.scores[key]
+        return len(stale) + len(orphans)
+    
+    def save(self):
+        """Persiste o cache (somente se houve entradas novas ou removidas)"""
+        if not self.prune() and not self._new_files and not self._new_scores:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            tmp_path.write_text(
+                json.dumps({"scoring": _scoring_fingerprint(), "files": self.files, "scores": self.scores},
+                           ensure_ascii=False),
+                encoding='utf-8'
+            )
+            os.replace(tmp_path, self.path)
+            self._new_files = {}
+            self._new_scores = {}
+        except OSError as e:
+            print(f"Aviso: Erro ao salvar cache de scores: {e}", file=sys.stderr)
+
+
+DEFAULT_MODEL_FILE = "memories/models/approval_model.json"
+
+# Score atribuído a critérios sem arquivo de fase ao aplicar o modelo
+MISSING_SCORE = 0.5
+
+# Limiares de classificação da probabilidade de aprovação
+PROBABILITY_THRESHOLDS = {
+    "high": 0.75,      # Alta chance (>75%)
+    "medium": 0.60,    # Média chance (60-75%)
+    "low": 0.45        # Baixa chance (45-60%)
+    # Abaixo de 45% = Muito baixa
+}
+
+
+class ApprovalModel:
+    """
+    Modelo logístico calibrado com os resultados do HISTORICO_EDITAIS.md
+    
+    Treinado offline por train_approval_model.py; aqui apenas os coeficientes
+    são carregados do JSON e aplicados aos scores por critério. A saída é uma
+    probabilidade calibrada, classificada pelos mesmos limiares absolutos
+    (`PROBABILITY_THRESHOLDS`), gravados no arquivo do modelo para que
+    possam ser ajustados ali; modelos antigos, sem eles, usam os padrões.
+    """
+    
+    def __init__(self, coefficients: Dict[str, float], intercept: float, info: Optional[Dict] = None,
+                 thresholds: Optional[Dict[str, float]] = None):
+        self.coefficients = {c: float(coefficients.get(c, 0.0)) for c in CRITERIA}
+        self.intercept = float(intercept)
+        self.info = info or {}
+        self.thresholds = {k: float(v) for k, v in thresholds.items()} if thresholds else None
+    
+    @classmethod
+    def load(cls, path: str = DEFAULT_MODEL_FILE) -> "ApprovalModel":
+        """Carrega o modelo salvo (OSError/ValueError se ausente ou inválido)"""
+        data = json.loads(Path(path).read_text(encoding='utf-8'))
+        if data.get("criteria") != CRITERIA:
+            raise ValueError(f"Modelo treinado com outros critérios: {path}")
+        return cls(data["coefficients"], data["intercept"], data.get("info"), data.get("thresholds"))
+    
+    def save(self, path: str = DEFAULT_MODEL_FILE):
+        """Salva os coeficientes em JSON (escrita atômica)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(
+            json.dumps({
+                "criteria": CRITERIA,
+                "coefficients": self.coefficients,
+                "intercept": self.intercept,
+                "thresholds": self.thresholds,
+                "info": self.info
+            }, ensure_ascii=False, indent=2),
+            encoding='utf-8'
+        )
+        os.replace(tmp_path, path)
+    
+    def predict_proba(self, scores: Dict[str, float]) -> float:
+        """Probabilidade de aprovação de uma proposta"""
+        z = self.intercept + sum(
+            self.coefficients[c] * scores.get(c, MISSING_SCORE) for c in CRITERIA
+        )
+        # Forma estável da sigmoide para |z| grande
+        if z >= 0:
+            return 1.0 / (1.0 + math.exp(-z))
+        ez = math.exp(z)
+        return ez / (1.0 + ez)
+    
+    def predict_batch(self, proposals_scores: List[Dict[str, float]]):
+        """Probabilidades de várias propostas em uma operação NumPy"""
+        if not NUMPY_AVAILABLE:
+            return [self.predict_proba(scores) for scores in proposals_scores]
+        features = np.array(
+            [[scores.get(c, MISSING_SCORE) for c in CRITERIA] for scores in proposals_scores],
+            dtype=float
+        ).reshape(-1, len(CRITERIA))
+        z = self.intercept + features @ np.array([self.coefficients[c] for c in CRITERIA])
+        return 0.5 * (1.0 + np.tanh(0.5 * z))
+
+
+_SCANNER = KeywordScanner(
+    [keyword for keywords in CRITERIA_KEYWORDS.values() for keyword in keywords],
+    CRITERIA_PATTERNS,
+)
+
 
 class ApprovalPredictor:
     """Analisador preditivo de chances de aprovação de propostas"""
     
-    def __init__(self):
+    def __init__(self, cache: Optional["ScoreCache"] = None, model: Optional[ApprovalModel] = None):
+        self.cache = cache
+        # Com modelo calibrado, a probabilidade vem dele em vez dos pesos fixos
+        self.model = model
         self.weights = {
             "alignment_score": 0.25,     # Alinhamento com edital
             "budget_adequacy": 0.20,     # Adequação orçamentária
@@ -24,12 +421,10 @@ class ApprovalPredictor:
             "sustainability": 0.05       # Sustentabilidade do projeto
         }
         
-        self.thresholds = {
-            "high": 0.75,      # Alta chance (>75%)
-            "medium": 0.60,    # Média chance (60-75%)
-            "low": 0.45        # Baixa chance (45-60%)
-            # Abaixo de 45% = Muito baixa
-        }
+        self.thresholds = dict(PROBABILITY_THRESHOLDS)
+        # Limiares gravados no arquivo do modelo, quando existem
+        if model is not None and model.thresholds:
+            self.thresholds = dict(model.thresholds)
     
     def analyze_proposal(self, proposal_files: Dict[str, str]) -> Dict:
         """
@@ -43,11 +438,28 @@ class ApprovalPredictor:
                     "fase4": "path/to/FASE4_IMPLEMENTACAO.md"
                 }
         
+        Returns:
+            Dicionário com análise completa
+        """
+        return self.analyze_scores(self._score_criteria(proposal_files))
+    
+    def analyze_scores(self, scores: Dict[str, float], probability: Optional[float] = None) -> Dict:
+        """
+        Monta a análise a partir de scores por critério já calculados
+        
+        Usa os `weights` e `thresholds` atuais sem ler nenhum arquivo, de modo
+        que mudanças de pesos podem ser reavaliadas sobre scores em cache.
+        
+        Args:
+            scores: Dicionário critério -> score (0 a 1)
+            probability: Probabilidade já calculada (ex.: por `predict_batch`
+                para vários projetos de uma vez); None calcula aqui
+        
         Returns:
             Dicionário com análise completa
         """
         results = {
-            "scores": {},
+            "scores": dict(scores),
             "overall_probability": 0.0,
             "classification": "",
             "strengths": [],
@@ -55,46 +467,17 @@ class ApprovalPredictor:
             "recommendations": []
         }
         
-        # 1. Analisar alinhamento com edital (Fase 1)
-        if "fase1" in proposal_files:
-            results["scores"]["alignment_score"] = self._analyze_alignment(
-                proposal_files["fase1"]
-            )
-        
-        # 2. Analisar adequação orçamentária (Fase 4)
-        if "fase4" in proposal_files:
-            results["scores"]["budget_adequacy"] = self._analyze_budget(
-                proposal_files["fase4"]
-            )
-        
-        # 3. Analisar qualificação da equipe (Fase 4)
-        if "fase4" in proposal_files:
-            results["scores"]["team_qualification"] = self._analyze_team(
-                proposal_files["fase4"]
-            )
-        
-        # 4. Analisar inovação (Fase 3)
-        if "fase3" in proposal_files:
-            results["scores"]["innovation"] = self._analyze_innovation(
-                proposal_files["fase3"]
-            )
-        
-        # 5. Analisar impacto social (Fase 3)
-        if "fase3" in proposal_files:
-            results["scores"]["social_impact"] = self._analyze_social_impact(
-                proposal_files["fase3"]
-            )
-        
-        # 6. Analisar sustentabilidade (Fase 3)
-        if "fase3" in proposal_files:
-            results["scores"]["sustainability"] = self._analyze_sustainability(
-                proposal_files["fase3"]
-            )
-        
         # Calcular probabilidade geral
-        results["overall_probability"] = self._calculate_overall_score(
-            results["scores"]
-        )
+        if self.model is not None:
+            results["model"] = self.model.info
+        if probability is not None:
+            results["overall_probability"] = float(probability)
+        elif self.model is not None:
+            results["overall_probability"] = self.model.predict_proba(results["scores"])
+        else:
+            results["overall_probability"] = self._calculate_overall_score(
+                results["scores"]
+            )
         
         # Classificar
         results["classification"] = self._classify_probability(
@@ -113,144 +496,198 @@ class ApprovalPredictor:
         
         return results
     
-    def _analyze_alignment(self, filepath: str) -> float:
+    def _score_criteria(self, proposal_files: Dict[str, str]) -> Dict[str, float]:
+        """
+        Calcula o score de cada critério a partir dos arquivos de fase
+        
+        Com cache, os scores de arquivos cujo conteúdo não mudou são
+        reaproveitados e apenas os arquivos alterados são lidos e analisados.
+        
+        Returns:
+            Dicionário critério -> score, na ordem de CRITERIA_ANALYZERS
+        """
+        phase_scores: Dict[str, Dict[str, float]] = {}
+        pending: Dict[str, str] = {}
+        digests: Dict[str, Optional[str]] = {}
+        
+        for fase, filepath in proposal_files.items():
+            if self.cache is not None:
+                digest, cached = self.cache.lookup(fase, filepath)
+                digests[fase] = digest
+                if cached is not None:
+                    phase_scores[fase] = cached
+                    continue
+            pending[fase] = filepath
+        
+        # Cada arquivo de fase é lido, normalizado e varrido uma única vez
+        documents = self._scan_documents(self._load_documents(pending))
+        for fase, hits in documents.items():
+            phase_scores[fase] = {
+                criterion: getattr(self, analyzer)(hits)
+                for criterion, criterion_fase, analyzer in CRITERIA_ANALYZERS
+                if criterion_fase == fase
+            }
+            # Arquivos ilegíveis recebem o score padrão, que não é guardado
+            if self.cache is not None and hits is not None and digests.get(fase):
+                self.cache.store(fase, digests[fase], phase_scores[fase])
+        
+        scores = {}
+        for criterion, fase, _ in CRITERIA_ANALYZERS:
+            if fase in phase_scores and criterion in phase_scores[fase]:
+                scores[criterion] = phase_scores[fase][criterion]
+        return scores
+    
+    def _load_documents(self, proposal_files: Dict[str, str]) -> Dict[str, Optional[str]]:
+        """
+        Lê, decodifica e normaliza (minúsculas) cada arquivo de fase uma vez
+        
+        Args:
+            proposal_files: Dicionário fase -> caminho do arquivo
+        
+        Returns:
+            Dicionário fase -> texto normalizado (None se não foi possível ler)
+        """
+        documents = {}
+        for fase, filepath in proposal_files.items():
+            try:
+                documents[fase] = Path(filepath).read_text(encoding='utf-8').lower()
+            except (OSError, UnicodeDecodeError):
+                documents[fase] = None
+        return documents
+    
+    def _scan_documents(self, documents: Dict[str, Optional[str]]) -> Dict[str, Optional[Counter]]:
+        """
+        Varre cada documento uma vez buscando as palavras-chave de todos os critérios
+        
+        Returns:
+            Dicionário fase -> contagem de ocorrências (None se o documento não foi lido)
+        """
+        return {
+            fase: None if content is None else _SCANNER.scan(content)
+            for fase, content in documents.items()
+        }
+    
+    def _analyze_alignment(self, hits: Optional[Counter]) -> float:
         """Analisa alinhamento com objetivos do edital"""
-        try:
-            content = Path(filepath).read_text(encoding='utf-8').lower()
-            
-            score = 0.5  # Base
-            
-            # Indicadores de bom alinhamento
-            if "atende" in content and "requisitos" in content:
-                score += 0.1
-            if "elegível" in content or "elegibilidade" in content:
-                score += 0.1
-            if "pontuação" in content:
-                score += 0.1
-            if "go" in content and ("no-go" not in content):
-                score += 0.2
-            
-            return min(score, 1.0)
-        except:
+        if hits is None:
             return 0.6
+        
+        score = 0.5  # Base
+        
+        # Indicadores de bom alinhamento
+        if hits["atende"] and hits["requisitos"]:
+            score += 0.1
+        if hits["elegível"] or hits["elegibilidade"]:
+            score += 0.1
+        if hits["pontuação"]:
+            score += 0.1
+        if hits["go"] and not hits["no-go"]:
+            score += 0.2
+        
+        return min(score, 1.0)
     
-    def _analyze_budget(self, filepath: str) -> float:
+    def _analyze_budget(self, hits: Optional[Counter]) -> float:
         """Analisa adequação do orçamento"""
-        try:
-            content = Path(filepath).read_text(encoding='utf-8')
-            
-            score = 0.5
-            
-            # Procurar por orçamento detalhado
-            if "orçamento" in content.lower():
-                score += 0.1
-            
-            # Verificar se tem categorias de despesa
-            categories = ["pessoal", "material", "serviço", "equipamento"]
-            for cat in categories:
-                if cat in content.lower():
-                    score += 0.05
-            
-            # Verificar se tem justificativa
-            if "justificat" in content.lower() and "orçament" in content.lower():
-                score += 0.15
-            
-            return min(score, 1.0)
-        except:
+        if hits is None:
             return 0.6
+        
+        score = 0.5
+        
+        # Procurar por orçamento detalhado
+        if hits["orçamento"]:
+            score += 0.1
+        
+        # Verificar se tem categorias de despesa
+        categories = ["pessoal", "material", "serviço", "equipamento"]
+        for cat in categories:
+            if hits[cat]:
+                score += 0.05
+        
+        # Verificar se tem justificativa
+        if hits["justificat"] and hits["orçament"]:
+            score += 0.15
+        
+        return min(score, 1.0)
     
-    def _analyze_team(self, filepath: str) -> float:
+    def _analyze_team(self, hits: Optional[Counter]) -> float:
         """Analisa qualificação da equipe"""
-        try:
-            content = Path(filepath).read_text(encoding='utf-8').lower()
-            
-            score = 0.5
-            
-            # Indicadores de boa equipe
-            if "coordenador" in content or "coordenação" in content:
-                score += 0.1
-            if "qualificação" in content or "currículo" in content:
-                score += 0.1
-            if "experiência" in content:
-                score += 0.1
-            if "equipe técnica" in content:
-                score += 0.1
-            
-            # Contabilizar membros da equipe (heurística)
-            team_indicators = content.count("responsável")
-            if team_indicators >= 3:
-                score += 0.1
-            
-            return min(score, 1.0)
-        except:
+        if hits is None:
             return 0.6
+        
+        score = 0.5
+        
+        # Indicadores de boa equipe
+        if hits["coordenador"] or hits["coordenação"]:
+            score += 0.1
+        if hits["qualificação"] or hits["currículo"]:
+            score += 0.1
+        if hits["experiência"]:
+            score += 0.1
+        if hits["equipe técnica"]:
+            score += 0.1
+        
+        # Contabilizar membros da equipe (heurística)
+        team_indicators = hits["responsável"]
+        if team_indicators >= 3:
+            score += 0.1
+        
+        return min(score, 1.0)
     
-    def _analyze_innovation(self, filepath: str) -> float:
+    def _analyze_innovation(self, hits: Optional[Counter]) -> float:
         """Analisa nível de inovação"""
-        try:
-            content = Path(filepath).read_text(encoding='utf-8').lower()
-            
-            score = 0.5
-            
-            # Palavras-chave de inovação
-            innovation_keywords = [
-                "inovação", "inovador", "novo", "inédito", 
-                "tecnologia", "metodologia inovadora", "abordagem diferenciada"
-            ]
-            
-            for keyword in innovation_keywords:
-                if keyword in content:
-                    score += 0.07
-            
-            return min(score, 1.0)
-        except:
+        if hits is None:
             return 0.5
+        
+        score = 0.5
+        
+        # Palavras-chave de inovação
+        for keyword in CRITERIA_KEYWORDS["innovation"]:
+            if hits[keyword]:
+                score += 0.07
+        
+        return min(score, 1.0)
     
-    def _analyze_social_impact(self, filepath: str) -> float:
+    def _analyze_social_impact(self, hits: Optional[Counter]) -> float:
         """Analisa impacto social esperado"""
-        try:
-            content = Path(filepath).read_text(encoding='utf-8').lower()
-            
-            score = 0.5
-            
-            # Indicadores de impacto social
-            if "beneficiários" in content:
-                score += 0.1
-            if "impacto social" in content or "transformação social" in content:
-                score += 0.15
-            if "ods" in content or "objetivos de desenvolvimento" in content:
-                score += 0.1
-            if "indicadores" in content:
-                score += 0.1
-            
-            # Verificar quantificação de beneficiários
-            if re.search(r'\d+\s*(pessoas|beneficiários|famílias)', content):
-                score += 0.05
-            
-            return min(score, 1.0)
-        except:
+        if hits is None:
             return 0.6
+        
+        score = 0.5
+        
+        # Indicadores de impacto social
+        if hits["beneficiários"]:
+            score += 0.1
+        if hits["impacto social"] or hits["transformação social"]:
+            score += 0.15
+        if hits["ods"] or hits["objetivos de desenvolvimento"]:
+            score += 0.1
+        if hits["indicadores"]:
+            score += 0.1
+        
+        # Verificar quantificação de beneficiários
+        if hits["beneficiarios_quantificados"]:
+            score += 0.05
+        
+        return min(score, 1.0)
     
-    def _analyze_sustainability(self, filepath: str) -> float:
+    def _analyze_sustainability(self, hits: Optional[Counter]) -> float:
         """Analisa sustentabilidade do projeto"""
-        try:
-            content = Path(filepath).read_text(encoding='utf-8').lower()
-            
-            score = 0.5
-            
-            # Indicadores de sustentabilidade
-            if "sustentabilidade" in content:
-                score += 0.2
-            if "continuidade" in content:
-                score += 0.1
-            if "longo prazo" in content:
-                score += 0.1
-            if "parcerias" in content or "parceiros" in content:
-                score += 0.1
-            
-            return min(score, 1.0)
-        except:
+        if hits is None:
             return 0.5
+        
+        score = 0.5
+        
+        # Indicadores de sustentabilidade
+        if hits["sustentabilidade"]:
+            score += 0.2
+        if hits["continuidade"]:
+            score += 0.1
+        if hits["longo prazo"]:
+            score += 0.1
+        if hits["parcerias"] or hits["parceiros"]:
+            score += 0.1
+        
+        return min(score, 1.0)
     
     def _calculate_overall_score(self, scores: Dict[str, float]) -> float:
         """Calcula probabilidade geral ponderada"""
@@ -266,6 +703,87 @@ class ApprovalPredictor:
             return total / total_weight
         return 0.5
     
+    def sweep_weights(self, weight_vectors, proposals_scores: List[Dict[str, float]]) -> Dict:
+        """
+        Avalia vários conjuntos de pesos sobre várias propostas de uma só vez
+        
+        Equivale a chamar `_calculate_overall_score` e `_classify_probability`
+        para cada combinação (proposta, pesos), mas em operações matriciais
+        NumPy sobre scores já calculados (ex.: vindos do ScoreCache).
+        
+        Args:
+            weight_vectors: Matriz (W x critérios) na ordem de CRITERIA, ou
+                lista de dicionários critério -> peso (ausente = 0), que pode
+                misturar dicionários e vetores
+            proposals_scores: Scores por critério de cada proposta
+        
+        Returns:
+            Dicionário com "probabilities" (P x W), "classes" (P x W, índice
+            em CLASSIFICATION_LABELS) e "labels"
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("NumPy não está disponível. Instale com: pip install numpy")
+        
+        if any(isinstance(w, dict) for w in weight_vectors):
+            weights = np.array([[w.get(c, 0.0) for c in CRITERIA] if isinstance(w, dict) else list(w)
+                                for w in weight_vectors], dtype=float)
+        else:
+            weights = np.asarray(weight_vectors, dtype=float).reshape(-1, len(CRITERIA))
+        
+        scores = np.zeros((len(proposals_scores), len(CRITERIA)))
+        present = np.zeros_like(scores)
+        for i, proposal in enumerate(proposals_scores):
+            for j, criterion in enumerate(CRITERIA):
+                if criterion in proposal:
+                    scores[i, j] = proposal[criterion]
+                    present[i, j] = 1.0
+        
+        # Só os critérios avaliados na proposta entram no denominador. A soma
+        # segue a ordem dos critérios, como no cálculo escalar, para que
+        # probabilidades exatamente no limiar caiam na mesma classificação
+        total = np.zeros((len(proposals_scores), len(weights)))
+        total_weight = np.zeros_like(total)
+        for j in range(len(CRITERIA)):
+            total += np.outer(scores[:, j], weights[:, j])
+            total_weight += np.outer(present[:, j], weights[:, j])
+        probabilities = np.full(total.shape, 0.5)
+        np.divide(total, total_weight, out=probabilities, where=total_weight > 0)
+        
+        bins = [self.thresholds["low"], self.thresholds["medium"], self.thresholds["high"]]
+        classes = np.digitize(probabilities, bins)
+        
+        return {
+            "probabilities": probabilities,
+            "classes": classes,
+            "labels": CLASSIFICATION_LABELS
+        }
+    
+    def predict_batch(self, proposals_scores: List[Dict[str, float]]) -> Dict:
+        """
+        Probabilidades e classificações de várias propostas de uma só vez
+        
+        Usa o modelo calibrado, se carregado, ou os pesos atuais.
+        
+        Returns:
+            Dicionário com "probabilities" (P), "classes" (P, índice em
+            CLASSIFICATION_LABELS) e "labels"
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("NumPy não está disponível. Instale com: pip install numpy")
+        
+        if self.model is None:
+            result = self.sweep_weights([self.weights], proposals_scores)
+            probabilities = result["probabilities"][:, 0]
+        else:
+            probabilities = self.model.predict_batch(proposals_scores)
+        
+        bins = [self.thresholds["low"], self.thresholds["medium"], self.thresholds["high"]]
+        return {
+            "probabilities": probabilities,
+            "classes": np.digitize(probabilities, bins),
+            "labels": CLASSIFICATION_LABELS
+        }
+    
     def _classify_probability(self, probability: float) -> str:
         """Classifica a probabilidade em categorias"""
         if probability >= self.thresholds["high"]:
@@ -357,6 +875,9 @@ def generate_report(analysis: Dict) -> str:
     
     report.append(f"🎯 PROBABILIDADE DE APROVAÇÃO: {prob*100:.1f}%")
     report.append(f"📈 CLASSIFICAÇÃO: {classification}")
+    if analysis.get("model") is not None:
+        samples = analysis["model"].get("samples", "?")
+        report.append(f"🧮 MODELO: calibrado com {samples} editais do histórico")
     report.append("")
     
     # Scores detalhados
@@ -408,28 +929,441 @@ def generate_report(analysis: Dict) -> str:
     return "\n".join(report)
 
 
+# Arquivos de fase usados na análise, por chave de `proposal_files`
+PHASE_FILES = {
+    "fase1": "FASE1_ANALISE.md",
+    "fase3": "FASE3_SOLUCAO.md",
+    "fase4": "FASE4_IMPLEMENTACAO.md",
+}
+
+REPORT_FILE = "ANALISE_PREDITIVA.md"
+
+
+def find_proposal_files(project_dir: Path) -> Dict[str, str]:
+    """Busca os arquivos das fases em um diretório de projeto"""
+    proposal_files = {}
+    for key, filename in PHASE_FILES.items():
+        fase_file = project_dir / filename
+        if fase_file.exists():
+            proposal_files[key] = str(fase_file)
+    return proposal_files
+
+
+def find_project_dirs(patterns: List[str]) -> List[Path]:
+    """
+    Expande padrões glob/diretórios raiz em diretórios de projeto
+    
+    Um diretório sem arquivos de fase é tratado como raiz: os projetos são
+    procurados recursivamente abaixo dele.
+    
+    Args:
+        patterns: Diretórios ou padrões glob
+            (ex.: "memories/organizations/*/editais/*/projeto")
+    
+    Returns:
+        Lista ordenada e sem repetições de diretórios com arquivos de fase
+    """
+    project_dirs = set()
+    for pattern in patterns:
+        matches = [Path(p) for p in glob.glob(pattern)] if glob.has_magic(pattern) else [Path(pattern)]
+        for path in matches:
+            if not path.is_dir():
+                continue
+            if find_proposal_files(path):
+                project_dirs.add(path)
+                continue
+            for filename in PHASE_FILES.values():
+                for fase_file in path.rglob(filename):
+                    project_dirs.add(fase_file.parent)
+    return sorted(project_dirs)
+
+
+# Cache de scores de cada processo do pool, preparado uma única vez por _init_analysis_worker
+_WORKER_CACHE: Optional[ScoreCache] = None
+
+
+def _init_analysis_worker(cache_path: Optional[str], cache_data: Optional[Dict]):
+    """Inicializa um processo do pool com o cache já carregado pelo processo principal"""
+    global _WORKER_CACHE
+    _WORKER_CACHE = ScoreCache(cache_path, data=cache_data) if cache_data is not None else None
+
+
+def _score_project_task(project_dir: str) -> Tuple[Dict[str, float], Dict]:
+    """Tarefa do pool: scores por critério de um projeto, com o cache do processo"""
+    return score_project(project_dir, cache=_WORKER_CACHE)
+
+
+def score_project(project_dir: str, cache: Optional[ScoreCache] = None) -> Tuple[Dict[str, float], Dict]:
+    """
+    Calcula os scores por critério dos arquivos de fase de um projeto
+    
+    Nos processos do pool, o cache de scores é apenas lido aqui; as entradas
+    novas são devolvidas para que o processo principal as grave.
+    
+    Returns:
+        Tupla (scores por critério, entradas novas do cache de scores)
+    """
+    scores = ApprovalPredictor(cache=cache)._score_criteria(find_proposal_files(Path(project_dir)))
+    return scores, (cache.take_updates() if cache is not None else {})
+
+
+def write_project_report(project_dir: str, analysis: Dict) -> Dict:
+    """
+    Salva o ANALISE_PREDITIVA.md de um projeto
+    
+    Returns:
+        Linha do ranking
+    """
+    path = Path(project_dir)
+    report_file = path / REPORT_FILE
+    report_file.write_text(generate_report(analysis), encoding='utf-8')
+    
+    row = {
+        "projeto": str(path),
+        "probabilidade": round(analysis["overall_probability"], 4),
+        "classificacao": analysis["classification"],
+        "relatorio": str(report_file),
+    }
+    for criterion in CRITERIA_KEYWORDS:
+        score = analysis["scores"].get(criterion)
+        row[criterion] = None if score is None else round(score, 4)
+    return row
+
+
+def run_batch(
+    patterns: List[str],
+    output_prefix: str,
+    workers: Optional[int] = None,
+    cache_path: Optional[str] = DEFAULT_SCORE_CACHE,
+    model_path: Optional[str] = None
+) -> List[Dict]:
+    """
+    Analisa vários projetos em paralelo e gera o ranking consolidado
+    
+    Args:
+        patterns: Diretórios ou padrões glob de projetos
+        output_prefix: Caminho base do ranking (gera .csv e .json)
+        workers: Número de processos (padrão: núcleos disponíveis)
+        cache_path: Cache de scores por conteúdo (None desativa)
+        model_path: Modelo calibrado (None usa os pesos fixos)
+    
+    Returns:
+        Linhas do ranking, da maior para a menor probabilidade
+    """
+    project_dirs = find_project_dirs(patterns)
+    if not project_dirs:
+        print(f"❌ Erro: Nenhum projeto com arquivos de fase encontrado em: {', '.join(patterns)}")
+        return []
+    
+    print(f"📁 Projetos encontrados: {len(project_dirs)}")
+    
+    scored = []
+    errors = 0
+    # O cache é lido uma vez aqui e entregue a cada processo do pool, que só
+    # calcula os scores (a leitura dos arquivos de fase)
+    cache = ScoreCache(cache_path) if cache_path else None
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_analysis_worker,
+        initargs=(cache_path, cache.snapshot() if cache is not None else None)
+    ) as executor:
+        futures = {executor.submit(_score_project_task, str(d)): d for d in project_dirs}
+        for future in as_completed(futures):
+            project_dir = futures[future]
+            try:
+                scores, cache_updates = future.result()
+            except Exception as e:
+                print(f"❌ Erro ao analisar {project_dir}: {e}")
+                errors += 1
+                continue
+            scored.append((project_dir, scores))
+            if cache is not None:
+                cache.merge(cache_updates)
+    
+    if cache is not None:
+        cache.save()
+    
+    # Com modelo, todas as probabilidades saem de uma única chamada vetorizada
+    model = ApprovalModel.load(model_path) if model_path else None
+    predictor = ApprovalPredictor(model=model)
+    if model is not None and scored:
+        probabilities = model.predict_batch([scores for _, scores in scored])
+    else:
+        probabilities = [None] * len(scored)
+    
+    rows = []
+    for (project_dir, scores), probability in zip(scored, probabilities):
+        try:
+            row = write_project_report(str(project_dir), predictor.analyze_scores(scores, probability))
+        except OSError as e:
+            print(f"❌ Erro ao salvar relatório de {project_dir}: {e}")
+            errors += 1
+            continue
+        rows.append(row)
+        print(f"✅ {project_dir}: {row['probabilidade']*100:.1f}% ({row['classificacao']})")
+    
+    rows.sort(key=lambda r: (-r["probabilidade"], r["projeto"]))
+    for position, row in enumerate(rows, 1):
+        row["posicao"] = position
+    
+    fieldnames = ["posicao", "projeto", "probabilidade", "classificacao"] + list(CRITERIA_KEYWORDS) + ["relatorio"]
+    
+    output = Path(output_prefix)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    csv_file = output.with_name(output.name + ".csv")
+    with open(csv_file, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+    
+    json_file = output.with_name(output.name + ".json")
+    json_file.write_text(
+        json.dumps([{k: row.get(k) for k in fieldnames} for row in rows], ensure_ascii=False, indent=2),
+        encoding='utf-8'
+    )
+    
+    print("")
+    print("🏆 RANKING DE PROPOSTAS")
+    print("-" * 70)
+    for row in rows:
+        print(f"{row['posicao']:>3}. {row['probabilidade']*100:5.1f}%  {row['classificacao']:<11} {row['projeto']}")
+    print("-" * 70)
+    if errors:
+        print(f"⚠️  Projetos com erro: {errors}")
+    print(f"💾 Ranking salvo em: {csv_file} e {json_file}")
+    
+    return rows
+
+
+def collect_scores(project_dirs: List[Path], cache_path: Optional[str] = DEFAULT_SCORE_CACHE) -> List[Dict[str, float]]:
+    """
+    Obtém os scores por critério de cada projeto (do cache quando possível)
+    
+    Returns:
+        Lista de dicionários critério -> score, na ordem de project_dirs
+    """
+    cache = ScoreCache(cache_path) if cache_path else None
+    predictor = ApprovalPredictor(cache=cache)
+    scores = [predictor._score_criteria(find_proposal_files(d)) for d in project_dirs]
+    if cache is not None:
+        cache.save()
+    return scores
+
+
+def _weights_problem(vector) -> Optional[str]:
+    """Descreve o que há de errado em um conjunto de pesos do --sweep (None se válido)"""
+    if isinstance(vector, dict):
+        unknown = [name for name in vector if name not in CRITERIA]
+        if unknown:
+            return f"critério(s) desconhecido(s): {', '.join(unknown)} (válidos: {', '.join(CRITERIA)})"
+        values = list(vector.values())
+    elif isinstance(vector, list):
+        if len(vector) != len(CRITERIA):
+            return f"esperados {len(CRITERIA)} pesos na ordem {', '.join(CRITERIA)}, encontrados {len(vector)}"
+        values = vector
+    else:
+        return "use um objeto critério -> peso ou uma lista de pesos"
+    if not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+        return "os pesos devem ser números"
+    return None
+
+
+def run_sweep(
+    patterns: List[str],
+    weights_file: str,
+    output_prefix: str,
+    cache_path: Optional[str] = DEFAULT_SCORE_CACHE
+) -> List[Dict]:
+    """
+    Compara conjuntos de pesos alternativos sobre todos os projetos
+    
+    Args:
+        patterns: Diretórios ou padrões glob de projetos
+        weights_file: JSON com lista de conjuntos de pesos, ou objeto nome -> pesos
+        output_prefix: Caminho base da saída (gera _SWEEP.csv e _SWEEP.json)
+        cache_path: Cache de scores por conteúdo (None desativa)
+    
+    Returns:
+        Resumo por conjunto de pesos
+    """
+    try:
+        candidates = json.loads(Path(weights_file).read_text(encoding='utf-8'))
+    except (OSError, ValueError) as e:
+        print(f"❌ Erro ao ler pesos de {weights_file}: {e}")
+        return []
+    if isinstance(candidates, dict):
+        names, weight_vectors = list(candidates), list(candidates.values())
+    else:
+        names, weight_vectors = [f"pesos_{i + 1}" for i in range(len(candidates))], candidates
+    if not weight_vectors:
+        print(f"❌ Erro: Nenhum conjunto de pesos em {weights_file}")
+        return []
+    for name, vector in zip(names, weight_vectors):
+        problem = _weights_problem(vector)
+        if problem:
+            print(f"❌ Erro: Conjunto de pesos \"{name}\" inválido em {weights_file}: {problem}")
+            return []
+    
+    project_dirs = find_project_dirs(patterns)
+    if not project_dirs:
+        print(f"❌ Erro: Nenhum projeto com arquivos de fase encontrado em: {', '.join(patterns)}")
+        return []
+    
+    print(f"📁 Projetos encontrados: {len(project_dirs)}")
+    print(f"⚖️  Conjuntos de pesos: {len(weight_vectors)}")
+    
+    scores = collect_scores(project_dirs, cache_path)
+    result = ApprovalPredictor().sweep_weights(weight_vectors, scores)
+    probabilities, classes = result["probabilities"], result["classes"]
+    
+    summary = []
+    for k, name in enumerate(names):
+        row = {"pesos": name, "probabilidade_media": round(float(probabilities[:, k].mean()), 4)}
+        for c, label in enumerate(CLASSIFICATION_LABELS):
+            row[label] = int((classes[:, k] == c).sum())
+        summary.append(row)
+    
+    output = Path(output_prefix)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    csv_file = output.with_name(output.name + "_SWEEP.csv")
+    with open(csv_file, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=["pesos", "probabilidade_media"] + CLASSIFICATION_LABELS)
+        writer.writeheader()
+        writer.writerows(summary)
+    
+    json_file = output.with_name(output.name + "_SWEEP.json")
+    json_file.write_text(
+        json.dumps({
+            "pesos": dict(zip(names, weight_vectors)),
+            "projetos": [str(d) for d in project_dirs],
+            "probabilidades": probabilities.round(4).tolist(),
+            "classificacoes": [[CLASSIFICATION_LABELS[c] for c in row] for row in classes.tolist()],
+            "resumo": summary
+        }, ensure_ascii=False, indent=2),
+        encoding='utf-8'
+    )
+    
+    print("")
+    print("⚖️  COMPARAÇÃO DE PESOS")
+    print("-" * 70)
+    print(f"{'Pesos':<20} {'Média':>7}  " + "  ".join(f"{label:>10}" for label in CLASSIFICATION_LABELS))
+    for row in summary:
+        print(f"{row['pesos']:<20} {row['probabilidade_media']*100:6.1f}%  "
+              + "  ".join(f"{row[label]:>10}" for label in CLASSIFICATION_LABELS))
+    print("-" * 70)
+    print(f"💾 Resultado salvo em: {csv_file} e {json_file}")
+    
+    return summary
+
+
 def main():
     """Função principal CLI"""
-    if len(sys.argv) < 2:
-        print("Uso: python approval_predictor.py <diretorio_projeto>")
-        print("Exemplo: python approval_predictor.py memories/editais/edital-xyz/projeto")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description="Estima a probabilidade de aprovação de propostas",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Exemplos:
+  python approval_predictor.py memories/editais/edital-xyz/projeto
+  python approval_predictor.py "memories/organizations/*/editais/*/projeto"
+  python approval_predictor.py memories/organizations --batch --workers 4 --output ranking
+  python approval_predictor.py memories/organizations --sweep pesos.json
+  python approval_predictor.py memories/editais/edital-xyz/projeto --model
+        """
+    )
+    
+    parser.add_argument(
+        "projetos",
+        nargs="+",
+        help="Diretório do projeto, ou (em lote) padrões glob/diretórios raiz"
+    )
+    
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Modo lote (ativado automaticamente com glob ou vários diretórios)"
+    )
     
-    project_dir = Path(sys.argv[1])
+    parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Processos em paralelo no modo lote (padrão: núcleos disponíveis)"
+    )
+    
+    parser.add_argument(
+        "--output", "-o",
+        default="RANKING_PREDITIVO",
+        help="Caminho base do ranking consolidado; gera .csv e .json (padrão: RANKING_PREDITIVO)"
+    )
+    
+    parser.add_argument(
+        "--cache",
+        default=DEFAULT_SCORE_CACHE,
+        help=f"Cache de scores por conteúdo dos arquivos de fase (padrão: {DEFAULT_SCORE_CACHE} no workspace)"
+    )
+    
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Reanalisa todos os arquivos, sem usar o cache de scores"
+    )
+    
+    parser.add_argument(
+        "--model",
+        nargs="?",
+        const=DEFAULT_MODEL_FILE,
+        metavar="MODELO.json",
+        help=f"Usa o modelo calibrado com o histórico (padrão: {DEFAULT_MODEL_FILE}; ver train_approval_model.py)"
+    )
+    
+    parser.add_argument(
+        "--sweep",
+        metavar="PESOS.json",
+        help="Compara conjuntos de pesos alternativos sobre os projetos (requer NumPy; não combina com --model)"
+    )
+    
+    args = parser.parse_args()
+    if args.sweep and args.model:
+        parser.error("--sweep compara pesos da média ponderada e não usa o modelo; remova --model")
+    cache_path = None if args.no_cache else resolve_score_cache(args.cache, args.projetos)
+    
+    model = None
+    if args.model:
+        try:
+            model = ApprovalModel.load(args.model)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"❌ Erro ao carregar modelo {args.model}: {e}")
+            sys.exit(1)
+    
+    if args.sweep:
+        if not NUMPY_AVAILABLE:
+            print("❌ Erro: NumPy não está disponível. Instale com: pip install numpy")
+            sys.exit(1)
+        if not run_sweep(args.projetos, args.sweep, args.output, cache_path):
+            sys.exit(1)
+        return
+    
+    batch = args.batch or len(args.projetos) > 1 or glob.has_magic(args.projetos[0])
+    if not batch:
+        single_dir = Path(args.projetos[0])
+        # Diretório raiz sem arquivos de fase: analisa os projetos abaixo dele
+        batch = single_dir.is_dir() and not find_proposal_files(single_dir)
+    
+    if batch:
+        rows = run_batch(args.projetos, args.output, args.workers, cache_path, args.model)
+        if not rows:
+            sys.exit(1)
+        return
+    
+    project_dir = Path(args.projetos[0])
     
     if not project_dir.exists():
         print(f"❌ Erro: Diretório não encontrado: {project_dir}")
         sys.exit(1)
     
     # Buscar arquivos das fases
-    proposal_files = {}
-    
-    for fase in ["FASE1_ANALISE", "FASE3_SOLUCAO", "FASE4_IMPLEMENTACAO"]:
-        fase_file = project_dir / f"{fase}.md"
-        if fase_file.exists():
-            key = fase.lower().replace("_", "").replace("analise", "1").replace("solucao", "3").replace("implementacao", "4")
-            key = f"fase{key[-1]}"  # fase1, fase3, fase4
-            proposal_files[key] = str(fase_file)
+    proposal_files = find_proposal_files(project_dir)
     
     if not proposal_files:
         print(f"❌ Erro: Nenhum arquivo de fase encontrado em {project_dir}")
@@ -439,16 +1373,19 @@ def main():
     print(f"📄 Arquivos encontrados: {len(proposal_files)}")
     print("")
     
-    # Executar análise
-    predictor = ApprovalPredictor()
+    # Executar análise (arquivos inalterados reutilizam scores em cache)
+    cache = ScoreCache(cache_path) if cache_path else None
+    predictor = ApprovalPredictor(cache=cache, model=model)
     analysis = predictor.analyze_proposal(proposal_files)
+    if cache is not None:
+        cache.save()
     
     # Gerar relatório
     report = generate_report(analysis)
     print(report)
     
     # Salvar relatório
-    report_file = project_dir / "ANALISE_PREDITIVA.md"
+    report_file = project_dir / REPORT_FILE
     report_file.write_text(report, encoding='utf-8')
     print(f"\n💾 Relatório salvo em: {report_file}")
 
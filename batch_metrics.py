@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Métricas das conversões em lote no formato textfile do Prometheus.
+
+`converter_pdfs_batch.py --metricas ARQUIVO.prom` publica, por engine, o
+número de conversões, páginas, bytes lidos e gravados, tempo de espera na
+fila, fallbacks (pela classe do erro original), um histograma de duração e os
+percentis p50/p95/p99. Conversões reaproveitadas do cache entram como
+`engine="cache"`, para não distorcer a vazão dos engines reais.
+
+As séries não têm rótulo por arquivo (a cardinalidade cresceria sem limite);
+o detalhe de cada arquivo (a conversão mais recente) vai para um JSON ao lado
+do `.prom` (`ARQUIVO.json`), que o coletor textfile ignora. Ambos são
+regravados atomicamente ao fim do lote (e a cada lote no modo `--watch`):
+
+    node_exporter --collector.textfile.directory=/var/lib/node_exporter/textfile
+    python converter_pdfs_batch.py memories --metricas /var/lib/node_exporter/textfile/conversao.prom
+"""
+
+import os
+import json
+import time
+import random
+from pathlib import Path
+from typing import Optional, List, Dict, Any
+
+METRIC_PREFIX = "bmad_conversao"
+QUANTILES = (0.5, 0.95, 0.99)
+# Limites (segundos) do histograma de duração
+DURATION_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+# Durações guardadas por engine para os percentis (amostragem por reservatório:
+# exata até esse número de conversões, estimada depois)
+SAMPLE_SIZE = 1024
+CACHE_ENGINE = "cache"
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    """Percentil com interpolação linear (mesmo critério do numpy.percentile)"""
+    if not sorted_values:
+        return float("nan")
+    position = (len(sorted_values) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def _label_value(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels: Any) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_label_value(v)}"' for k, v in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    value = float(value)
+    if value != value:  # NaN
+        return "NaN"
+    if value == float("inf"):
+        return "+Inf"
+    if value.is_integer():
+        return str(int(value))
+    return repr(round(value, 6))
+
+
+def _fallback_kind(reason: Optional[str]) -> str:
+    """Classe do erro que levou ao fallback ("RuntimeError: ..." -> "RuntimeError")"""
+    kind = (reason or "").split(":", 1)[0].strip()
+    return kind if kind.isidentifier() else "desconhecido"
+
+
+class _EngineStats:
+    """Totais acumulados de um engine (tamanho constante, mesmo no --watch)"""
+
+    def __init__(self, rng: random.Random):
+        self._rng = rng
+        self.conversions = 0
+        self.pages = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.queue_wait = 0.0
+        self.fallbacks: Dict[str, int] = {}
+        self.timed = 0
+        self.duration_sum = 0.0
+        self.buckets = [0] * len(DURATION_BUCKETS)
+        self.sample: List[float] = []
+
+    def add(self, entry: Dict[str, Any]):
+        self.conversions += 1
+        self.pages += entry["paginas"] or 0
+        self.bytes_in += entry["bytes_entrada"] or 0
+        self.bytes_out += entry["bytes_saida"] or 0
+        self.queue_wait += entry["espera_fila_s"] or 0.0
+        if entry["fallback"]:
+            kind = _fallback_kind(entry["fallback"])
+            self.fallbacks[kind] = self.fallbacks.get(kind, 0) + 1
+
+        duration = entry["duracao_s"]
+        if duration is None:
+            return
+        self.timed += 1
+        self.duration_sum += duration
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if duration <= bound:
+                self.buckets[i] += 1
+        if len(self.sample) < SAMPLE_SIZE:
+            self.sample.append(duration)
+        else:
+            slot = self._rng.randrange(self.timed)
+            if slot < SAMPLE_SIZE:
+                self.sample[slot] = duration
+
+
+class BatchMetrics:
+    """Acumula as métricas de um ou mais lotes de conversão"""
+
+    def __init__(self, output_path: Optional[str] = None):
+        self.output_path = Path(output_path) if output_path else None
+        self.started_at = time.time()
+        # Conversão mais recente de cada arquivo (no --watch um arquivo pode voltar)
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.engines: Dict[str, _EngineStats] = {}
+        self.converted = 0
+        self.cached = 0
+        self.errors = 0
+        self.skipped = 0
+        self._rng = random.Random(0)
+
+    def record_conversion(self, source: Path, result_md: str, metadata: Dict[str, Any],
+                          queued_at: Optional[float] = None):
+        """
+        Registra uma conversão bem-sucedida
+
+        Args:
+            source: Arquivo de origem (PDF/XLSX)
+            result_md: Markdown gravado
+            metadata: Metadados da conversão (`tempo_total_s`, `inicio_conversao`,
+                `total_pages`, `fallback_reason`, `cache_hit`...)
+            queued_at: Momento (epoch) em que o arquivo entrou na fila
+        """
+        duration = metadata.get("tempo_total_s")
+        pages = metadata.get("total_pages") or metadata.get("pages")
+        started = metadata.get("inicio_conversao")
+        queue_wait = max(started - queued_at, 0.0) if started is not None and queued_at is not None else None
+
+        def size(path) -> Optional[int]:
+            try:
+                return Path(path).stat().st_size
+            except (OSError, TypeError):
+                return None
+
+        entry = {
+            "engine": metadata.get("engine_used") or metadata.get("engine", "unknown"),
+            "cache": bool(metadata.get("cache_hit")),
+            "duracao_s": duration,
+            "paginas": pages,
+            "paginas_por_s": (pages / duration) if pages and duration else None,
+            "bytes_entrada": size(source),
+            "bytes_saida": size(result_md),
+            "espera_fila_s": queue_wait,
+            "fallback": metadata.get("fallback_reason") if metadata.get("fallback_used") else None,
+            "timestamp": time.time(),
+        }
+        self.files[str(source)] = entry
+
+        engine = CACHE_ENGINE if entry["cache"] else entry["engine"]
+        if engine not in self.engines:
+            self.engines[engine] = _EngineStats(self._rng)
+        self.engines[engine].add(entry)
+        if entry["cache"]:
+            self.cached += 1
+        else:
+            self.converted += 1
+
+    def record_error(self):
+        self.errors += 1
+
+    def record_skipped(self):
+        self.skipped += 1
+
+    def engine_summary(self) -> Dict[str, Dict[str, Any]]:
+        """Por engine ("cache" para reaproveitamentos): arquivos, páginas, duração total e percentis"""
+        summary = {}
+        for engine, totals in sorted(self.engines.items()):
+            durations = sorted(totals.sample)
+            total = totals.duration_sum
+            summary[engine] = {
+                "arquivos": totals.conversions,
+                "paginas": totals.pages,
+                "duracao_total_s": round(total, 6),
+                "paginas_por_s": round(totals.pages / total, 2) if total else None,
+                **{f"p{int(q * 100)}_s": round(_percentile(durations, q), 6) if durations else None
+                   for q in QUANTILES},
+            }
+        return summary
+
+    def render(self) -> str:
+        """Conteúdo do arquivo no formato de exposição de texto do Prometheus"""
+        p = METRIC_PREFIX
+        lines: List[str] = []
+        engines = sorted(self.engines.items())
+
+        def metric(name: str, kind: str, help_text: str, samples: List[tuple]):
+            if not samples:
+                return
+            lines.append(f"# HELP {p}_{name} {help_text}")
+            lines.append(f"# TYPE {p}_{name} {kind}")
+            for suffix, labels, value in samples:
+                lines.append(f"{p}_{name}{suffix}{_labels(**labels)} {_number(value)}")
+
+        def per_engine(attr: str) -> List[tuple]:
+            return [("", {"engine": engine}, getattr(totals, attr)) for engine, totals in engines]
+
+        metric("conversoes_total", "counter", "Conversões concluídas por engine (cache = reaproveitadas)",
+               per_engine("conversions"))
+        metric("paginas_total", "counter", "Páginas convertidas por engine", per_engine("pages"))
+        metric("bytes_entrada_total", "counter", "Bytes de origem (PDF/XLSX) convertidos por engine",
+               per_engine("bytes_in"))
+        metric("bytes_saida_total", "counter", "Bytes de Markdown gravados por engine", per_engine("bytes_out"))
+        metric("espera_fila_segundos_total", "counter",
+               "Soma do tempo entre a entrada na fila e o início da conversão", per_engine("queue_wait"))
+        metric("fallbacks_total", "counter", "Conversões por fallback, pela classe do erro do engine original",
+               [("", {"engine": engine, "motivo": kind}, count)
+                for engine, totals in engines for kind, count in sorted(totals.fallbacks.items())])
+
+        histogram = []
+        for engine, totals in engines:
+            if not totals.timed:
+                continue
+            for bound, count in zip(DURATION_BUCKETS, totals.buckets):
+                histogram.append(("_bucket", {"engine": engine, "le": _number(bound)}, count))
+            histogram.append(("_bucket", {"engine": engine, "le": "+Inf"}, totals.timed))
+            histogram.append(("_sum", {"engine": engine}, totals.duration_sum))
+            histogram.append(("_count", {"engine": engine}, totals.timed))
+        metric("duracao_segundos", "histogram", "Duração das conversões por engine", histogram)
+
+        quantiles = []
+        for engine, totals in engines:
+            durations = sorted(totals.sample)
+            for q in QUANTILES if durations else ():
+                quantiles.append(("", {"engine": engine, "quantile": q}, _percentile(durations, q)))
+        metric("duracao_quantil_segundos", "gauge",
+               f"Percentis da duração por engine (amostra de até {SAMPLE_SIZE} conversões)", quantiles)
+
+        metric("arquivos_total", "counter", "Arquivos processados por resultado", [
+            ("", {"resultado": "convertido"}, self.converted),
+            ("", {"resultado": "cache"}, self.cached),
+            ("", {"resultado": "ja_existia"}, self.skipped),
+            ("", {"resultado": "erro"}, self.errors),
+        ])
+        metric("lote_duracao_segundos", "gauge", "Duração do lote desde o início",
+               [("", {}, time.time() - self.started_at)])
+        metric("ultima_execucao_timestamp_segundos", "gauge", "Momento (epoch) da última gravação das métricas",
+               [("", {}, time.time())])
+        return "\n".join(lines) + "\n"
+
+    def details_path(self, output_path: Optional[str] = None) -> Optional[Path]:
+        """JSON com o detalhe por arquivo, ao lado do arquivo de métricas"""
+        path = Path(output_path) if output_path else self.output_path
+        return path.with_suffix(".json") if path is not None else None
+
+    def write(self, output_path: Optional[str] = None) -> Optional[Path]:
+        """
+        Grava as métricas e o detalhe por arquivo atomicamente (o node exporter
+        nunca lê um arquivo pela metade)
+        """
+        path = Path(output_path) if output_path else self.output_path
+        if path is None:
+            return None
+        path.parent.mkdir(parents=True, exist_ok=True)
+        details = {
+            "gerado_em": time.time(),
+            "engines": self.engine_summary(),
+            "arquivos": dict(sorted(self.files.items())),
+        }
+        for target, content in (
+            (self.details_path(path), json.dumps(details, ensure_ascii=False, indent=2)),
+            (path, self.render()),
+        ):
+            tmp_path = target.with_name(target.name + ".tmp")
+            tmp_path.write_text(content, encoding="utf-8")
+            os.replace(tmp_path, target)
+        return path
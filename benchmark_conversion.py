@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Benchmark das conversões PDF/XLSX -> Markdown com um corpus sintético.
+
+Gera, sem acesso à rede, editais em PDF (páginas de texto e tabelas) e
+planilhas de orçamento XLSX determinísticos (mesma semente = mesmos bytes) e
+mede cada caminho de conversão:
+
+- convert_with_pypdf e convert_with_docling (se instalado), por número de páginas
+- convert_excel_to_markdown, por tamanho de planilha
+- convert_pdfs_in_directory, para um diretório de PDFs
+
+Cada caso roda em um processo novo, para que o pico de memória (RSS) medido
+seja só dele. O resultado é salvo em JSON e pode ser comparado com o de
+outro commit (`--compare`).
+
+Uso:
+    python benchmark_conversion.py
+    python benchmark_conversion.py --quick --output /tmp/bench.json
+    python benchmark_conversion.py --compare benchmark_anterior.json
+"""
+
+import io
+import os
+import re
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+import zipfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+BENCHMARK_VERSION = 1
+DEFAULT_OUTPUT = "benchmark_conversao.json"
+DEFAULT_SEED = 1234
+
+# Tamanhos do corpus: páginas por PDF, (linhas, colunas) por planilha, PDFs no diretório
+CORPUS_SIZES = {
+    "completo": {"pdf_pages": [1, 20, 100, 400], "xlsx": [(50, 8), (2000, 15), (20000, 30)], "batch": (20, 10)},
+    "rapido": {"pdf_pages": [1, 20], "xlsx": [(50, 8), (2000, 15)], "batch": (5, 5)},
+}
+
+_WORDS = (
+    "edital proposta organização projeto recurso financiamento prazo submissão inscrição "
+    "elegibilidade requisito documentação certidão regularidade fiscal contrapartida orçamento "
+    "execução relatório prestação contas objetivo meta indicador resultado impacto social "
+    "comunidade território sustentabilidade inovação parceria cronograma etapa avaliação critério "
+    "pontuação comissão seleção habilitação recurso administrativo vedação pessoa jurídica"
+).split()
+
+
+# ---------------------------------------------------------------------------
+# Corpus sintético
+# ---------------------------------------------------------------------------
+
+def _pdf_string(text: str) -> str:
+    escaped = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    return f"({escaped})"
+
+
+def _page_stream(rng: random.Random, page_num: int) -> bytes:
+    """Conteúdo de uma página: título, parágrafos e, em páginas pares, uma tabela"""
+    ops = ["BT", "/F1 14 Tf", "72 740 Td", _pdf_string(f"{page_num}. SEÇÃO {page_num} DO EDITAL") + " Tj", "ET"]
+    y = 710
+    for _ in range(18):
+        line = " ".join(rng.choice(_WORDS) for _ in range(12)).capitalize() + "."
+        ops += ["BT", "/F1 10 Tf", f"72 {y} Td", _pdf_string(line) + " Tj", "ET"]
+        y -= 14
+    if page_num % 2 == 0:
+        y -= 10
+        header = ["Item", "Descrição", "Qtd", "Valor (R$)"]
+        rows = [header] + [
+            [str(i), rng.choice(_WORDS).capitalize(), str(rng.randint(1, 50)), f"{rng.uniform(100, 90000):.2f}"]
+            for i in range(1, 12)
+        ]
+        for row in rows:
+            ops += ["BT", "/F1 9 Tf", f"72 {y} Td"]
+            x_prev = 72
+            for x, cell in zip((72, 120, 330, 400), row):
+                ops += [f"{x - x_prev} 0 Td", _pdf_string(cell) + " Tj"]
+                x_prev = x
+            ops.append("ET")
+            y -= 13
+    return "\n".join(ops).encode("cp1252", errors="replace")
+
+
+def make_pdf(path: Path, pages: int, seed: int):
+    """Grava um PDF sintético determinístico (sem datas nos metadados)"""
+    rng = random.Random(f"{seed}-{path.name}-{pages}")
+    objects: List[bytes] = [b"<< /Type /Catalog /Pages 2 0 R >>"]
+    kids = " ".join(f"{4 + 2 * i} 0 R" for i in range(pages))
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {pages} >>".encode())
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    for i in range(pages):
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {5 + 2 * i} 0 R "
+            f"/Resources << /Font << /F1 3 0 R >> >> >>".encode()
+        )
+        stream = _page_stream(rng, i + 1)
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + obj + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    path.write_bytes(bytes(out))
+
+
+def make_xlsx(path: Path, rows: int, cols: int, seed: int):
+    """Grava uma planilha de orçamento sintética determinística (requer openpyxl)"""
+    import openpyxl
+
+    rng = random.Random(f"{seed}-{path.name}-{rows}x{cols}")
+    wb = openpyxl.Workbook()
+    wb.properties.created = datetime(2025, 1, 1)
+    ws = wb.active
+    ws.title = "Orçamento"
+    ws.append(["Rubrica", "Descrição"] + [f"Mês {m}" for m in range(1, cols - 1)])
+    for r in range(1, rows):
+        ws.append(
+            [f"{r // 10 + 1}.{r % 10}", " ".join(rng.choice(_WORDS) for _ in range(3))]
+            + [round(rng.uniform(0, 5000), 2) for _ in range(cols - 2)]
+        )
+    resumo = wb.create_sheet("Resumo")
+    resumo.append(["Total", "=SUM('Orçamento'!C2:C10)"])
+    buffer = io.BytesIO()
+    wb.save(buffer)
+
+    # openpyxl grava a data atual em docProps e no ZIP; fixa as duas
+    with zipfile.ZipFile(io.BytesIO(buffer.getvalue())) as src, \
+            zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as dst:
+        for info in src.infolist():
+            data = src.read(info.filename)
+            if info.filename == "docProps/core.xml":
+                data = re.sub(rb"<dcterms:modified([^>]*)>[^<]*<",
+                              rb"<dcterms:modified\1>2025-01-01T00:00:00Z<", data)
+            dst.writestr(zipfile.ZipInfo(info.filename, date_time=(2025, 1, 1, 0, 0, 0)), data,
+                         compress_type=zipfile.ZIP_DEFLATED)
+
+
+def build_corpus(directory: Path, sizes: Dict[str, Any], seed: int, with_xlsx: bool) -> Dict[str, Any]:
+    """Gera o corpus no diretório e retorna a descrição dos arquivos"""
+    corpus: Dict[str, Any] = {"pdf": [], "xlsx": [], "batch_dir": None}
+    for pages in sizes["pdf_pages"]:
+        path = directory / f"edital_{pages:04d}p.pdf"
+        make_pdf(path, pages, seed)
+        corpus["pdf"].append({"path": str(path), "pages": pages})
+    if with_xlsx:
+        for rows, cols in sizes["xlsx"]:
+            path = directory / f"orcamento_{rows}x{cols}.xlsx"
+            make_xlsx(path, rows, cols, seed)
+            corpus["xlsx"].append({"path": str(path), "rows": rows, "cols": cols})
+    count, pages = sizes["batch"]
+    batch_dir = directory / "lote"
+    batch_dir.mkdir()
+    for i in range(count):
+        make_pdf(batch_dir / f"doc_{i:03d}.pdf", pages, seed)
+    corpus["batch_dir"] = {"path": str(batch_dir), "files": count, "pages": count * pages}
+    return corpus
+
+
+# ---------------------------------------------------------------------------
+# Execução dos casos (em processo separado)
+# ---------------------------------------------------------------------------
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB; macOS em bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _run_case(kind: str, path: str, repeat: int, package_dir: str, workdir: str) -> Dict[str, Any]:
+    """Executa um caso `repeat` vezes; roda em um processo novo (spawn)"""
+    sys.path.insert(0, package_dir)
+    os.chdir(workdir)
+    import pdf_converter
+
+    # Os engines são importados na primeira conversão; importa antes de medir
+    engine_module = {"pypdf": "pypdf", "batch": "pypdf", "xlsx": "openpyxl"}.get(kind)
+    if engine_module:
+        __import__(engine_module)
+
+    rss_before = _peak_rss_mb()
+    times = []
+    for _ in range(repeat):
+        if kind == "batch":
+            # Cada repetição converte o diretório inteiro do zero
+            for md in Path(path).glob("*.md"):
+                md.unlink()
+            shutil.rmtree(Path(workdir) / "memories" / "logs", ignore_errors=True)
+        start = time.perf_counter()
+        if kind == "pypdf":
+            pdf_converter.convert_with_pypdf(Path(path))
+        elif kind == "docling":
+            pdf_converter.convert_with_docling(Path(path))
+        elif kind == "xlsx":
+            pdf_converter.convert_excel_to_markdown(path, output_path=str(Path(workdir) / "saida.md"))
+        elif kind == "batch":
+            import converter_pdfs_batch
+            converter_pdfs_batch.convert_pdfs_in_directory(path, engine="pypdf")
+        times.append(time.perf_counter() - start)
+    return {"tempos_s": times, "rss_inicial_mb": rss_before, "pico_rss_mb": _peak_rss_mb()}
+
+
+def run_case(kind: str, path: str, repeat: int, workdir: str) -> Dict[str, Any]:
+    package_dir = str(Path(__file__).resolve().parent)
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(_run_case, kind, path, repeat, package_dir, workdir).result()
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent, capture_output=True, text=True, timeout=5
+        )
+        return result.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_benchmark(sizes: Dict[str, Any], repeat: int, seed: int, engines: List[str]) -> Dict[str, Any]:
+    """Gera o corpus, executa todos os casos e retorna o relatório"""
+    import pdf_converter
+
+    available = {
+        "pypdf": pdf_converter.PYPDF_AVAILABLE,
+        "docling": pdf_converter.DOCLING_AVAILABLE,
+        "openpyxl": pdf_converter.OPENPYXL_AVAILABLE,
+    }
+    report: Dict[str, Any] = {
+        "versao": BENCHMARK_VERSION,
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "semente": seed,
+        "repeticoes": repeat,
+        "engines": available,
+        "casos": [],
+    }
+
+    with tempfile.TemporaryDirectory(prefix="bench_conversao_") as tmp:
+        workdir = Path(tmp)
+        corpus_dir = workdir / "corpus"
+        corpus_dir.mkdir()
+        corpus = build_corpus(corpus_dir, sizes, seed, with_xlsx=available["openpyxl"])
+
+        cases = []
+        for engine in ("pypdf", "docling"):
+            if engine not in engines:
+                continue
+            if not available[engine]:
+                print(f"⏭️  {engine} não instalado; casos ignorados", file=sys.stderr)
+                continue
+            for item in corpus["pdf"]:
+                cases.append((f"{engine}/{item['pages']}p", engine, item["path"], item["pages"], None))
+        if "xlsx" in engines:
+            if not available["openpyxl"]:
+                print("⏭️  openpyxl não instalado; casos XLSX ignorados", file=sys.stderr)
+            for item in corpus["xlsx"]:
+                cases.append((f"xlsx/{item['rows']}x{item['cols']}", "xlsx", item["path"], None, item["rows"]))
+        if "batch" in engines and available["pypdf"]:
+            batch = corpus["batch_dir"]
+            cases.append((f"lote/{batch['files']}pdfs", "batch", batch["path"], batch["pages"], None))
+
+        for name, kind, path, pages, rows in cases:
+            print(f"⏱️  {name}...", file=sys.stderr)
+            try:
+                result = run_case(kind, path, repeat, str(workdir))
+            except Exception as e:
+                print(f"❌ Erro em {name}: {e}", file=sys.stderr)
+                report["casos"].append({"nome": name, "erro": str(e)})
+                continue
+            median = statistics.median(result["tempos_s"])
+            case = {
+                "nome": name,
+                "engine": kind,
+                "bytes": os.path.getsize(path) if os.path.isfile(path) else sum(
+                    f.stat().st_size for f in Path(path).glob("*.pdf")),
+                "tempos_s": [round(t, 4) for t in result["tempos_s"]],
+                "mediana_s": round(median, 4),
+                "min_s": round(min(result["tempos_s"]), 4),
+                "rss_inicial_mb": result["rss_inicial_mb"],
+                "pico_rss_mb": result["pico_rss_mb"],
+            }
+            if pages:
+                case["paginas"] = pages
+                case["paginas_por_s"] = round(pages / median, 1) if median > 0 else None
+            if rows:
+                case["linhas"] = rows
+                case["linhas_por_s"] = round(rows / median, 1) if median > 0 else None
+            report["casos"].append(case)
+    return report
+
+
+def print_report(report: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None):
+    """Imprime a tabela de resultados (com a variação em relação ao baseline, se houver)"""
+    previous = {c["nome"]: c for c in (baseline or {}).get("casos", []) if "erro" not in c}
+    print("")
+    print(f"📊 BENCHMARK DE CONVERSÃO (commit {report.get('commit') or '?'})")
+    print("-" * 78)
+    header = f"{'Caso':<22} {'Mediana':>10} {'Mín':>10} {'Pico RSS':>10} {'Vazão':>14}"
+    if previous:
+        header += f" {'vs base':>8}"
+    print(header)
+    for case in report["casos"]:
+        if "erro" in case:
+            print(f"{case['nome']:<22} erro: {case['erro']}")
+            continue
+        rate = ""
+        if case.get("paginas_por_s") is not None:
+            rate = f"{case['paginas_por_s']:.1f} pág/s"
+        elif case.get("linhas_por_s") is not None:
+            rate = f"{case['linhas_por_s']:.0f} lin/s"
+        rss = f"{case['pico_rss_mb']:.0f} MB" if case.get("pico_rss_mb") is not None else "-"
+        line = f"{case['nome']:<22} {case['mediana_s']:>9.3f}s {case['min_s']:>9.3f}s {rss:>10} {rate:>14}"
+        base = previous.get(case["nome"])
+        if base and base.get("mediana_s"):
+            change = (case["mediana_s"] / base["mediana_s"] - 1) * 100
+            line += f" {change:>+7.1f}%"
+        print(line)
+    print("-" * 78)
+
+
+def main():
+    """Função principal CLI"""
+    parser = argparse.ArgumentParser(
+        description="Mede o desempenho das conversões PDF/XLSX -> Markdown com um corpus sintético",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Exemplos:
+  python benchmark_conversion.py
+  python benchmark_conversion.py --quick --repeat 1
+  python benchmark_conversion.py --engines pypdf xlsx --output /tmp/bench.json
+  python benchmark_conversion.py --compare benchmark_anterior.json
+        """
+    )
+
+    parser.add_argument("--quick", action="store_true", help="Corpus reduzido (execução rápida)")
+    parser.add_argument("--repeat", "-r", type=int, default=3, help="Repetições por caso (padrão: 3)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help=f"Semente do corpus (padrão: {DEFAULT_SEED})")
+    parser.add_argument(
+        "--engines",
+        nargs="+",
+        choices=["pypdf", "docling", "xlsx", "batch"],
+        default=["pypdf", "docling", "xlsx", "batch"],
+        help="Caminhos de conversão a medir (padrão: todos os disponíveis)"
+    )
+    parser.add_argument(
+        "--output", "-o",
+        default=DEFAULT_OUTPUT,
+        help=f"Arquivo JSON de resultados (padrão: {DEFAULT_OUTPUT})"
+    )
+    parser.add_argument("--compare", metavar="BASE.json", help="Compara com resultados anteriores")
+
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        try:
+            baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            print(f"❌ Erro ao ler {args.compare}: {e}")
+            sys.exit(1)
+
+    sizes = CORPUS_SIZES["rapido" if args.quick else "completo"]
+    report = run_benchmark(sizes, max(1, args.repeat), args.seed, args.engines)
+
+    Path(args.output).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print_report(report, baseline)
+    print(f"💾 Resultados salvos em: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
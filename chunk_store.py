@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Divisão do Markdown convertido em trechos endereçáveis (páginas, títulos e cláusulas).
+
+O índice `<nome>.chunks.json`, gravado ao lado do `.md`, guarda o intervalo de
+bytes de cada página (`## Página N`) e de cada trecho iniciado por um título
+Markdown ou por uma cláusula numerada ("3.1 DOS REQUISITOS", "CLÁUSULA QUINTA",
+"Art. 5º"). Ele é criado na primeira leitura por `ChunkStore` ou, com
+`chunk_index` ativado no config.json, já na conversão (pdf_converter.py).
+
+Quem consome o edital pode mapear o `.md` em memória (mmap) e ler apenas os
+trechos necessários (ex.: prazos, elegibilidade) em vez do documento inteiro.
+
+Uso:
+    python chunk_store.py memories/editais/edital.md              # lista os trechos
+    python chunk_store.py memories/editais/edital.md --pagina 3
+    python chunk_store.py memories/editais/edital.md --trecho 12
+"""
+
+import os
+import re
+import sys
+import json
+import mmap
+import argparse
+from pathlib import Path
+from typing import Optional, List, Dict, Any
+
+
+CHUNKS_SUFFIX = ".chunks.json"
+CHUNKS_VERSION = 1
+
+# Tamanho máximo do título guardado no índice
+TITLE_MAX_CHARS = 80
+
+_PAGE_RE = re.compile(r'^## Página (\d+)\s*$')
+_HEADING_RE = re.compile(r'^(#{1,6})\s+(.+?)\s*#*\s*$')
+# Cláusulas: "CLÁUSULA PRIMEIRA", "Art. 5º", "3.", "3.1 Dos Requisitos", "4.2.1 -", "II - DO OBJETO"
+_CLAUSE_RES = [
+    (re.compile(r'^CL[ÁA]USULA\s+\S+', re.IGNORECASE), 1),
+    (re.compile(r'^(?:Art\.|Artigo)\s*\d+', re.IGNORECASE), 1),
+    (re.compile(r'^(\d{1,2}(?:\.\d{1,3})*)(?:[.)]|\s+[-–])?\s+[A-ZÀ-Ú]'), None),
+    (re.compile(r'^[IVXL]{1,6}\s*[-–.]\s+[A-ZÀ-Ú]'), 1),
+]
+
+
+def sidecar_path(md_path: Path) -> Path:
+    """Caminho do índice de trechos de um Markdown (`edital.md` → `edital.chunks.json`)"""
+    md_path = Path(md_path)
+    return md_path.with_name(md_path.stem + CHUNKS_SUFFIX)
+
+
+def _boundary(line: str):
+    """
+    Classifica uma linha que inicia um trecho
+
+    Returns:
+        Tupla (tipo, nível, título) ou None se a linha não inicia trecho
+    """
+    stripped = line.strip()
+    if not stripped:
+        return None
+
+    heading = _HEADING_RE.match(stripped)
+    if heading:
+        return ("titulo", len(heading.group(1)), heading.group(2))
+
+    for pattern, level in _CLAUSE_RES:
+        match = pattern.match(stripped)
+        if match:
+            if level is None:
+                level = match.group(1).count(".") + 1
+            return ("clausula", level, stripped)
+    return None
+
+
+def build_chunks(data: bytes) -> Dict[str, Any]:
+    """
+    Localiza páginas e trechos em um Markdown
+
+    Args:
+        data: Conteúdo do arquivo em bytes (offsets são em bytes)
+
+    Returns:
+        Dicionário com "paginas" (número e intervalo de bytes de cada página)
+        e "trechos" (tipo, nível, título, página e intervalo de bytes)
+    """
+    pages: List[Dict[str, Any]] = []
+    chunks: List[Dict[str, Any]] = []
+    page: Optional[int] = None
+    offset = 0
+
+    def close_last(end: int):
+        if chunks and chunks[-1]["fim"] is None:
+            chunks[-1]["fim"] = end
+
+    for raw_line in data.splitlines(keepends=True):
+        line = raw_line.decode("utf-8", errors="replace")
+        page_match = _PAGE_RE.match(line.rstrip("\r\n"))
+        if page_match:
+            close_last(offset)
+            if pages:
+                pages[-1]["fim"] = offset
+            page = int(page_match.group(1))
+            pages.append({"pagina": page, "inicio": offset, "fim": None})
+            chunks.append({"tipo": "pagina", "nivel": 0, "titulo": f"Página {page}",
+                           "pagina": page, "inicio": offset, "fim": None})
+        else:
+            boundary = _boundary(line)
+            if boundary is not None:
+                kind, level, title = boundary
+                close_last(offset)
+                chunks.append({"tipo": kind, "nivel": level, "titulo": title[:TITLE_MAX_CHARS],
+                               "pagina": page, "inicio": offset, "fim": None})
+            elif not chunks:
+                # Texto antes do primeiro título/página (raro: o cabeçalho começa com "# ")
+                chunks.append({"tipo": "cabecalho", "nivel": 0, "titulo": "",
+                               "pagina": None, "inicio": offset, "fim": None})
+        offset += len(raw_line)
+
+    close_last(offset)
+    if pages:
+        pages[-1]["fim"] = offset
+
+    for position, chunk in enumerate(chunks):
+        chunk["id"] = position
+    return {"paginas": pages, "trechos": chunks}
+
+
+def write_chunk_index(md_path: Path) -> Path:
+    """
+    Gera (ou regera) o índice de trechos de um Markdown
+
+    Returns:
+        Caminho do índice gravado
+    """
+    md_path = Path(md_path)
+    st = md_path.stat()
+    index = build_chunks(md_path.read_bytes())
+    index.update({
+        "version": CHUNKS_VERSION,
+        "arquivo": md_path.name,
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+    })
+
+    out = sidecar_path(md_path)
+    tmp_path = out.with_name(out.name + ".tmp")
+    tmp_path.write_text(json.dumps(index, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp_path, out)
+    return out
+
+
+class ChunkStore:
+    """
+    Acesso por trecho a um Markdown convertido, via mmap
+
+    O índice é regerado automaticamente se o `.md` mudou desde sua criação.
+    """
+
+    def __init__(self, md_path: Path):
+        self.md_path = Path(md_path)
+        self.index = self._load_index()
+        self._file = open(self.md_path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+    def _load_index(self) -> Dict[str, Any]:
+        st = self.md_path.stat()
+        try:
+            index = json.loads(sidecar_path(self.md_path).read_text(encoding="utf-8"))
+            if (index.get("version") == CHUNKS_VERSION and index.get("size") == st.st_size
+                    and index.get("mtime_ns") == st.st_mtime_ns):
+                return index
+        except (OSError, ValueError):
+            pass
+        write_chunk_index(self.md_path)
+        return json.loads(sidecar_path(self.md_path).read_text(encoding="utf-8"))
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def chunks(self) -> List[Dict[str, Any]]:
+        return self.index["trechos"]
+
+    def read(self, start: int, end: int) -> str:
+        """Lê um intervalo de bytes do Markdown"""
+        return self._map[start:end].decode("utf-8", errors="replace")
+
+    def text(self, chunk: Dict[str, Any]) -> str:
+        """Texto de um trecho do índice"""
+        return self.read(chunk["inicio"], chunk["fim"])
+
+    def page(self, number: int) -> Optional[str]:
+        """Texto completo de uma página (None se não existir)"""
+        for page in self.index["paginas"]:
+            if page["pagina"] == number:
+                return self.read(page["inicio"], page["fim"])
+        return None
+
+    def find(self, title: str) -> List[Dict[str, Any]]:
+        """Trechos cujo título contém `title` (sem diferenciar maiúsculas)"""
+        title = title.lower()
+        return [c for c in self.chunks if title in c["titulo"].lower()]
+
+
+def main():
+    """Função principal CLI"""
+    parser = argparse.ArgumentParser(
+        description="Lista e lê trechos (páginas, títulos, cláusulas) de um Markdown convertido",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Exemplos:
+  python chunk_store.py memories/editais/edital.md
+  python chunk_store.py memories/editais/edital.md --pagina 3
+  python chunk_store.py memories/editais/edital.md --trecho 12
+  python chunk_store.py memories/editais/edital.md --titulo elegibilidade
+        """
+    )
+
+    parser.add_argument("arquivo", help="Arquivo Markdown convertido")
+    parser.add_argument("--pagina", type=int, help="Imprime a página N")
+    parser.add_argument("--trecho", type=int, help="Imprime o trecho de número ID")
+    parser.add_argument("--titulo", help="Imprime os trechos cujo título contém o texto")
+
+    args = parser.parse_args()
+
+    md_path = Path(args.arquivo)
+    if not md_path.exists():
+        print(f"❌ Erro: Arquivo não encontrado: {md_path}")
+        sys.exit(1)
+
+    with ChunkStore(md_path) as store:
+        if args.pagina is not None:
+            text = store.page(args.pagina)
+            if text is None:
+                print(f"❌ Erro: Página {args.pagina} não encontrada")
+                sys.exit(1)
+            print(text)
+        elif args.trecho is not None:
+            if not 0 <= args.trecho < len(store.chunks):
+                print(f"❌ Erro: Trecho {args.trecho} não encontrado")
+                sys.exit(1)
+            print(store.text(store.chunks[args.trecho]))
+        elif args.titulo:
+            found = store.find(args.titulo)
+            if not found:
+                print(f"❌ Nenhum trecho com título contendo: {args.titulo}")
+                sys.exit(1)
+            for chunk in found:
+                print(store.text(chunk))
+        else:
+            print(f"📄 {md_path}: {len(store.index['paginas'])} página(s), {len(store.chunks)} trecho(s)")
+            print("-" * 70)
+            for chunk in store.chunks:
+                indent = "  " * max(chunk["nivel"] - 1, 0)
+                page = f"p.{chunk['pagina']}" if chunk["pagina"] else ""
+                size = chunk["fim"] - chunk["inicio"]
+                print(f"{chunk['id']:>4} {page:>6} {size:>7} B  {indent}{chunk['titulo']}")
+            print("-" * 70)
+
+
+if __name__ == "__main__":
+    main()
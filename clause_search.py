@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Busca BM25 de cláusulas em um edital convertido.
+
+Cada trecho do índice de `chunk_store.py` (página, título ou cláusula) é um
+documento. As estatísticas de termos (frequência por trecho, tamanho dos
+trechos) são pré-calculadas e gravadas ao lado do Markdown em
+`<nome>.bm25.json`, de modo que a consulta só lê do `.md` os poucos trechos
+retornados. O arquivo é criado na primeira consulta ou, com `chunk_index`
+ativado no config.json, já na conversão (pdf_converter.py).
+
+Usado pelas tarefas `filtro-inelegibilidade` e `analise-sentimento-edital`
+de workflows/analise-edital.yaml com os conjuntos de termos de QUERY_SETS.
+
+Uso:
+    python clause_search.py memories/editais/edital.md --conjunto inelegibilidade
+    python clause_search.py memories/editais/edital.md "contrapartida" "prazo de execução" --top 3
+"""
+
+import os
+import re
+import sys
+import json
+import math
+import argparse
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+from chunk_store import ChunkStore
+
+
+BM25_SUFFIX = ".bm25.json"
+BM25_VERSION = 2
+
+# Parâmetros usuais do BM25
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Termos de consulta prontos para as tarefas do workflow analise-edital
+QUERY_SETS = {
+    "inelegibilidade": [
+        "vedado", "vedada", "vedação", "não poderão participar", "impedido", "impedimento",
+        "inelegível", "exclusivamente", "tempo mínimo de existência", "anos de existência",
+        "fundação", "CNPJ", "sede", "território", "natureza jurídica", "certidão",
+        "regularidade fiscal", "inadimplente", "contrapartida", "público-alvo", "requisitos",
+        "elegibilidade", "desclassificada", "inabilitada",
+    ],
+    "sentimento": [
+        "critérios de avaliação", "pontuação", "peso", "prioridade", "priorizadas",
+        "inovação", "impacto", "sustentabilidade", "escala", "equidade", "diversidade",
+        "inclusão", "território", "transformação", "resultados", "indicadores",
+    ],
+}
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+_STOPWORDS = {
+    "a", "ao", "aos", "as", "com", "como", "da", "das", "de", "do", "dos", "e", "em",
+    "na", "nas", "no", "nos", "o", "os", "ou", "para", "pela", "pelas", "pelo", "pelos",
+    "por", "que", "se", "sem", "sua", "suas", "seu", "seus", "um", "uma", "à", "às",
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Termos normalizados: minúsculas, sem acentos e sem palavras vazias"""
+    normalized = unicodedata.normalize("NFKD", text.lower())
+    normalized = "".join(ch for ch in normalized if not unicodedata.combining(ch))
+    return [t for t in _TOKEN_RE.findall(normalized) if t not in _STOPWORDS and len(t) > 1]
+
+
+def stats_path(md_path: Path) -> Path:
+    """Caminho das estatísticas BM25 de um Markdown (`edital.md` → `edital.bm25.json`)"""
+    md_path = Path(md_path)
+    return md_path.with_name(md_path.stem + BM25_SUFFIX)
+
+
+def write_bm25_stats(md_path: Path, store: Optional[ChunkStore] = None) -> Path:
+    """
+    Pré-calcula as estatísticas de termos dos trechos de um Markdown
+
+    Grava, por termo, a lista (trecho, frequência) e, por trecho, o número
+    de termos. A linha "## Página N" não conta como texto do trecho, de modo
+    que trechos só com o título da página não são indexados.
+
+    Returns:
+        Caminho do arquivo de estatísticas
+    """
+    md_path = Path(md_path)
+    own_store = store is None
+    if own_store:
+        store = ChunkStore(md_path)
+    try:
+        postings: Dict[str, List[List[int]]] = {}
+        lengths: Dict[int, int] = {}
+        for chunk in store.chunks:
+            text = store.text(chunk)
+            if chunk["tipo"] == "pagina":
+                text = text.partition("\n")[2]
+            terms = tokenize(text)
+            if not terms:
+                continue
+            lengths[chunk["id"]] = len(terms)
+            for term, tf in Counter(terms).items():
+                postings.setdefault(term, []).append([chunk["id"], tf])
+        st = md_path.stat()
+    finally:
+        if own_store:
+            store.close()
+
+    stats = {
+        "version": BM25_VERSION,
+        "arquivo": md_path.name,
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "trechos": len(lengths),
+        "media_termos": (sum(lengths.values()) / len(lengths)) if lengths else 0.0,
+        "tamanhos": {str(k): v for k, v in lengths.items()},
+        "postings": postings,
+    }
+
+    out = stats_path(md_path)
+    tmp_path = out.with_name(out.name + ".tmp")
+    tmp_path.write_text(json.dumps(stats, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp_path, out)
+    return out
+
+
+class ClauseSearch:
+    """Consulta BM25 sobre os trechos de um edital convertido"""
+
+    def __init__(self, md_path: Path):
+        self.md_path = Path(md_path)
+        self.store = ChunkStore(self.md_path)
+        self.stats = self._load_stats()
+
+    def _load_stats(self) -> Dict[str, Any]:
+        st = self.md_path.stat()
+        try:
+            stats = json.loads(stats_path(self.md_path).read_text(encoding="utf-8"))
+            if (stats.get("version") == BM25_VERSION and stats.get("size") == st.st_size
+                    and stats.get("mtime_ns") == st.st_mtime_ns):
+                return stats
+        except (OSError, ValueError):
+            pass
+        write_bm25_stats(self.md_path, self.store)
+        return json.loads(stats_path(self.md_path).read_text(encoding="utf-8"))
+
+    def close(self):
+        self.store.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def search(self, queries: List[str], top: int = 5) -> List[Dict[str, Any]]:
+        """
+        Retorna os trechos mais relevantes para um conjunto de consultas
+
+        Os termos de todas as consultas são somados em uma única pontuação
+        BM25 por trecho. Só os trechos retornados são lidos do Markdown.
+
+        Args:
+            queries: Termos ou expressões (ex.: QUERY_SETS["inelegibilidade"])
+            top: Número máximo de trechos
+
+        Returns:
+            Trechos em ordem decrescente de pontuação, com página, título,
+            termos encontrados e texto
+        """
+        n_chunks = self.stats["trechos"]
+        avg_len = self.stats["media_termos"] or 1.0
+        lengths = self.stats["tamanhos"]
+        postings = self.stats["postings"]
+
+        scores: Dict[int, float] = {}
+        matched: Dict[int, set] = {}
+        for term in set(t for query in queries for t in tokenize(query)):
+            term_postings = postings.get(term)
+            if not term_postings:
+                continue
+            idf = math.log(1 + (n_chunks - len(term_postings) + 0.5) / (len(term_postings) + 0.5))
+            for chunk_id, tf in term_postings:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[str(chunk_id)] / avg_len)
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+                matched.setdefault(chunk_id, set()).add(term)
+
+        best = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:top]
+        results = []
+        for chunk_id, score in best:
+            chunk = self.store.chunks[chunk_id]
+            results.append({
+                "id": chunk_id,
+                "pagina": chunk["pagina"],
+                "titulo": chunk["titulo"],
+                "score": round(score, 4),
+                "termos": sorted(matched[chunk_id]),
+                "texto": self.store.text(chunk).strip(),
+            })
+        return results
+
+
+def main():
+    """Função principal CLI"""
+    parser = argparse.ArgumentParser(
+        description="Retorna as cláusulas de um edital convertido mais relevantes para um conjunto de termos (BM25)",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=f"""
+Conjuntos de termos disponíveis: {', '.join(QUERY_SETS)}
+
+Exemplos:
+  python clause_search.py memories/editais/edital.md --conjunto inelegibilidade
+  python clause_search.py memories/editais/edital.md --conjunto sentimento --top 10
+  python clause_search.py memories/editais/edital.md "contrapartida" "prazo de execução"
+        """
+    )
+
+    parser.add_argument("arquivo", help="Markdown do edital convertido")
+    parser.add_argument("termos", nargs="*", help="Termos ou expressões da consulta")
+    parser.add_argument(
+        "--conjunto", "-c",
+        choices=sorted(QUERY_SETS),
+        action="append",
+        default=[],
+        help="Conjunto de termos predefinido (pode ser repetido)"
+    )
+    parser.add_argument("--top", "-n", type=int, default=5, help="Número de trechos retornados (padrão: 5)")
+    parser.add_argument("--json", action="store_true", help="Imprime os resultados em JSON")
+
+    args = parser.parse_args()
+
+    queries = list(args.termos)
+    for name in args.conjunto:
+        queries.extend(QUERY_SETS[name])
+    if not queries:
+        parser.error("informe termos ou --conjunto")
+
+    md_path = Path(args.arquivo)
+    if not md_path.exists():
+        print(f"❌ Erro: Arquivo não encontrado: {md_path}")
+        sys.exit(1)
+
+    with ClauseSearch(md_path) as search:
+        results = search.search(queries, top=args.top)
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+
+    if not results:
+        print("🔍 Nenhum trecho encontrado para os termos informados")
+        sys.exit(1)
+
+    for position, result in enumerate(results, 1):
+        page = f"p.{result['pagina']} " if result["pagina"] else ""
+        print(f"{position}. [{page}#{result['id']}] {result['titulo']} (score {result['score']:.2f})")
+        print(f"   Termos: {', '.join(result['termos'])}")
+        print("")
+        print(result["texto"])
+        print("-" * 70)
+
+
+if __name__ == "__main__":
+    main()
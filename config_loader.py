@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Leitura do config/config.json com cache por processo.
+
+O arquivo é lido e interpretado uma única vez; as chamadas seguintes só
+comparam o mtime/tamanho (um `stat`) e releem o JSON se ele mudou. Isso evita
+reler o arquivo a cada PDF em conversões em lote e no modo `--watch`, e
+ainda assim aplica edições feitas com o processo em execução.
+
+O caminho é resolvido em relação a este módulo (a raiz do projeto), e não ao
+diretório atual. Para usar outro arquivo, defina `BMAD_CONFIG`.
+
+Qualquer chave pode ser sobrescrita por variável de ambiente com o prefixo
+`BMAD_`, usando `__` para separar os níveis. O valor é interpretado como JSON
+quando possível (números, true/false, null) e como texto caso contrário:
+
+    BMAD_PDF_CONVERSION__DEFAULT_ENGINE=pypdf
+    BMAD_PDF_CONVERSION__PAGE_WORKERS=4
+    BMAD_PDF_CONVERSION__DOCLING_OPTIONS__ENABLE_OCR=false
+"""
+
+import os
+import sys
+import copy
+import json
+from pathlib import Path
+from typing import Optional, Dict, Any, Tuple
+
+ENV_CONFIG_PATH = "BMAD_CONFIG"
+ENV_PREFIX = "BMAD_"
+ENV_SEPARATOR = "__"
+
+CONFIG_PATH = Path(__file__).resolve().parent / "config" / "config.json"
+
+DEFAULT_CONFIG = {
+    "pdf_conversion": {
+        "default_engine": "auto",
+        "fallback_to_pypdf": True,
+        "docling_options": {
+            "enable_ocr": True,
+            "preserve_tables": True,
+            "preserve_formulas": True
+        }
+    }
+}
+
+# Cache do processo: caminho -> (assinatura do arquivo, configuração)
+_CACHE: Dict[str, Tuple[Optional[Tuple[int, int]], Dict[str, Any]]] = {}
+# Overrides do ambiente, lidos uma vez por processo (percorrer os.environ a
+# cada chamada custaria mais que o próprio stat)
+_ENV_OVERRIDES: Optional[Tuple[Tuple[str, str], ...]] = None
+
+
+def config_path() -> Path:
+    """
+    Arquivo de configuração em uso
+
+    `BMAD_CONFIG`, se definido; senão config/config.json ao lado deste
+    módulo; senão config/config.json no diretório atual (instalações antigas).
+    """
+    env_path = os.environ.get(ENV_CONFIG_PATH)
+    if env_path:
+        return Path(env_path)
+    if CONFIG_PATH.exists():
+        return CONFIG_PATH
+    return Path("config/config.json")
+
+
+def _env_overrides() -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted(
+        (name, value) for name, value in os.environ.items()
+        if name.startswith(ENV_PREFIX) and ENV_SEPARATOR in name[len(ENV_PREFIX):]
+    ))
+
+
+def _apply_overrides(config: Dict[str, Any], overrides: Tuple[Tuple[str, str], ...]):
+    for name, raw_value in overrides:
+        keys = [key.lower() for key in name[len(ENV_PREFIX):].split(ENV_SEPARATOR) if key]
+        if not keys:
+            continue
+        try:
+            value = json.loads(raw_value)
+        except ValueError:
+            value = raw_value
+        target = config
+        for key in keys[:-1]:
+            if not isinstance(target.get(key), dict):
+                target[key] = {}
+            target = target[key]
+        target[keys[-1]] = value
+
+
+def _read(path: Path) -> Dict[str, Any]:
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    if path.exists():
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                loaded = json.load(f)
+            # Mescla com configuração padrão
+            if "pdf_conversion" not in loaded:
+                loaded["pdf_conversion"] = config["pdf_conversion"]
+            config = loaded
+        except Exception as e:
+            print(f"Aviso: Erro ao carregar config.json: {e}", file=sys.stderr)
+    return config
+
+
+def load_config() -> Dict[str, Any]:
+    """
+    Carrega a configuração (com overrides do ambiente)
+
+    Relê o arquivo apenas se o mtime/tamanho mudou desde a última leitura.
+    As variáveis `BMAD_*` são lidas na primeira chamada do processo (ou após
+    clear_config_cache). Retorna uma cópia: alterá-la não afeta as próximas
+    chamadas.
+    """
+    global _ENV_OVERRIDES
+    path = config_path()
+    try:
+        st = path.stat()
+        signature = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        signature = None
+
+    key = str(path)
+    cached = _CACHE.get(key)
+    if cached is None or cached[0] != signature:
+        if _ENV_OVERRIDES is None:
+            _ENV_OVERRIDES = _env_overrides()
+        config = _read(path)
+        _apply_overrides(config, _ENV_OVERRIDES)
+        _CACHE[key] = (signature, config)
+    else:
+        config = cached[1]
+    return copy.deepcopy(config)
+
+
+def clear_config_cache():
+    """Descarta a configuração em cache e relê as variáveis de ambiente na próxima chamada"""
+    global _ENV_OVERRIDES
+    _CACHE.clear()
+    _ENV_OVERRIDES = None
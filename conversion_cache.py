@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Cache de conversões PDF -> Markdown endereçado por conteúdo.
+
+A chave é um hash SHA-256 dos bytes do PDF, do engine e das opções do Docling.
+Assim, o mesmo edital copiado em várias pastas de organização (ou baixado de
+novo com outro mtime) não é convertido outra vez.
+
+Cada entrada é um arquivo JSON com o Markdown gerado (sem o cabeçalho de
+metadados, que é refeito para o arquivo de destino) e seus metadados.
+O tamanho total é limitado; as entradas menos usadas recentemente (mtime)
+são removidas primeiro. Para não listar o cache inteiro a cada gravação, cada
+processo mantém uma estimativa do tamanho (uma varredura inicial mais o que
+ele próprio gravou) e só varre o diretório quando ela passa do limite. Com
+vários processos, o limite pode ser excedido temporariamente pelo que os
+outros gravaram desde a última varredura.
+"""
+
+import os
+import sys
+import json
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import Optional, Dict, Any, Tuple
+
+
+DEFAULT_CACHE_DIR = "memories/cache/conversoes"
+DEFAULT_MAX_SIZE_MB = 512
+
+# Metadados que dependem do arquivo de origem e não devem vir do cache
+_PER_FILE_METADATA = ("file_path", "file_name", "conversion_date")
+
+# Tamanho estimado de cada diretório de cache neste processo (em bytes).
+# Fica no módulo, e não na instância, para valer entre as tarefas de um
+# worker do pool (que recebe uma cópia do ConversionCache a cada tarefa)
+_SIZE_ESTIMATES: Dict[str, int] = {}
+
+# Ao passar do limite, remove entradas até esta fração dele, para que as
+# gravações seguintes não provoquem uma nova varredura cada uma
+EVICT_TARGET = 0.9
+
+
+def hash_file(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """Calcula o SHA-256 do conteúdo de um arquivo, lendo em blocos"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ConversionCache:
+    """Cache LRU em disco de conversões, indexado pelo conteúdo do PDF"""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_size_mb: int = DEFAULT_MAX_SIZE_MB):
+        self.cache_dir = Path(cache_dir)
+        self.max_size_bytes = max(0, int(max_size_mb)) * 1024 * 1024
+
+    def make_key(self, pdf_path: Path, engine: str, docling_options: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Gera a chave de cache de um PDF
+
+        Args:
+            pdf_path: Caminho do PDF
+            engine: Engine usado na conversão
+            docling_options: Opções do Docling (afetam o resultado)
+
+        Returns:
+            Hash hexadecimal da combinação conteúdo + engine + opções
+        """
+        digest = hashlib.sha256()
+        digest.update(hash_file(pdf_path).encode("ascii"))
+        digest.update(b"|")
+        digest.update(engine.encode("utf-8"))
+        digest.update(b"|")
+        digest.update(json.dumps(docling_options or {}, sort_keys=True).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Busca uma conversão no cache
+
+        Returns:
+            Tupla (markdown_content, metadata) ou None se não estiver em cache
+        """
+        entry = self._entry_path(key)
+        try:
+            with open(entry, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        # Marca como usada recentemente (ordem LRU pelo mtime)
+        try:
+            os.utime(entry, None)
+        except OSError:
+            pass
+
+        return data.get("markdown", ""), data.get("metadata", {})
+
+    def put(self, key: str, markdown_content: str, metadata: Dict[str, Any]):
+        """Armazena uma conversão no cache e aplica o limite de tamanho"""
+        entry = self._entry_path(key)
+        cached_metadata = {k: v for k, v in metadata.items() if k not in _PER_FILE_METADATA}
+
+        tmp_path = None
+        try:
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                old_size = entry.stat().st_size
+            except OSError:
+                old_size = 0
+            # Escrita atômica: vários processos podem gravar no mesmo cache
+            fd, tmp_path = tempfile.mkstemp(dir=str(entry.parent), suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({"markdown": markdown_content, "metadata": cached_metadata}, f, ensure_ascii=False)
+            os.replace(tmp_path, entry)
+            tmp_path = None
+            new_size = entry.stat().st_size
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Aviso: Erro ao gravar cache de conversão: {e}", file=sys.stderr)
+            return
+        finally:
+            # Não deixa arquivos .tmp órfãos se a gravação falhar no meio
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+
+        key_dir = str(self.cache_dir.resolve())
+        if key_dir not in _SIZE_ESTIMATES:
+            self.evict()
+            return
+        _SIZE_ESTIMATES[key_dir] += new_size - old_size
+        if _SIZE_ESTIMATES[key_dir] > self.max_size_bytes:
+            self.evict()
+
+    def evict(self):
+        """
+        Remove as entradas menos usadas até o cache caber no limite
+
+        Lista o cache inteiro e atualiza a estimativa de tamanho do processo.
+        Ao passar do limite, remove até ficar em EVICT_TARGET dele.
+        """
+        if not self.cache_dir.exists():
+            return
+
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+
+        key_dir = str(self.cache_dir.resolve())
+        if total > self.max_size_bytes:
+            target = int(self.max_size_bytes * EVICT_TARGET)
+            entries.sort()
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                try:
+                    path.unlink()
+                    total -= size
+                except OSError:
+                    pass
+        _SIZE_ESTIMATES[key_dir] = total
+
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Medição por etapa das conversões (tempo, CPU e memória).
+
+`convert_pdf_to_markdown` (pdf_converter.py) mede cada etapa da conversão
+(resolução do arquivo, detecção do engine, configuração, extração, fallback,
+cabeçalho, gravação) e guarda o resultado em `metadata["etapas"]`. Cada etapa
+registra:
+
+- `tempo_s`: tempo de relógio
+- `cpu_s`: tempo de CPU do processo e dos subprocessos aguardados (ex.: `page_workers`)
+- `pico_rss_mb`: pico de memória (RSS) do processo ao final da etapa
+- `aumento_pico_mb`: quanto a etapa elevou esse pico
+- `pico_python_mb`: pico de memória alocada pelo Python na etapa (só com tracemalloc)
+
+O perfil pode ser exportado em JSON lines (`.jsonl`, uma linha por documento)
+ou em formato Chrome trace (demais extensões), que abre em chrome://tracing
+ou em https://ui.perfetto.dev. Os dois formatos aceitam gravações de vários
+processos no mesmo arquivo (conversão em lote).
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, List, Dict, Any
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Pico de RSS do processo até agora (None se indisponível)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB; macOS em bytes
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _cpu_seconds() -> float:
+    """CPU (usuário + sistema) do processo e dos subprocessos já finalizados"""
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+class StageProfiler:
+    """
+    Acumula as medições das etapas de uma conversão
+
+    Uso:
+        profiler = StageProfiler()
+        with profiler.stage("extracao"):
+            ...
+        metadata["etapas"] = profiler.stages
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self.stages: List[Dict[str, Any]] = []
+        # Só liga o tracemalloc se ninguém o ligou antes (e então o desliga no fim)
+        self._owns_tracemalloc = trace_memory and not tracemalloc.is_tracing()
+        self.trace_memory = trace_memory
+        if self._owns_tracemalloc:
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Mede o bloco como uma etapa; etapas que lançam exceção são registradas com `erro`"""
+        record: Dict[str, Any] = {"etapa": name}
+        rss_before = _peak_rss_mb()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            traced_before = tracemalloc.get_traced_memory()[0]
+        cpu_start = _cpu_seconds()
+        start = time.perf_counter()
+        try:
+            yield record
+        except BaseException as e:
+            record["erro"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            end = time.perf_counter()
+            record["inicio_s"] = round(start - self._start, 6)
+            record["tempo_s"] = round(end - start, 6)
+            record["cpu_s"] = round(_cpu_seconds() - cpu_start, 6)
+            rss_after = _peak_rss_mb()
+            if rss_after is not None:
+                record["pico_rss_mb"] = round(rss_after, 1)
+                record["aumento_pico_mb"] = round(rss_after - rss_before, 1)
+            if self.trace_memory:
+                peak = tracemalloc.get_traced_memory()[1]
+                record["pico_python_mb"] = round(max(peak - traced_before, 0) / (1024 * 1024), 2)
+            self.stages.append(record)
+
+    def total_seconds(self) -> float:
+        return round(time.perf_counter() - self._start, 6)
+
+    def finish(self) -> List[Dict[str, Any]]:
+        """Encerra a medição e retorna as etapas"""
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+        return self.stages
+
+
+def _append(path: Path, text: str):
+    """Acrescenta ao arquivo com uma única escrita (seguro entre processos com O_APPEND)"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    try:
+        os.write(fd, text.encode("utf-8"))
+    finally:
+        os.close(fd)
+
+
+def export_profile(profile_path: str, file_name: str, started_at: float,
+                   stages: List[Dict[str, Any]], total_s: float, extra: Optional[Dict[str, Any]] = None):
+    """
+    Acrescenta o perfil de uma conversão ao arquivo de perfil
+
+    Args:
+        profile_path: `.jsonl` para JSON lines; outras extensões para Chrome trace
+        file_name: Documento convertido
+        started_at: Início da conversão (epoch, segundos)
+        stages: Etapas medidas por StageProfiler
+        total_s: Tempo total da conversão
+        extra: Campos adicionais (engine, páginas, fallback...)
+    """
+    path = Path(profile_path)
+    extra = extra or {}
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix.lower() == ".jsonl":
+            line = {"arquivo": file_name, "inicio": round(started_at, 6), "total_s": total_s,
+                    **extra, "etapas": stages}
+            _append(path, json.dumps(line, ensure_ascii=False) + "\n")
+            return
+
+        # Chrome trace no formato "JSON Array", em que o "]" final é opcional:
+        # cada conversão só acrescenta eventos, mesmo com vários processos
+        pid, tid = os.getpid(), threading.get_ident() % 2 ** 31
+        base_us = started_at * 1e6
+        events = [{
+            "name": file_name, "cat": "conversao", "ph": "X", "pid": pid, "tid": tid,
+            "ts": round(base_us, 1), "dur": round(total_s * 1e6, 1), "args": extra,
+        }]
+        for stage in stages:
+            args = {k: v for k, v in stage.items() if k not in ("etapa", "inicio_s", "tempo_s")}
+            events.append({
+                "name": stage["etapa"], "cat": "etapa", "ph": "X", "pid": pid, "tid": tid,
+                "ts": round(base_us + stage["inicio_s"] * 1e6, 1),
+                "dur": round(stage["tempo_s"] * 1e6, 1), "args": args,
+            })
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+            try:
+                os.write(fd, b"[\n")
+            finally:
+                os.close(fd)
+        except FileExistsError:
+            pass
+        _append(path, "".join(json.dumps(e, ensure_ascii=False) + ",\n" for e in events))
+    except OSError as e:
+        print(f"Aviso: Erro ao gravar perfil da conversão em {path}: {e}", file=sys.stderr)
+
+
+def format_stages(stages: List[Dict[str, Any]]) -> str:
+    """Tabela de texto com as etapas (usada no modo verbose)"""
+    lines = [f"{'Etapa':<20} {'Tempo':>9} {'CPU':>9} {'Pico RSS':>10}"]
+    for stage in stages:
+        rss = f"{stage['pico_rss_mb']:.0f} MB" if stage.get("pico_rss_mb") is not None else "-"
+        line = f"{stage['etapa']:<20} {stage['tempo_s']:>8.3f}s {stage['cpu_s']:>8.3f}s {rss:>10}"
+        if "erro" in stage:
+            line += "  (erro)"
+        lines.append(line)
+    return "\n".join(lines)
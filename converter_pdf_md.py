@@ -4,6 +4,7 @@ Script para converter PDF em Markdown
 Usa Docling (primário) ou pypdf (fallback) via módulo pdf_converter.py
 """
 
+import os
 import sys
 import argparse
 from pathlib import Path
@@ -16,7 +17,16 @@ except ImportError:
     sys.exit(1)
 
 
-def pdf_to_markdown(pdf_path: str, output_path: str = None, engine: str = None, verbose: bool = False) -> str:
+def pdf_to_markdown(
+    pdf_path: str,
+    output_path: str = None,
+    engine: str = None,
+    verbose: bool = False,
+    stream: bool = None,
+    page_workers: int = None,
+    profile_output: str = None,
+    profile_memory: bool = False
+) -> str:
     """
     Converte um PDF para Markdown (função compatível com código existente)
     
@@ -25,6 +35,10 @@ def pdf_to_markdown(pdf_path: str, output_path: str = None, engine: str = None,
         output_path: Caminho para salvar o Markdown (opcional)
         engine: Engine a usar ('docling', 'pypdf', 'auto')
         verbose: Se True, mostra informações detalhadas
+        stream: Se True, grava a saída do pypdf página a página (padrão: config.json)
+        page_workers: Processos para extrair faixas de páginas em paralelo (padrão: config.json)
+        profile_output: Arquivo .jsonl ou Chrome trace para o perfil por etapa (padrão: config.json)
+        profile_memory: Se True, mede também a memória alocada pelo Python em cada etapa
         
     Returns:
         Caminho do arquivo Markdown gerado
@@ -35,7 +49,11 @@ def pdf_to_markdown(pdf_path: str, output_path: str = None, engine: str = None,
             output_path=output_path,
             engine=engine,
             fallback=True,
-            verbose=verbose
+            verbose=verbose,
+            stream=stream,
+            page_workers=page_workers,
+            profile_output=profile_output,
+            profile_memory=profile_memory
         )
         
         if verbose:
@@ -68,6 +86,10 @@ Exemplos:
   python converter_pdf_md.py "memories/ORGANIZATION_PORTFOLIO.pdf"
   python converter_pdf_md.py "certidao.pdf" --engine docling
   python converter_pdf_md.py "documento.pdf" --engine pypdf --verbose
+  python converter_pdf_md.py "anexo_800_paginas.pdf" --engine pypdf --stream
+  python converter_pdf_md.py "edital_grande.pdf" --page-workers 4
+  python converter_pdf_md.py "edital.pdf" --perfil /tmp/perfil.jsonl
+  python converter_pdf_md.py "edital.pdf" --perfil /tmp/perfil.trace.json --perfil-memoria
         """
     )
     
@@ -96,8 +118,40 @@ Exemplos:
         help="Mostra informações detalhadas sobre o processo"
     )
     
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        default=None,
+        help="Grava o Markdown página a página com pypdf (memória constante em PDFs grandes)"
+    )
+    
+    parser.add_argument(
+        "--page-workers",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Extrai faixas de páginas do PDF em N processos paralelos (0 = núcleos disponíveis)"
+    )
+    
+    parser.add_argument(
+        "--perfil",
+        default=None,
+        metavar="ARQUIVO",
+        help="Acrescenta o tempo/CPU/memória de cada etapa ao ARQUIVO (.jsonl ou Chrome trace)"
+    )
+    
+    parser.add_argument(
+        "--perfil-memoria",
+        action="store_true",
+        help="Mede também a memória alocada pelo Python em cada etapa (tracemalloc, mais lento)"
+    )
+    
     args = parser.parse_args()
     
+    page_workers = args.page_workers
+    if page_workers is not None and page_workers <= 0:
+        page_workers = os.cpu_count() or 1
+    
     # Verifica engines disponíveis
     if args.verbose:
         engine_name, is_available = detect_available_engine(args.engine)
@@ -108,7 +162,11 @@ Exemplos:
             pdf_path=args.pdf_path,
             output_path=args.output_path,
             engine=args.engine,
-            verbose=args.verbose
+            verbose=args.verbose,
+            stream=args.stream,
+            page_workers=page_workers,
+            profile_output=args.perfil,
+            profile_memory=args.perfil_memoria
         )
         
         if not args.verbose:
@@ -1,70 +1,164 @@
 #!/usr/bin/env python3
 """
 Script para converter PDFs em Markdown em lote
-Mantém log de conversões para evitar reprocessamento
+Mantém log de conversões (journal somente-anexação) para evitar reprocessamento
 Usa Docling (primário) ou pypdf (fallback) via módulo pdf_converter.py
 """
 
 import sys
 import os
 import json
+import time
 import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from itertools import repeat
 from pathlib import Path
 from datetime import datetime
 
 try:
-    from pdf_converter import convert_pdf_to_markdown, detect_available_engine
-except ImportError:
-    print("Erro: Módulo pdf_converter.py não encontrado.", file=sys.stderr)
-    print("Certifique-se de que pdf_converter.py está no mesmo diretório.", file=sys.stderr)
+    from pdf_converter import (
+        convert_pdf_to_markdown, convert_file_to_markdown, detect_available_engine, get_docling_converter
+    )
+    from conversion_cache import ConversionCache, DEFAULT_CACHE_DIR, DEFAULT_MAX_SIZE_MB
+    from file_watcher import create_watcher, watch_batches, DEFAULT_DEBOUNCE, DEFAULT_POLL_INTERVAL
+    from batch_metrics import BatchMetrics
+except ImportError as e:
+    print(f"Erro: Falha ao importar os módulos do conversor: {e}", file=sys.stderr)
+    print("Certifique-se de que pdf_converter.py e os módulos auxiliares (conversion_cache.py, "
+          "file_watcher.py, batch_metrics.py) estão no mesmo diretório.", file=sys.stderr)
     sys.exit(1)
 
 
 LOG_FILE = "memories/logs/conversao_pdfs_log.txt"
 
 
+# Compacta o journal quando há mais que COMPACT_FACTOR linhas por entrada
+# (somadas a COMPACT_MIN_LINES de folga)
+COMPACT_FACTOR = 2
+COMPACT_MIN_LINES = 200
+
+_LOG_HEADER = (
+    "# Log de Conversões PDF -> Markdown\n"
+    "# Formato: PDF_PATH | MD_PATH | TIMESTAMP | ENGINE\n"
+    "# " + "="*70 + "\n"
+)
+
+
+def _parse_log_line(line: str):
+    """Interpreta uma linha do log; retorna (pdf_path, info) ou None"""
+    line = line.strip()
+    if not line or line.startswith('#') or '|' not in line:
+        return None
+    parts = line.split('|')
+    if len(parts) < 3:
+        return None
+    engine = parts[3].strip() if len(parts) > 3 else "unknown"
+    return parts[0].strip(), {
+        'md_path': parts[1].strip(),
+        'timestamp': parts[2].strip(),
+        'engine': engine
+    }
+
+
+def _format_log_line(pdf_path: str, info: dict) -> str:
+    engine = info.get('engine', 'unknown')
+    return f"{pdf_path}|{info['md_path']}|{info['timestamp']}|{engine}\n"
+
+
+class ConversionJournal:
+    """
+    Journal de conversões somente-anexação.
+
+    Cada conversão concluída é anexada (com fsync) assim que termina, de modo
+    que um lote interrompido retoma de onde parou. Linhas posteriores
+    substituem as anteriores do mesmo PDF; o arquivo é compactado
+    periodicamente para manter uma linha por PDF.
+    """
+
+    def __init__(self, path: str = LOG_FILE):
+        self.path = Path(path)
+        self.entries = {}
+        self._lines = 0
+        self._load()
+
+    def _load(self):
+        """Carrega o journal em um índice PDF -> entrada"""
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+        except OSError as e:
+            print(f"Aviso: Erro ao carregar log: {e}", file=sys.stderr)
+            return
+
+        # Uma linha sem '\n' final é resto de uma escrita interrompida
+        end = data.rfind(b'\n') + 1
+        if end < len(data):
+            try:
+                with open(self.path, 'r+b') as f:
+                    f.truncate(end)
+            except OSError:
+                pass
+
+        for line in data[:end].decode('utf-8', errors='replace').splitlines():
+            parsed = _parse_log_line(line)
+            if parsed is not None:
+                pdf_path, info = parsed
+                self.entries[pdf_path] = info
+                self._lines += 1
+
+    def record(self, pdf_path: str, info: dict):
+        """Anexa uma entrada ao journal e a grava em disco imediatamente"""
+        self.entries[pdf_path] = info
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            is_new = not self.path.exists()
+            with open(self.path, 'a', encoding='utf-8') as f:
+                if is_new:
+                    f.write(_LOG_HEADER)
+                f.write(_format_log_line(pdf_path, info))
+                f.flush()
+                os.fsync(f.fileno())
+            self._lines += 1
+        except OSError as e:
+            print(f"Erro ao gravar log: {e}", file=sys.stderr)
+            return
+        self.maybe_compact()
+
+    def needs_compaction(self) -> bool:
+        return self._lines > COMPACT_FACTOR * len(self.entries) + COMPACT_MIN_LINES
+
+    def compact(self):
+        """Reescreve o journal com uma linha por PDF (substituição atômica)"""
+        save_conversion_log(self.entries, self.path)
+        self._lines = len(self.entries)
+
+    def maybe_compact(self):
+        if self.needs_compaction():
+            self.compact()
+
+
 def load_conversion_log() -> dict:
     """Carrega o log de conversões"""
-    log_path = Path(LOG_FILE)
-    if not log_path.exists():
-        return {}
-    
-    try:
-        with open(log_path, 'r', encoding='utf-8') as f:
-            log_data = {}
-            for line in f:
-                line = line.strip()
-                if line and '|' in line and not line.startswith('#'):
-                    parts = line.split('|')
-                    if len(parts) >= 3:
-                        pdf_path = parts[0].strip()
-                        md_path = parts[1].strip()
-                        timestamp = parts[2].strip()
-                        engine = parts[3].strip() if len(parts) > 3 else "unknown"
-                        log_data[pdf_path] = {
-                            'md_path': md_path,
-                            'timestamp': timestamp,
-                            'engine': engine
-                        }
-        return log_data
-    except Exception as e:
-        print(f"Aviso: Erro ao carregar log: {e}", file=sys.stderr)
-        return {}
+    return ConversionJournal().entries
 
 
-def save_conversion_log(log_data: dict):
-    """Salva o log de conversões"""
-    log_path = Path(LOG_FILE)
+def save_conversion_log(log_data: dict, log_path: Path = None):
+    """Salva o log de conversões (reescrita completa e atômica; usada na compactação)"""
+    log_path = Path(LOG_FILE) if log_path is None else Path(log_path)
     log_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = log_path.with_name(log_path.name + ".tmp")
     
     try:
-        with open(log_path, 'w', encoding='utf-8') as f:
-            f.write("# Log de Conversões PDF -> Markdown\n")
-            f.write("# Formato: PDF_PATH | MD_PATH | TIMESTAMP | ENGINE\n")
-            f.write("# " + "="*70 + "\n")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(_LOG_HEADER)
             for pdf_path, info in sorted(log_data.items()):
-                engine = info.get('engine', 'unknown')
-                f.write(f"{pdf_path}|{info['md_path']}|{info['timestamp']}|{engine}\n")
+                f.write(_format_log_line(pdf_path, info))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, log_path)
     except Exception as e:
         print(f"Erro ao salvar log: {e}", file=sys.stderr)
 
@@ -79,7 +173,7 @@ def is_pdf_newer_than_md(pdf_path: Path, md_path: Path) -> bool:
     return pdf_mtime > md_mtime
 
 
-def pdf_to_markdown(pdf_path: str, output_path: str = None, engine: str = None, verbose: bool = False) -> tuple:
+def pdf_to_markdown(pdf_path: str, output_path: str = None, engine: str = None, verbose: bool = False, cache: ConversionCache = None) -> tuple:
     """
     Converte um PDF para Markdown usando pdf_converter
     
@@ -88,18 +182,23 @@ def pdf_to_markdown(pdf_path: str, output_path: str = None, engine: str = None,
         output_path: Caminho para salvar o Markdown (opcional)
         engine: Engine a usar ('docling', 'pypdf', 'auto')
         verbose: Se True, mostra informações detalhadas
+        cache: Cache de conversões por conteúdo (opcional)
         
     Returns:
-        Tupla (caminho_md, metadata)
+        Tupla (caminho_md, metadata). `metadata["inicio_conversao"]` é o
+        momento (epoch) em que a conversão começou
     """
     try:
+        started_at = time.time()
         result_path, metadata = convert_pdf_to_markdown(
             pdf_path=pdf_path,
             output_path=output_path,
             engine=engine,
             fallback=True,
-            verbose=verbose
+            verbose=verbose,
+            cache=cache
         )
+        metadata["inicio_conversao"] = started_at
         return result_path, metadata
     except Exception as e:
         if verbose:
@@ -107,11 +206,93 @@ def pdf_to_markdown(pdf_path: str, output_path: str = None, engine: str = None,
         raise
 
 
+def _init_worker(engine: str):
+    """
+    Inicializa um processo do pool de conversão.
+
+    Cria o conversor Docling do processo antecipadamente, para que cada worker
+    mantenha seu próprio engine "quente" entre os arquivos que recebe.
+    """
+    try:
+        engine_name, is_available = detect_available_engine(engine)
+        if engine_name == "docling" and is_available:
+            get_docling_converter()
+    except Exception as e:
+        # A conversão tentará novamente (e fará fallback) arquivo a arquivo
+        print(f"Aviso: Falha ao preparar Docling no worker: {e}", file=sys.stderr)
+
+
+def _convert_worker(pdf_path: str, engine: str, verbose: bool, cache: ConversionCache = None) -> tuple:
+    """
+    Converte um PDF dentro de um worker do pool.
+
+    Returns:
+        Tupla (caminho_md, metadata, erro). Em caso de falha, `erro` contém a mensagem.
+    """
+    try:
+        result_md, metadata = pdf_to_markdown(pdf_path, engine=engine, verbose=verbose, cache=cache)
+        return result_md, metadata, None
+    except Exception as e:
+        return None, None, str(e)
+
+
+def _convert_file_worker(path: str, engine: str, verbose: bool, cache: ConversionCache = None) -> tuple:
+    """
+    Converte um PDF ou XLSX (modo --watch), no processo atual ou em um worker do pool.
+    
+    PDFs usam o cache de conversões, como no modo em lote.
+
+    Returns:
+        Tupla (caminho_md, metadata, erro). Em caso de falha, `erro` contém a mensagem.
+    """
+    try:
+        started_at = time.time()
+        if Path(path).suffix.lower() == '.pdf':
+            result_md, metadata = convert_pdf_to_markdown(
+                pdf_path=path, engine=engine, fallback=True, verbose=verbose, cache=cache
+            )
+        else:
+            result_md, metadata = convert_file_to_markdown(path, engine=engine, verbose=verbose)
+        metadata["inicio_conversao"] = started_at
+        # Conversões XLSX não medem etapas; registra ao menos a duração total
+        metadata.setdefault("tempo_total_s", round(time.time() - started_at, 6))
+        return result_md, metadata, None
+    except Exception as e:
+        return None, None, str(e)
+
+
+def _record_conversion(journal: ConversionJournal, stats: dict, pdf_str: str, pdf_name: str, result_md: str, metadata: dict):
+    """Registra uma conversão bem-sucedida no journal (se informado) e nas estatísticas"""
+    engine_used = metadata.get("engine_used") or metadata.get("engine", "unknown")
+    if metadata.get("cache_hit"):
+        stats['do_cache'] += 1
+    if journal is not None:
+        journal.record(pdf_str, {
+            'md_path': result_md,
+            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'engine': engine_used
+        })
+    
+    # Atualiza estatísticas de engines
+    if engine_used not in stats['engines']:
+        stats['engines'][engine_used] = 0
+    stats['engines'][engine_used] += 1
+    
+    stats['convertidos'] += 1
+    origin = f"{engine_used}, cache" if metadata.get("cache_hit") else engine_used
+    print(f"✅ Convertido: {pdf_name} -> {Path(result_md).name} [{origin}]", file=sys.stderr)
+
+
 def convert_pdfs_in_directory(
     directory: str,
     recursive: bool = False,
     engine: str = "auto",
-    verbose: bool = False
+    verbose: bool = False,
+    workers: int = 1,
+    cache: ConversionCache = None,
+    duplicates: bool = False,
+    diff_duplicates: bool = False,
+    metrics: BatchMetrics = None
 ) -> dict:
     """
     Converte todos os PDFs de um diretório
@@ -121,15 +302,30 @@ def convert_pdfs_in_directory(
         recursive: Se True, processa subdiretórios
         engine: Engine a usar ('docling', 'pypdf', 'auto')
         verbose: Se True, mostra informações detalhadas
+        workers: Número de processos de conversão (1 = sequencial)
+        cache: Cache de conversões por conteúdo; PDFs idênticos a um já
+            convertido reutilizam o Markdown em vez de serem reconvertidos
+        duplicates: Se True, procura quase duplicados (MinHash/LSH) entre os
+            Markdown dos PDFs do diretório, convertidos agora ou antes
+        diff_duplicates: Se True, grava `<arquivo>.alteracoes.md` com o diff de
+            cada retificação em relação ao original
+        metrics: BatchMetrics opcional (batch_metrics.py); acumula duração,
+            páginas, bytes, espera na fila e fallbacks por engine e é gravado
+            (formato Prometheus, com o detalhe por arquivo em JSON) ao final do lote
         
     Returns:
-        Dicionário com estatísticas: {'convertidos': int, 'já_existiam': int, 'erros': int, 'engines': dict}
+        Dicionário com estatísticas: {'convertidos': int, 'já_existiam': int, 'erros': int,
+        'do_cache': int, 'engines': dict}. 'do_cache' conta os convertidos reaproveitados do cache.
+        Com `duplicates`, inclui 'duplicatas': lista de pares (original, duplicata, similaridade, tipo).
+        Com `metrics`, inclui 'metricas': resumo por engine (arquivos, páginas/s, p50/p95/p99).
     """
-    log_data = load_conversion_log()
+    journal = ConversionJournal()
+    log_data = journal.entries
     stats = {
         'convertidos': 0,
         'já_existiam': 0,
         'erros': 0,
+        'do_cache': 0,
         'engines': {}
     }
     
@@ -146,6 +342,9 @@ def convert_pdfs_in_directory(
     
     print(f"Encontrados {len(pdf_files)} arquivos PDF em {directory}", file=sys.stderr)
     
+    # PDFs que precisam ser convertidos: lista de (pdf_file, pdf_str)
+    pending = []
+    
     for pdf_file in pdf_files:
         try:
             pdf_str = str(pdf_file.relative_to(Path.cwd()))
@@ -165,6 +364,8 @@ def convert_pdfs_in_directory(
                 if verbose:
                     print(f"⏭️  Pulando (já convertido): {pdf_file.name}", file=sys.stderr)
                 stats['já_existiam'] += 1
+                if metrics is not None:
+                    metrics.record_skipped()
                 continue
         
         # Verifica se MD existe e é mais recente
@@ -172,43 +373,215 @@ def convert_pdfs_in_directory(
             if verbose:
                 print(f"⏭️  Pulando (MD atualizado): {pdf_file.name}", file=sys.stderr)
             stats['já_existiam'] += 1
-            # Atualiza log mesmo que já exista
-            log_data[pdf_str] = {
-                'md_path': md_str,
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'engine': 'unknown'
-            }
+            if metrics is not None:
+                metrics.record_skipped()
+            # Registra no log mesmo que já exista (só se a entrada mudou)
+            if log_data.get(pdf_str, {}).get('md_path') != md_str:
+                journal.record(pdf_str, {
+                    'md_path': md_str,
+                    'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                    'engine': 'unknown'
+                })
             continue
         
-        # Converte
-        try:
-            print(f"🔄 Convertendo: {pdf_file.name}", file=sys.stderr)
-            result_md, metadata = pdf_to_markdown(
-                str(pdf_file),
-                engine=engine,
-                verbose=verbose
-            )
+        pending.append((pdf_file, pdf_str))
+    
+    # Todos os pendentes entram na fila agora; a espera vai até o início de cada conversão
+    queued_at = time.time()
+    
+    if workers > 1 and len(pending) > 1:
+        # Converte em paralelo; cada worker mantém seu próprio engine
+        max_workers = min(workers, len(pending))
+        print(f"⚙️  Convertendo {len(pending)} PDFs com {max_workers} processos", file=sys.stderr)
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(engine,)
+        ) as executor:
+            futures = {}
+            for pdf_file, pdf_str in pending:
+                print(f"🔄 Convertendo: {pdf_file.name}", file=sys.stderr)
+                future = executor.submit(_convert_worker, str(pdf_file), engine, verbose, cache)
+                futures[future] = (pdf_file, pdf_str)
             
-            engine_used = metadata.get("engine_used", "unknown")
-            log_data[pdf_str] = {
-                'md_path': result_md,
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'engine': engine_used
-            }
+            # Resultados são mesclados no processo principal à medida que terminam
+            for future in as_completed(futures):
+                pdf_file, pdf_str = futures[future]
+                try:
+                    result_md, metadata, error = future.result()
+                except Exception as e:
+                    result_md, metadata, error = None, None, str(e)
+                if error is not None:
+                    print(f"❌ Erro ao converter {pdf_file.name}: {error}", file=sys.stderr)
+                    stats['erros'] += 1
+                    if metrics is not None:
+                        metrics.record_error()
+                    continue
+                _record_conversion(journal, stats, pdf_str, pdf_file.name, result_md, metadata)
+                if metrics is not None:
+                    metrics.record_conversion(pdf_file, result_md, metadata, queued_at)
+    else:
+        for pdf_file, pdf_str in pending:
+            # Converte
+            try:
+                print(f"🔄 Convertendo: {pdf_file.name}", file=sys.stderr)
+                result_md, metadata = pdf_to_markdown(
+                    str(pdf_file),
+                    engine=engine,
+                    verbose=verbose,
+                    cache=cache
+                )
+                _record_conversion(journal, stats, pdf_str, pdf_file.name, result_md, metadata)
+                if metrics is not None:
+                    metrics.record_conversion(pdf_file, result_md, metadata, queued_at)
+            except Exception as e:
+                print(f"❌ Erro ao converter {pdf_file.name}: {e}", file=sys.stderr)
+                stats['erros'] += 1
+                if metrics is not None:
+                    metrics.record_error()
+    
+    if duplicates or diff_duplicates:
+        # Importado só aqui: near_duplicates carrega o NumPy
+        from near_duplicates import find_near_duplicates, write_diff_report
+        md_files = [f.with_suffix('.md') for f in pdf_files if f.with_suffix('.md').exists()]
+        pairs = find_near_duplicates(md_files)
+        if diff_duplicates:
+            for pair in pairs:
+                report = write_diff_report(pair)
+                if report is not None:
+                    pair['relatorio'] = str(report)
+        stats['duplicatas'] = pairs
+    
+    if metrics is not None:
+        stats['metricas'] = metrics.engine_summary()
+        _write_metrics(metrics)
+    
+    return stats
+
+
+def _write_metrics(metrics: BatchMetrics):
+    try:
+        metrics.write()
+    except OSError as e:
+        print(f"Aviso: Erro ao gravar métricas em {metrics.output_path}: {e}", file=sys.stderr)
+
+
+def _needs_conversion(source: Path) -> bool:
+    """Verifica se um arquivo ainda existe e não tem Markdown atualizado"""
+    md_file = source.with_suffix('.md')
+    return source.exists() and (not md_file.exists() or is_pdf_newer_than_md(source, md_file))
+
+
+def _new_pool(workers: int, engine: str) -> ProcessPoolExecutor:
+    """Pool de conversão do modo --watch, com o engine preparado em cada worker"""
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(engine,))
+
+
+def watch_directory(
+    directory: str,
+    engine: str = "auto",
+    verbose: bool = False,
+    workers: int = 1,
+    debounce: float = DEFAULT_DEBOUNCE,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    polling: bool = False,
+    cache: ConversionCache = None,
+    metrics: BatchMetrics = None
+) -> dict:
+    """
+    Observa um diretório e converte PDFs/XLSX novos ou alterados até Ctrl+C
+    
+    Os eventos do sistema de arquivos (inotify, ou polling como alternativa)
+    são agrupados: uma cópia em massa gera um único lote de conversões,
+    processado depois de `debounce` segundos sem novos arquivos.
+    
+    Args:
+        directory: Diretório observado (recursivamente)
+        engine: Engine a usar para PDFs ('docling', 'pypdf', 'auto')
+        verbose: Se True, mostra informações detalhadas
+        workers: Número de processos de conversão por lote (1 = sequencial)
+        debounce: Segundos sem eventos antes de converter o lote
+        poll_interval: Intervalo entre varreduras no modo polling
+        polling: Se True, não usa inotify
+        cache: Cache de conversões por conteúdo (opcional), como em convert_pdfs_in_directory
+        metrics: BatchMetrics opcional; regravado ao final de cada lote
+        
+    Returns:
+        Dicionário com estatísticas, no mesmo formato de convert_pdfs_in_directory
+    """
+    journal = ConversionJournal()
+    stats = {
+        'convertidos': 0,
+        'já_existiam': 0,
+        'erros': 0,
+        'do_cache': 0,
+        'engines': {}
+    }
+    
+    watcher = create_watcher(Path(directory), poll_interval=poll_interval, polling=polling)
+    print(f"👀 Observando {directory} ({watcher.backend}). Pressione Ctrl+C para encerrar.", file=sys.stderr)
+    
+    # O pool (e o Docling de cada worker) é mantido entre os lotes
+    executor = _new_pool(workers, engine) if workers > 1 else None
+    
+    try:
+        for batch in watch_batches(watcher, debounce):
+            sources = [path for path in batch if _needs_conversion(path)]
+            if not sources:
+                continue
+            print(f"📥 {len(sources)} arquivo(s) novo(s) ou alterado(s)", file=sys.stderr)
             
-            # Atualiza estatísticas de engines
-            if engine_used not in stats['engines']:
-                stats['engines'][engine_used] = 0
-            stats['engines'][engine_used] += 1
+            paths = [str(path) for path in sources]
+            queued_at = time.time()
+            if executor is not None:
+                try:
+                    results = executor.map(_convert_file_worker, paths, repeat(engine), repeat(verbose), repeat(cache))
+                except BrokenProcessPool:
+                    # Worker encerrado entre os lotes
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    executor = _new_pool(workers, engine)
+                    results = executor.map(_convert_file_worker, paths, repeat(engine), repeat(verbose), repeat(cache))
+            else:
+                results = (_convert_file_worker(path, engine, verbose, cache) for path in paths)
             
-            stats['convertidos'] += 1
-            print(f"✅ Convertido: {pdf_file.name} -> {Path(result_md).name} [{engine_used}]", file=sys.stderr)
-        except Exception as e:
-            print(f"❌ Erro ao converter {pdf_file.name}: {e}", file=sys.stderr)
-            stats['erros'] += 1
-    
-    # Salva log
-    save_conversion_log(log_data)
+            # Se um worker morrer (falta de memória, falha do Docling), o pool
+            # fica inutilizável: os arquivos ainda sem resultado contam como erro
+            broken = None
+            for source in sources:
+                if broken is None:
+                    try:
+                        result_md, metadata, error = next(results)
+                    except BrokenProcessPool as e:
+                        broken = e
+                if broken is not None:
+                    result_md, metadata, error = None, None, f"processo de conversão encerrado ({broken})"
+                if error is not None:
+                    print(f"❌ Erro ao converter {source.name}: {error}", file=sys.stderr)
+                    stats['erros'] += 1
+                    if metrics is not None:
+                        metrics.record_error()
+                    continue
+                try:
+                    source_str = str(source.relative_to(Path.cwd()))
+                except ValueError:
+                    source_str = str(source)
+                # O log registra apenas PDFs (formato PDF_PATH | MD_PATH)
+                pdf_journal = journal if source.suffix.lower() == '.pdf' else None
+                _record_conversion(pdf_journal, stats, source_str, source.name, result_md, metadata)
+                if metrics is not None:
+                    metrics.record_conversion(source, result_md, metadata, queued_at)
+            if metrics is not None:
+                _write_metrics(metrics)
+            if broken is not None:
+                print("Aviso: Um processo de conversão foi encerrado; recriando o pool", file=sys.stderr)
+                executor.shutdown(wait=False, cancel_futures=True)
+                executor = _new_pool(workers, engine)
+    except KeyboardInterrupt:
+        print("\n⏹️  Observação encerrada", file=sys.stderr)
+    finally:
+        watcher.close()
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
     
     return stats
 
@@ -223,6 +596,11 @@ Exemplos:
   python converter_pdfs_batch.py "memories"
   python converter_pdfs_batch.py "memories/editais" --recursive
   python converter_pdfs_batch.py "memories" --engine docling --verbose
+  python converter_pdfs_batch.py "memories" --workers 4
+  python converter_pdfs_batch.py "memories" --cache-dir /tmp/cache_conversoes
+  python converter_pdfs_batch.py "memories" --duplicatas --diff-retificacoes
+  python converter_pdfs_batch.py "memories" --watch
+  python converter_pdfs_batch.py "memories" --metricas /var/lib/node_exporter/textfile/conversao.prom
         """
     )
     
@@ -250,8 +628,87 @@ Exemplos:
         help="Mostra informações detalhadas"
     )
     
+    parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Número de processos de conversão em paralelo (padrão: 1; 0 = núcleos disponíveis)"
+    )
+    
+    parser.add_argument(
+        "--cache-dir",
+        default=DEFAULT_CACHE_DIR,
+        help=f"Diretório do cache de conversões por conteúdo (padrão: {DEFAULT_CACHE_DIR})"
+    )
+    
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=DEFAULT_MAX_SIZE_MB,
+        help=f"Tamanho máximo do cache em MB; excedentes são removidos por LRU (padrão: {DEFAULT_MAX_SIZE_MB})"
+    )
+    
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Desativa o cache de conversões por conteúdo"
+    )
+    
+    parser.add_argument(
+        "--duplicatas",
+        action="store_true",
+        help="Aponta editais/anexos quase duplicados (retificações, republicações, cópias)"
+    )
+    
+    parser.add_argument(
+        "--diff-retificacoes",
+        action="store_true",
+        help="Com --duplicatas, grava <arquivo>.alteracoes.md com o que mudou em cada retificação"
+    )
+    
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Após converter o diretório, continua observando e converte PDFs/XLSX novos ou alterados"
+    )
+    
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=DEFAULT_DEBOUNCE,
+        metavar="SEG",
+        help=f"No modo --watch, segundos sem novos arquivos antes de converter o lote (padrão: {DEFAULT_DEBOUNCE:g})"
+    )
+    
+    parser.add_argument(
+        "--polling",
+        action="store_true",
+        help="No modo --watch, usa varredura periódica em vez de inotify"
+    )
+    
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=DEFAULT_POLL_INTERVAL,
+        metavar="SEG",
+        help=f"Intervalo entre varreduras no modo polling (padrão: {DEFAULT_POLL_INTERVAL:g})"
+    )
+    
+    parser.add_argument(
+        "--metricas",
+        default=None,
+        metavar="ARQUIVO.prom",
+        help="Grava métricas do lote (duração, páginas/s, bytes, fila, fallback, p50/p95/p99) no formato textfile do Prometheus"
+    )
+    
     args = parser.parse_args()
     
+    cache = None if args.no_cache else ConversionCache(args.cache_dir, args.cache_max_mb)
+    metrics = BatchMetrics(args.metricas) if args.metricas else None
+    
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    
     # Por padrão, usa recursivo para memories (tem subpastas)
     recursive = args.recursive or 'memories' in args.directory
     
@@ -268,14 +725,40 @@ Exemplos:
         args.directory,
         recursive=recursive,
         engine=args.engine,
-        verbose=args.verbose
+        verbose=args.verbose,
+        workers=workers,
+        cache=cache,
+        duplicates=args.duplicatas,
+        diff_duplicates=args.diff_retificacoes,
+        metrics=metrics
     )
     
+    if args.watch:
+        watch_stats = watch_directory(
+            args.directory,
+            engine=args.engine,
+            verbose=args.verbose,
+            workers=workers,
+            debounce=args.debounce,
+            poll_interval=args.poll_interval,
+            polling=args.polling,
+            cache=cache,
+            metrics=metrics
+        )
+        for key in ('convertidos', 'erros', 'do_cache'):
+            stats[key] += watch_stats[key]
+        for engine, count in watch_stats['engines'].items():
+            stats['engines'][engine] = stats['engines'].get(engine, 0) + count
+        if metrics is not None:
+            stats['metricas'] = metrics.engine_summary()
+    
     print("\n" + "="*50, file=sys.stderr)
     print("📊 RESUMO DA CONVERSÃO", file=sys.stderr)
     print("="*50, file=sys.stderr)
     print(f"✅ Convertidos: {stats['convertidos']}", file=sys.stderr)
     print(f"⏭️  Já existiam: {stats['já_existiam']}", file=sys.stderr)
+    if stats['do_cache']:
+        print(f"♻️  Reutilizados do cache: {stats['do_cache']}", file=sys.stderr)
     print(f"❌ Erros: {stats['erros']}", file=sys.stderr)
     
     if stats['engines']:
@@ -283,6 +766,24 @@ Exemplos:
         for engine, count in stats['engines'].items():
             print(f"   {engine}: {count}", file=sys.stderr)
     
+    if stats.get('metricas'):
+        print("\n⏱️  Duração por engine:", file=sys.stderr)
+        for engine, info in stats['metricas'].items():
+            if info['p50_s'] is None:
+                continue
+            rate = f", {info['paginas_por_s']:.1f} pág/s" if info['paginas_por_s'] else ""
+            print(f"   {engine}: p50 {info['p50_s']:.2f}s, p95 {info['p95_s']:.2f}s, "
+                  f"p99 {info['p99_s']:.2f}s{rate}", file=sys.stderr)
+        print(f"📈 Métricas: {args.metricas} (detalhe por arquivo: {metrics.details_path()})", file=sys.stderr)
+    
+    if stats.get('duplicatas'):
+        print(f"\n🔁 Quase duplicados: {len(stats['duplicatas'])} (podem ser ignorados na análise)", file=sys.stderr)
+        for pair in stats['duplicatas']:
+            label = "cópia idêntica" if pair['tipo'] == "copia" else "retificação"
+            print(f"   {pair['duplicata']} → {label} de {pair['original']} ({pair['similaridade']*100:.0f}%)", file=sys.stderr)
+            if pair.get('relatorio'):
+                print(f"      alterações: {pair['relatorio']}", file=sys.stderr)
+    
     print("="*50, file=sys.stderr)
     
     # Retorna JSON para uso programático
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Observação de diretórios para conversão automática (modo `--watch`).
+
+No Linux, usa inotify (via ctypes, sem dependências externas) e acompanha
+também os subdiretórios criados depois. Em outros sistemas, ou se o inotify
+não puder ser usado (ex.: limite de watches atingido), compara periodicamente
+o mtime/tamanho dos arquivos (polling). Se o limite for atingido só depois,
+ao observar um subdiretório novo, apenas esse subdiretório passa a polling.
+
+`watch_batches` agrupa os eventos: um lote só é entregue depois de
+`debounce` segundos sem novos eventos (ou após `max_wait` segundos de
+atividade contínua), de modo que copiar centenas de PDFs gera uma única
+conversão em lote.
+"""
+
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+from pathlib import Path
+from typing import Optional, Set, List, Tuple, Dict, Iterator
+
+
+WATCH_SUFFIXES = (".pdf", ".xlsx")
+DEFAULT_DEBOUNCE = 2.0
+DEFAULT_POLL_INTERVAL = 5.0
+
+# Diretórios ignorados (artefatos gerados), além dos ocultos
+_SKIP_DIRS = {".git", "__pycache__"}
+# Cache do projeto (índices, cache de conversões): só memories/cache, não
+# qualquer pasta chamada "cache" (como em path_index.py)
+_CACHE_DIR = os.path.join("memories", "cache")
+
+# Constantes de <sys/inotify.h>
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _matches(name: str, suffixes: Tuple[str, ...]) -> bool:
+    return name.lower().endswith(suffixes) and not name.startswith((".", "~$"))
+
+
+def _skip_dir(parent: str, name: str) -> bool:
+    """Se o subdiretório `name` de `parent` não deve ser observado"""
+    if name in _SKIP_DIRS or name.startswith("."):
+        return True
+    return os.path.join(Path(parent).name, name) == _CACHE_DIR
+
+
+def _scan_files(root: Path, suffixes: Tuple[str, ...]) -> Dict[Path, Tuple[int, int]]:
+    """Arquivos observados sob `root`, com (mtime_ns, tamanho)"""
+    files = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not _skip_dir(dirpath, d)]
+        for name in filenames:
+            if _matches(name, suffixes):
+                path = Path(dirpath) / name
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                files[path] = (st.st_mtime_ns, st.st_size)
+    return files
+
+
+class PollingWatcher:
+    """Detecta arquivos novos ou alterados comparando varreduras periódicas"""
+
+    backend = "polling"
+
+    def __init__(self, root: Path, suffixes: Tuple[str, ...] = WATCH_SUFFIXES,
+                 interval: float = DEFAULT_POLL_INTERVAL):
+        self.root = Path(root)
+        self.suffixes = suffixes
+        self.interval = interval
+        self._snapshot = _scan_files(self.root, suffixes)
+        self._next_scan = time.monotonic() + interval
+
+    def read_events(self, timeout: Optional[float]) -> Set[Path]:
+        """Espera até `timeout` segundos (None = até a próxima varredura) e retorna os arquivos alterados"""
+        wait = self._next_scan - time.monotonic()
+        if timeout is not None:
+            wait = min(wait, timeout)
+        if wait > 0:
+            time.sleep(wait)
+        if time.monotonic() < self._next_scan:
+            return set()
+
+        self._next_scan = time.monotonic() + self.interval
+        snapshot = _scan_files(self.root, self.suffixes)
+        changed = {path for path, sig in snapshot.items() if self._snapshot.get(path) != sig}
+        self._snapshot = snapshot
+        return changed
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Observa uma árvore de diretórios com inotify (somente Linux)"""
+
+    backend = "inotify"
+
+    def __init__(self, root: Path, suffixes: Tuple[str, ...] = WATCH_SUFFIXES,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL):
+        self.root = Path(root)
+        self.suffixes = suffixes
+        self.poll_interval = poll_interval
+        # Subdiretórios que ficaram sem watch (limite atingido) e são varridos por polling
+        self._pollers: List[PollingWatcher] = []
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 falhou")
+        self._dirs: Dict[int, Path] = {}
+        try:
+            self._add_tree(self.root)
+        except OSError:
+            # create_watcher passa para polling; o descritor não pode ficar aberto
+            self.close()
+            raise
+
+    def _add_watch(self, directory: Path):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(str(directory)), _WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                raise OSError(err, "limite de inotify watches atingido (fs.inotify.max_user_watches)")
+            if err in (errno.ENOENT, errno.ENOTDIR):
+                return  # diretório removido entre a listagem e o watch
+            raise OSError(err, f"inotify_add_watch falhou em {directory}: {os.strerror(err)}")
+        self._dirs[wd] = directory
+
+    def _add_tree(self, directory: Path) -> Set[Path]:
+        """Observa `directory` e subdiretórios; retorna os arquivos que já existem neles"""
+        found = set()
+        for dirpath, dirnames, filenames in os.walk(directory):
+            dirnames[:] = [d for d in dirnames if not _skip_dir(dirpath, d)]
+            self._add_watch(Path(dirpath))
+            found.update(Path(dirpath) / name for name in filenames if _matches(name, self.suffixes))
+        return found
+
+    def _add_new_dir(self, directory: Path) -> Set[Path]:
+        """
+        Observa um diretório criado depois do início; se não houver mais
+        watches disponíveis, passa a varrê-lo por polling em vez de encerrar
+        a observação
+        """
+        try:
+            return self._add_tree(directory)
+        except OSError as e:
+            print(f"Aviso: {e}; {directory} será verificado por polling a cada {self.poll_interval:g}s",
+                  file=sys.stderr)
+            poller = PollingWatcher(directory, self.suffixes, self.poll_interval)
+            self._pollers.append(poller)
+            return set(poller._snapshot)
+
+    def read_events(self, timeout: Optional[float]) -> Set[Path]:
+        """Espera até `timeout` segundos (None = indefinidamente) e retorna os arquivos alterados"""
+        if self._pollers:
+            next_scan = min(poller._next_scan for poller in self._pollers) - time.monotonic()
+            timeout = max(0.0, next_scan if timeout is None else min(timeout, next_scan))
+
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        changed = set()
+        for poller in self._pollers:
+            changed |= poller.read_events(0)
+        if not ready:
+            return changed
+
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+
+                if mask & _IN_Q_OVERFLOW:
+                    # Eventos perdidos: considera tudo; o chamador filtra o que já está atualizado
+                    changed.update(_scan_files(self.root, self.suffixes))
+                    continue
+                if mask & _IN_IGNORED:
+                    self._dirs.pop(wd, None)
+                    continue
+                directory = self._dirs.get(wd)
+                if directory is None or not name:
+                    continue
+                path = directory / name
+                if mask & _IN_ISDIR:
+                    # Diretório novo (criado ou movido para cá): arquivos podem ter
+                    # chegado antes do watch, então são incluídos na varredura
+                    if not _skip_dir(str(directory), name) and mask & (_IN_CREATE | _IN_MOVED_TO):
+                        changed.update(self._add_new_dir(path))
+                elif mask & (_IN_CLOSE_WRITE | _IN_MOVED_TO) and _matches(name, self.suffixes):
+                    changed.add(path)
+        return changed
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def create_watcher(root: Path, suffixes: Tuple[str, ...] = WATCH_SUFFIXES,
+                   poll_interval: float = DEFAULT_POLL_INTERVAL, polling: bool = False):
+    """
+    Cria o observador mais eficiente disponível
+
+    Args:
+        root: Diretório observado (recursivamente)
+        suffixes: Extensões de interesse
+        poll_interval: Intervalo entre varreduras no modo polling
+        polling: Se True, força o modo polling
+
+    Returns:
+        InotifyWatcher ou PollingWatcher
+    """
+    if not polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(root, suffixes, poll_interval)
+        except (OSError, AttributeError) as e:
+            print(f"Aviso: inotify indisponível ({e}); usando polling a cada {poll_interval:g}s", file=sys.stderr)
+    return PollingWatcher(root, suffixes, poll_interval)
+
+
+def watch_batches(watcher, debounce: float = DEFAULT_DEBOUNCE,
+                  max_wait: Optional[float] = None) -> Iterator[List[Path]]:
+    """
+    Agrupa os eventos do observador em lotes
+
+    Um lote é entregue após `debounce` segundos sem eventos novos, ou quando
+    a atividade contínua passa de `max_wait` segundos (padrão: 10 x debounce).
+    Eventos repetidos do mesmo arquivo aparecem uma única vez no lote.
+
+    Yields:
+        Lista ordenada de arquivos novos ou alterados
+    """
+    if max_wait is None:
+        max_wait = 10 * debounce
+    pending: Set[Path] = set()
+    first_event = last_event = 0.0
+
+    while True:
+        timeout = None
+        if pending:
+            now = time.monotonic()
+            timeout = max(0.0, min(last_event + debounce, first_event + max_wait) - now)
+
+        events = watcher.read_events(timeout)
+        now = time.monotonic()
+        if events:
+            if not pending:
+                first_event = now
+            pending |= events
+            last_event = now
+
+        if pending and (now - last_event >= debounce or now - first_event >= max_wait):
+            batch = sorted(pending)
+            pending = set()
+            yield batch
@@ -34,6 +34,16 @@ Write-Host "📋 Copiando scripts Python..." -ForegroundColor Cyan
 Copy-Item "$tempDir/pdf_converter.py" . -Force
 Copy-Item "$tempDir/converter_pdf_md.py" . -Force
 Copy-Item "$tempDir/converter_pdfs_batch.py" . -Force
+Copy-Item "$tempDir/config_loader.py" . -Force
+Copy-Item "$tempDir/batch_metrics.py" . -Force
+Copy-Item "$tempDir/conversion_profiler.py" . -Force
+Copy-Item "$tempDir/file_watcher.py" . -Force
+Copy-Item "$tempDir/near_duplicates.py" . -Force
+Copy-Item "$tempDir/clause_search.py" . -Force
+Copy-Item "$tempDir/chunk_store.py" . -Force
+Copy-Item "$tempDir/search_index.py" . -Force
+Copy-Item "$tempDir/conversion_cache.py" . -Force
+Copy-Item "$tempDir/path_index.py" . -Force
 Copy-Item "$tempDir/requirements.txt" . -Force
 
 Write-Host "⚙️  Copiando configurações..." -ForegroundColor Cyan
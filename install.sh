@@ -32,6 +32,16 @@ echo "📋 Copiando scripts Python..."
 cp "$TEMP_DIR/pdf_converter.py" .
 cp "$TEMP_DIR/converter_pdf_md.py" .
 cp "$TEMP_DIR/converter_pdfs_batch.py" .
+cp "$TEMP_DIR/config_loader.py" .
+cp "$TEMP_DIR/batch_metrics.py" .
+cp "$TEMP_DIR/conversion_profiler.py" .
+cp "$TEMP_DIR/file_watcher.py" .
+cp "$TEMP_DIR/near_duplicates.py" .
+cp "$TEMP_DIR/clause_search.py" .
+cp "$TEMP_DIR/chunk_store.py" .
+cp "$TEMP_DIR/search_index.py" .
+cp "$TEMP_DIR/conversion_cache.py" .
+cp "$TEMP_DIR/path_index.py" .
 cp "$TEMP_DIR/requirements.txt" .
 
 echo "⚙️  Copiando configurações..."
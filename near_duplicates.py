@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Detecção de documentos quase duplicados (MinHash + LSH) no Markdown convertido.
+
+Um mesmo edital costuma chegar em vários PDFs: retificações, republicações,
+cópias em pastas de organizações diferentes. Cada Markdown recebe uma
+assinatura MinHash dos seus shingles (sequências de SHINGLE_SIZE palavras);
+o LSH por bandas encontra os pares candidatos sem comparar todos com todos,
+e a similaridade estimada (Jaccard) confirma os quase duplicados.
+
+Em cada grupo, o documento mais antigo é tratado como original. Cópias
+idênticas podem ser ignoradas na análise; para retificações, `diff_markdown`
+mostra apenas o que mudou em relação ao original.
+
+Uso:
+    python near_duplicates.py memories
+    python near_duplicates.py memories/editais --threshold 0.7 --diff
+"""
+
+import os
+import re
+import sys
+import json
+import random
+import difflib
+import hashlib
+import argparse
+from pathlib import Path
+from typing import List, Dict, Optional, Any
+
+# Tentar importar NumPy (cálculo vetorizado das assinaturas)
+NUMPY_AVAILABLE = False
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+SIGNATURES_FILE = "memories/cache/minhash.json"
+SIGNATURES_VERSION = 1
+
+NUM_PERM = 128
+LSH_BANDS = 32           # 32 bandas x 4 linhas: candidatos a partir de ~45% de similaridade
+SHINGLE_SIZE = 5
+DEFAULT_THRESHOLD = 0.8
+
+# Primo > 2^32: (a * x) com a, x < 2^32 cabe em 64 bits
+_PRIME = 4294967311
+_MAX_HASH = (1 << 32) - 1
+_rng = random.Random(20240601)
+_PERM_A = [_rng.randint(1, _MAX_HASH) for _ in range(NUM_PERM)]
+_PERM_B = [_rng.randint(0, _MAX_HASH) for _ in range(NUM_PERM)]
+
+_PAGE_RE = re.compile(r'^## Página \d+\s*$')
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def document_body(text: str) -> str:
+    """
+    Conteúdo do Markdown sem o cabeçalho de metadados da conversão, sem
+    marcadores de página e sem linhas em branco (uma linha normalizada por linha de texto)
+    """
+    if text.startswith("# "):
+        separator = text.find("\n---\n")
+        if separator != -1:
+            text = text[separator + 5:]
+    return "\n".join(
+        line.strip() for line in text.splitlines()
+        if line.strip() and not _PAGE_RE.match(line)
+    )
+
+
+def _shingle_hashes(text: str) -> List[int]:
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < SHINGLE_SIZE:
+        shingles = [" ".join(words)] if words else []
+    else:
+        shingles = [" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)]
+    return sorted({
+        int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little")
+        for s in shingles
+    })
+
+
+def minhash(text: str) -> Optional[List[int]]:
+    """
+    Assinatura MinHash de um texto
+
+    Returns:
+        Lista de NUM_PERM inteiros, ou None se o texto não tiver palavras
+    """
+    hashes = _shingle_hashes(text)
+    if not hashes:
+        return None
+
+    if NUMPY_AVAILABLE:
+        a = np.array(_PERM_A, dtype=np.uint64)[:, None]
+        b = np.array(_PERM_B, dtype=np.uint64)[:, None]
+        signature = np.full(NUM_PERM, _PRIME, dtype=np.uint64)
+        values = np.array(hashes, dtype=np.uint64)
+        # Blocos limitam a matriz intermediária (NUM_PERM x bloco)
+        for start in range(0, len(values), 4096):
+            block = values[None, start:start + 4096]
+            permuted = ((a * block) % _PRIME + b) % _PRIME
+            signature = np.minimum(signature, permuted.min(axis=1))
+        return [int(v) for v in signature]
+
+    return [
+        min(((a * x) % _PRIME + b) % _PRIME for x in hashes)
+        for a, b in zip(_PERM_A, _PERM_B)
+    ]
+
+
+def similarity(sig_a: List[int], sig_b: List[int]) -> float:
+    """Similaridade de Jaccard estimada entre duas assinaturas"""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+
+class SignatureStore:
+    """Cache em disco das assinaturas, invalidado por tamanho/mtime do Markdown"""
+
+    def __init__(self, path: str = SIGNATURES_FILE):
+        self.path = Path(path)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        if self.path.exists():
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+                if data.get("version") == SIGNATURES_VERSION:
+                    self.entries = data.get("entries", {})
+            except (OSError, ValueError) as e:
+                print(f"Aviso: Erro ao carregar assinaturas: {e}", file=sys.stderr)
+
+    def get(self, md_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        Assinatura e hash do conteúdo de um Markdown (recalculados se mudou)
+
+        Returns:
+            {"minhash": [...] ou None, "sha256": str} ou None se ilegível
+        """
+        key = str(Path(md_path).absolute())
+        try:
+            st = os.stat(md_path)
+        except OSError:
+            return None
+        entry = self.entries.get(key)
+        if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            return entry
+        try:
+            body = document_body(Path(md_path).read_text(encoding="utf-8"))
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Aviso: Não foi possível ler {md_path}: {e}", file=sys.stderr)
+            return None
+        entry = {
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "sha256": hashlib.sha256(body.encode("utf-8")).hexdigest(),
+            "minhash": minhash(body),
+        }
+        self.entries[key] = entry
+        self._dirty = True
+        return entry
+
+    def save(self):
+        """Persiste as assinaturas (somente se houve alteração)"""
+        if not self._dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            tmp_path.write_text(
+                json.dumps({"version": SIGNATURES_VERSION, "entries": self.entries}),
+                encoding="utf-8"
+            )
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError as e:
+            print(f"Aviso: Erro ao salvar assinaturas: {e}", file=sys.stderr)
+
+
+def _document_date(md_path: Path) -> float:
+    """Data usada para decidir o original: a do PDF de origem, se existir, senão a do .md"""
+    pdf_path = md_path.with_suffix(".pdf")
+    try:
+        return (pdf_path if pdf_path.exists() else md_path).stat().st_mtime
+    except OSError:
+        return float("inf")
+
+
+def find_near_duplicates(
+    md_files: List[Path],
+    threshold: float = DEFAULT_THRESHOLD,
+    store: Optional[SignatureStore] = None
+) -> List[Dict[str, Any]]:
+    """
+    Agrupa Markdown quase duplicados
+
+    Args:
+        md_files: Arquivos Markdown a comparar
+        threshold: Similaridade mínima (Jaccard estimado) para considerar duplicata
+        store: Cache de assinaturas (padrão: SIGNATURES_FILE)
+
+    Returns:
+        Lista de pares {"original", "duplicata", "similaridade", "tipo"}, em que
+        tipo é "copia" (conteúdo idêntico) ou "retificacao"
+    """
+    own_store = store is None
+    if own_store:
+        store = SignatureStore()
+
+    signatures = {}
+    for md_file in md_files:
+        entry = store.get(md_file)
+        if entry is not None and entry["minhash"] is not None:
+            signatures[Path(md_file)] = entry
+    if own_store:
+        store.save()
+
+    # LSH: documentos que coincidem em alguma banda inteira são candidatos
+    rows = NUM_PERM // LSH_BANDS
+    buckets: Dict[tuple, List[Path]] = {}
+    for path, entry in signatures.items():
+        sig = entry["minhash"]
+        for band in range(LSH_BANDS):
+            key = (band,) + tuple(sig[band * rows:(band + 1) * rows])
+            buckets.setdefault(key, []).append(path)
+
+    parent = {path: path for path in signatures}
+
+    def root(path):
+        while parent[path] != path:
+            parent[path] = parent[parent[path]]
+            path = parent[path]
+        return path
+
+    checked = set()
+    for members in buckets.values():
+        for i, a in enumerate(members):
+            for b in members[i + 1:]:
+                pair = (a, b) if str(a) < str(b) else (b, a)
+                if pair in checked:
+                    continue
+                checked.add(pair)
+                if similarity(signatures[a]["minhash"], signatures[b]["minhash"]) >= threshold:
+                    parent[root(a)] = root(b)
+
+    groups: Dict[Path, List[Path]] = {}
+    for path in signatures:
+        groups.setdefault(root(path), []).append(path)
+
+    results = []
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+        members.sort(key=lambda p: (_document_date(p), str(p)))
+        original = members[0]
+        for other in members[1:]:
+            same = signatures[other]["sha256"] == signatures[original]["sha256"]
+            results.append({
+                "original": str(original),
+                "duplicata": str(other),
+                "similaridade": round(similarity(signatures[original]["minhash"], signatures[other]["minhash"]), 3),
+                "tipo": "copia" if same else "retificacao",
+            })
+    results.sort(key=lambda r: (r["original"], r["duplicata"]))
+    return results
+
+
+def diff_markdown(original: Path, other: Path, context: int = 2) -> str:
+    """
+    Diferenças entre um documento e seu original (diff unificado, só linhas alteradas)
+
+    O cabeçalho de metadados e os marcadores de página são ignorados, para
+    que mudanças de paginação não apareçam como alterações.
+    """
+    def lines(path):
+        return document_body(Path(path).read_text(encoding="utf-8")).splitlines()
+
+    return "\n".join(difflib.unified_diff(
+        lines(original), lines(other),
+        fromfile=str(original), tofile=str(other),
+        n=context, lineterm=""
+    ))
+
+
+def write_diff_report(pair: Dict[str, Any]) -> Optional[Path]:
+    """
+    Grava `<duplicata>.alteracoes.md` com o diff de uma retificação
+
+    Returns:
+        Caminho do relatório, ou None para cópias idênticas
+    """
+    if pair["tipo"] != "retificacao":
+        return None
+    other = Path(pair["duplicata"])
+    report = other.with_name(other.stem + ".alteracoes.md")
+    report.write_text(
+        f"# Alterações em {other.name}\n\n"
+        f"**Original:** `{pair['original']}`  \n"
+        f"**Similaridade:** {pair['similaridade'] * 100:.0f}%\n\n"
+        f"```diff\n{diff_markdown(Path(pair['original']), other)}\n```\n",
+        encoding="utf-8"
+    )
+    return report
+
+
+def _is_converted_markdown(path: Path) -> bool:
+    """Ignora os relatórios gerados por este módulo"""
+    return not path.name.endswith(".alteracoes.md")
+
+
+def main():
+    """Função principal CLI"""
+    parser = argparse.ArgumentParser(
+        description="Encontra editais e anexos quase duplicados no Markdown convertido (MinHash/LSH)",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Exemplos:
+  python near_duplicates.py memories
+  python near_duplicates.py memories/editais --threshold 0.7
+  python near_duplicates.py memories --diff          # grava <arquivo>.alteracoes.md das retificações
+        """
+    )
+
+    parser.add_argument("directory", help="Diretório com os Markdown (busca recursiva)")
+    parser.add_argument(
+        "--threshold", "-t",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Similaridade mínima para considerar duplicata (padrão: {DEFAULT_THRESHOLD})"
+    )
+    parser.add_argument(
+        "--diff",
+        action="store_true",
+        help="Grava, ao lado de cada retificação, o diff em relação ao original"
+    )
+    parser.add_argument("--json", action="store_true", help="Imprime os pares em JSON")
+
+    args = parser.parse_args()
+
+    dir_path = Path(args.directory)
+    if not dir_path.is_dir():
+        print(f"❌ Erro: Diretório não encontrado: {dir_path}")
+        sys.exit(1)
+
+    md_files = sorted(p for p in dir_path.rglob("*.md") if _is_converted_markdown(p))
+    pairs = find_near_duplicates(md_files, threshold=args.threshold)
+
+    if args.diff:
+        for pair in pairs:
+            pair["relatorio"] = str(write_diff_report(pair) or "")
+
+    if args.json:
+        print(json.dumps(pairs, ensure_ascii=False, indent=2))
+        return
+
+    print(f"📄 Documentos analisados: {len(md_files)}")
+    if not pairs:
+        print("✅ Nenhum quase duplicado encontrado")
+        return
+
+    print(f"🔁 Quase duplicados: {len(pairs)}")
+    print("-" * 70)
+    for pair in pairs:
+        label = "cópia idêntica" if pair["tipo"] == "copia" else "retificação"
+        print(f"{pair['similaridade'] * 100:5.1f}%  {label:<15} {pair['duplicata']}")
+        print(f"        original: {pair['original']}")
+        if pair.get("relatorio"):
+            print(f"        alterações: {pair['relatorio']}")
+    print("-" * 70)
+
+
+if __name__ == "__main__":
+    main()
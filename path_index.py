@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Índice nome de arquivo -> caminho para `memories/` e o workspace.
+
+Usado por `find_pdf_file` e `find_xlsx_file` (pdf_converter.py) para resolver
+nomes de arquivo sem percorrer toda a árvore a cada conversão.
+
+O índice guarda, por diretório, seu mtime e a listagem de arquivos e
+subdiretórios. Na atualização, só os diretórios cujo mtime mudou são listados
+novamente; os demais custam um único `stat`. O índice é persistido em
+`memories/cache/path_index.json` entre execuções e sincronizado com o disco
+na primeira busca de cada processo; depois, só quando um nome não é achado.
+
+Quando o mesmo nome existe em mais de um diretório, a escolha é
+determinística: primeiro memories/, depois o diretório mais raso e, no
+empate, a ordem alfabética do caminho. A busca original (os.walk) devolvia o
+primeiro encontrado na ordem de listagem do sistema de arquivos, que pode
+diferir entre máquinas; com um único candidato o resultado é o mesmo.
+"""
+
+import os
+import sys
+import json
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+
+INDEX_FILE = "memories/cache/path_index.json"
+INDEX_VERSION = 1
+
+# Profundidade máxima indexada fora de memories/ (igual à busca original)
+WORKSPACE_MAX_DEPTH = 3
+
+# Diretórios que nunca contêm documentos e não são indexados
+_SKIP_DIRS = {".git", "__pycache__", ".venv", "venv", "node_modules", os.path.join("memories", "cache")}
+
+
+class PathIndex:
+    """Índice persistente de arquivos do workspace, atualizado por mtime de diretório"""
+
+    def __init__(self, workspace: Path, index_file: Optional[Path] = None):
+        self.workspace = Path(workspace)
+        self.index_file = index_file
+        self.dirs: Dict[str, Dict[str, Any]] = {}
+        self._names: Optional[Dict[str, List[str]]] = None
+        self._dirty = False
+        # Se o índice já foi sincronizado com o disco neste processo
+        self.refreshed = False
+        self._load()
+
+    def _load(self):
+        if self.index_file is None or not self.index_file.exists():
+            return
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION and data.get("workspace") == str(self.workspace):
+                self.dirs = data.get("dirs", {})
+        except (OSError, ValueError) as e:
+            print(f"Aviso: Erro ao carregar índice de arquivos: {e}", file=sys.stderr)
+
+    def save(self):
+        """Persiste o índice (somente se mudou desde a última gravação)"""
+        if self.index_file is None or not self._dirty:
+            return
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_file.with_name(self.index_file.name + ".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(
+                    {"version": INDEX_VERSION, "workspace": str(self.workspace), "dirs": self.dirs},
+                    f, ensure_ascii=False
+                )
+            os.replace(tmp_path, self.index_file)
+            self._dirty = False
+        except OSError as e:
+            print(f"Aviso: Erro ao salvar índice de arquivos: {e}", file=sys.stderr)
+
+    def _scan(self, rel: str, depth: int, max_depth: Optional[int], seen: set):
+        """Atualiza o diretório `rel` (relativo ao workspace) e seus subdiretórios"""
+        if rel in seen or rel in _SKIP_DIRS:
+            return
+        abs_dir = self.workspace / rel if rel else self.workspace
+        try:
+            mtime = os.stat(abs_dir).st_mtime_ns
+        except OSError:
+            return
+
+        entry = self.dirs.get(rel)
+        if entry is None or entry.get("mtime") != mtime:
+            files, subdirs = [], []
+            try:
+                with os.scandir(abs_dir) as it:
+                    for e in it:
+                        try:
+                            if e.is_dir(follow_symlinks=False):
+                                subdirs.append(e.name)
+                            else:
+                                files.append(e.name)
+                        except OSError:
+                            continue
+            except OSError:
+                return
+            entry = {"mtime": mtime, "files": sorted(files), "subdirs": sorted(subdirs)}
+            self.dirs[rel] = entry
+            self._names = None
+            self._dirty = True
+
+        seen.add(rel)
+        if max_depth is not None and depth >= max_depth:
+            return
+        for sub in entry["subdirs"]:
+            self._scan(os.path.join(rel, sub) if rel else sub, depth + 1, max_depth, seen)
+
+    def refresh(self):
+        """Sincroniza o índice com o disco (memories/ completo e workspace até WORKSPACE_MAX_DEPTH)"""
+        seen: set = set()
+        self._scan("memories", 1, None, seen)
+        # O restante do workspace respeita o limite de profundidade
+        # (memories/ já visitado é ignorado)
+        self._scan("", 0, WORKSPACE_MAX_DEPTH, seen)
+
+        stale = [rel for rel in self.dirs if rel not in seen]
+        for rel in stale:
+            del self.dirs[rel]
+        if stale:
+            self._names = None
+            self._dirty = True
+        self.refreshed = True
+
+    def _name_map(self) -> Dict[str, List[str]]:
+        if self._names is None:
+            names: Dict[str, List[str]] = {}
+            for rel, entry in self.dirs.items():
+                for name in entry["files"]:
+                    names.setdefault(name, []).append(rel)
+            self._names = names
+        return self._names
+
+    def lookup(self, name: str, suffix: str) -> Optional[Path]:
+        """
+        Procura um arquivo pelo nome
+
+        Arquivos em memories/ têm prioridade; depois, os mais rasos e, no
+        empate, o caminho em ordem alfabética.
+
+        Args:
+            name: Nome do arquivo (sem diretório)
+            suffix: Extensão exigida (ex.: '.pdf')
+
+        Returns:
+            Caminho do arquivo ou None
+        """
+        if Path(name).suffix.lower() != suffix:
+            return None
+        candidates = self._name_map().get(name)
+        if not candidates:
+            return None
+
+        memories_prefix = "memories" + os.sep
+
+        def priority(rel: str):
+            in_memories = rel == "memories" or rel.startswith(memories_prefix)
+            depth = len(Path(rel).parts)
+            return (not in_memories, depth, rel)
+
+        for rel in sorted(candidates, key=priority):
+            path = self.workspace / rel / name
+            if path.exists():
+                return path
+        return None
+
+
+# Índices carregados neste processo, por workspace
+_INDEXES: Dict[str, PathIndex] = {}
+
+
+def get_path_index(workspace: Optional[Path] = None) -> PathIndex:
+    """Retorna o índice do workspace (carregado do disco na primeira chamada)"""
+    workspace = Path(workspace or Path.cwd())
+    key = str(workspace)
+    index = _INDEXES.get(key)
+    if index is None:
+        index_file = workspace / INDEX_FILE if (workspace / "memories").exists() else None
+        index = PathIndex(workspace, index_file)
+        _INDEXES[key] = index
+    return index
+
+
+def resolve_file(name: str, suffix: str, workspace: Optional[Path] = None) -> Optional[Path]:
+    """
+    Resolve um nome de arquivo em memories/ ou no workspace usando o índice
+
+    O índice é sincronizado com o disco na primeira chamada do processo e,
+    depois, apenas quando o nome não é encontrado (arquivo criado depois da
+    última sincronização). Um caminho indexado que deixou de existir é
+    ignorado por `lookup` e também leva a uma nova sincronização.
+
+    Args:
+        name: Nome do arquivo
+        suffix: Extensão exigida (ex.: '.pdf', '.xlsx')
+        workspace: Raiz do workspace (padrão: diretório atual)
+
+    Returns:
+        Caminho encontrado ou None
+    """
+    index = get_path_index(workspace)
+    if index.refreshed:
+        found = index.lookup(name, suffix)
+        if found is not None:
+            return found
+    index.refresh()
+    index.save()
+    return index.lookup(name, suffix)
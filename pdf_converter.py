@@ -9,62 +9,34 @@ Módulo unificado para conversão de arquivos para Markdown.
 import os
 import json
 import sys
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Optional, Dict, Any, Tuple, List
 from datetime import datetime
 
-# Tentar importar Docling
-DOCLING_AVAILABLE = False
-try:
-    from docling.document_converter import DocumentConverter
-    DOCLING_AVAILABLE = True
-except ImportError:
-    DOCLING_AVAILABLE = False
-
-# Tentar importar pypdf
-PYPDF_AVAILABLE = False
-try:
-    import pypdf
-    PYPDF_AVAILABLE = True
-except ImportError:
-    PYPDF_AVAILABLE = False
+from config_loader import load_config
+from path_index import resolve_file
+from search_index import update_index_for
+from chunk_store import write_chunk_index
+from clause_search import write_bm25_stats
+from conversion_profiler import StageProfiler, export_profile, format_stages
 
-# Tentar importar openpyxl (XLSX)
-OPENPYXL_AVAILABLE = False
-try:
-    import openpyxl
-    OPENPYXL_AVAILABLE = True
-except ImportError:
-    OPENPYXL_AVAILABLE = False
-
-
-def load_config() -> Dict[str, Any]:
-    """Carrega configuração do arquivo config.json"""
-    config_path = Path("config/config.json")
-    default_config = {
-        "pdf_conversion": {
-            "default_engine": "auto",
-            "fallback_to_pypdf": True,
-            "docling_options": {
-                "enable_ocr": True,
-                "preserve_tables": True,
-                "preserve_formulas": True
-            }
-        }
-    }
-    
-    if config_path.exists():
-        try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-                # Mescla com configuração padrão
-                if "pdf_conversion" not in config:
-                    config["pdf_conversion"] = default_config["pdf_conversion"]
-                return config
-        except Exception as e:
-            print(f"Aviso: Erro ao carregar config.json: {e}", file=sys.stderr)
-    
-    return default_config
+
+def _engine_available(module_name: str) -> bool:
+    """Verifica se um pacote está instalado sem importá-lo"""
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+# Engines: a disponibilidade é verificada sem importar os pacotes; cada engine
+# só é importado na primeira conversão que o usa (importar o Docling leva
+# segundos, e uma conversão com pypdf ou de XLSX não precisa dele)
+DOCLING_AVAILABLE = _engine_available("docling")
+PYPDF_AVAILABLE = _engine_available("pypdf")
+OPENPYXL_AVAILABLE = _engine_available("openpyxl")
 
 
 def detect_available_engine(preferred: Optional[str] = None) -> Tuple[str, bool]:
@@ -97,6 +69,30 @@ def detect_available_engine(preferred: Optional[str] = None) -> Tuple[str, bool]
             return ("none", False)
 
 
+def _update_search_index(output_path: Path):
+    """Atualiza o índice de busca (search_index.py) com uma saída recém-gravada"""
+    if load_config().get("pdf_conversion", {}).get("update_search_index", True):
+        update_index_for(Path(output_path))
+
+
+def _write_chunk_index(output_path: Path):
+    """
+    Grava ao lado do Markdown de um PDF o índice de trechos (chunk_store.py)
+    e as estatísticas BM25 desses trechos (clause_search.py)
+
+    Só com `chunk_index` ativado no config.json: por padrão nenhum arquivo
+    extra é criado ao lado do Markdown na conversão (ChunkStore e ClauseSearch
+    criam os índices na primeira consulta).
+    """
+    if not load_config().get("pdf_conversion", {}).get("chunk_index", False):
+        return
+    try:
+        write_chunk_index(Path(output_path))
+        write_bm25_stats(Path(output_path))
+    except OSError as e:
+        print(f"Aviso: Erro ao gravar índice de trechos: {e}", file=sys.stderr)
+
+
 def find_pdf_file(pdf_path: str) -> Path:
     """
     Encontra o arquivo PDF usando múltiplas estratégias
@@ -119,21 +115,11 @@ def find_pdf_file(pdf_path: str) -> Path:
     if test_path.exists():
         return test_path
     
-    # 3. Busca recursiva em memories/ (específico para este módulo)
-    memories_dir = workspace / "memories"
-    if memories_dir.exists():
-        for root, dirs, files in os.walk(memories_dir):
-            test_path = Path(root) / path.name
-            if test_path.exists() and test_path.suffix.lower() == '.pdf':
-                return test_path
-    
-    # 4. Busca recursiva limitada no workspace
-    for root, dirs, files in os.walk(workspace):
-        if len(Path(root).relative_to(workspace).parts) > 3:
-            continue
-        test_path = Path(root) / path.name
-        if test_path.exists() and test_path.suffix.lower() == '.pdf':
-            return test_path
+    # 3/4. Busca pelo nome em memories/ e no workspace (até 3 níveis),
+    # usando o índice persistente de arquivos
+    found = resolve_file(path.name, '.pdf', workspace)
+    if found is not None:
+        return found
     
     # Retorna o caminho original (vai gerar erro descritivo)
     return path
@@ -157,21 +143,11 @@ def find_xlsx_file(xlsx_path: str) -> Path:
     if test_path.exists():
         return test_path
 
-    # 3. Busca recursiva em memories/ (específico para este módulo)
-    memories_dir = workspace / "memories"
-    if memories_dir.exists():
-        for root, dirs, files in os.walk(memories_dir):
-            test_path = Path(root) / path.name
-            if test_path.exists() and test_path.suffix.lower() == ".xlsx":
-                return test_path
-
-    # 4. Busca recursiva limitada no workspace
-    for root, dirs, files in os.walk(workspace):
-        if len(Path(root).relative_to(workspace).parts) > 3:
-            continue
-        test_path = Path(root) / path.name
-        if test_path.exists() and test_path.suffix.lower() == ".xlsx":
-            return test_path
+    # 3/4. Busca pelo nome em memories/ e no workspace (até 3 níveis),
+    # usando o índice persistente de arquivos
+    found = resolve_file(path.name, ".xlsx", workspace)
+    if found is not None:
+        return found
 
     return path
 
@@ -180,100 +156,130 @@ def _is_row_empty(row: List[str]) -> bool:
     return all((c or "").strip() == "" for c in row)
 
 
-def _trim_empty_edges(matrix: List[List[str]]) -> List[List[str]]:
-    """
-    Remove linhas e colunas totalmente vazias nas bordas.
-    Não tenta otimização perfeita: é uma heurística robusta para planilhas modelo.
+class _OccupiedBounds:
     """
-    if not matrix:
-        return []
-
-    # remove linhas vazias no topo
-    top = 0
-    while top < len(matrix) and _is_row_empty(matrix[top]):
-        top += 1
+    Limites das células não vazias de uma matriz, calculados em uma passada.
 
-    # remove linhas vazias no fim
-    bottom = len(matrix) - 1
-    while bottom >= top and _is_row_empty(matrix[bottom]):
-        bottom -= 1
+    As linhas são adicionadas uma a uma, à medida que são lidas (podem ter
+    tamanhos diferentes); cada linha só é percorrida do início até a primeira
+    célula ocupada e do fim até a coluna mais à direita já conhecida.
+    """
 
-    if bottom < top:
-        return []
+    def __init__(self):
+        self.count = 0
+        self.top: Optional[int] = None
+        self.bottom = -1
+        self.left: Optional[int] = None
+        self.right = -1
+
+    def add(self, row: List[str]):
+        index = self.count
+        self.count += 1
+
+        first = None
+        for i, c in enumerate(row):
+            if (c or "").strip() != "":
+                first = i
+                break
+        if first is None:
+            return
+
+        if self.top is None:
+            self.top = index
+        self.bottom = index
+        if self.left is None or first < self.left:
+            self.left = first
+        for i in range(len(row) - 1, max(self.right, first), -1):
+            if (row[i] or "").strip() != "":
+                self.right = i
+                break
+        if first > self.right:
+            self.right = first
 
-    trimmed = matrix[top : bottom + 1]
 
-    # descobrir colunas não vazias
-    max_cols = max((len(r) for r in trimmed), default=0)
-    if max_cols == 0:
-        return []
+def _markdown_escape_cell(value: str) -> str:
+    # evita quebrar tabela
+    return (value or "").replace("|", "\\|").replace("\n", " ").strip()
 
-    # normaliza tamanhos
-    normalized: List[List[str]] = [r + [""] * (max_cols - len(r)) for r in trimmed]
 
-    left = 0
-    while left < max_cols and all((row[left] or "").strip() == "" for row in normalized):
-        left += 1
+def _render_markdown_table(rows: List[List[str]], cols_len: int) -> str:
+    """Renderiza linhas já recortadas (mesma largura) como tabela Markdown"""
+    header = rows[0]
+    body = rows[1:] if len(rows) > 1 else []
 
-    right = max_cols - 1
-    while right >= left and all((row[right] or "").strip() == "" for row in normalized):
-        right -= 1
+    header_cells = [_markdown_escape_cell(c) or " " for c in header]
+    sep_cells = ["---"] * cols_len
 
-    if right < left:
-        return []
+    lines: List[str] = []
+    lines.append("| " + " | ".join(header_cells) + " |")
+    lines.append("| " + " | ".join(sep_cells) + " |")
+    for r in body:
+        cells = [_markdown_escape_cell(c) for c in r]
+        lines.append("| " + " | ".join(cells) + " |")
 
-    return [row[left : right + 1] for row in normalized]
+    return "\n".join(lines) + "\n"
 
 
-def _markdown_escape_cell(value: str) -> str:
-    # evita quebrar tabela
-    return (value or "").replace("|", "\\|").replace("\n", " ").strip()
+def _is_raw_row_empty(row: Any) -> bool:
+    return all(v is None or str(v).strip() == "" for v in row)
 
 
-def _sheet_to_markdown_table(
-    matrix: List[List[str]],
+def _stream_sheet_to_markdown_table(
+    rows_iter: Any,
     max_rows: int,
     max_cols: int,
 ) -> Tuple[str, Dict[str, Any]]:
     """
-    Renderiza uma matriz 2D em tabela Markdown.
-    A primeira linha é usada como header.
+    Renderiza uma aba lendo apenas a janela de linhas necessária.
+
+    Consome `rows_iter` (ex.: `ws.iter_rows(values_only=True)`) até obter
+    `max_rows` linhas a partir da primeira não vazia, e depois só o suficiente
+    para saber se há mais conteúdo (truncamento). Linhas vazias no topo e no
+    fim são removidas; colunas vazias nas bordas são removidas considerando
+    apenas as linhas exibidas. Os limites das colunas ocupadas são calculados
+    enquanto as linhas são lidas, sem uma segunda passada pela janela.
     """
     meta: Dict[str, Any] = {"truncated": False, "rows": 0, "cols": 0}
 
-    if not matrix:
-        return "_(aba vazia)_\n", meta
-
-    # trim bordas vazias
-    matrix = _trim_empty_edges(matrix)
-    if not matrix:
+    window: List[List[str]] = []
+    bounds = _OccupiedBounds()
+    more_rows = False
+    for row in rows_iter:
+        if len(window) >= max_rows:
+            # Look-ahead: basta uma linha não vazia além da janela
+            if not _is_raw_row_empty(row):
+                more_rows = True
+                break
+            continue
+        if not window and _is_raw_row_empty(row):
+            # linhas vazias no topo
+            continue
+        cells = ["" if v is None else str(v) for v in row]
+        window.append(cells)
+        # linhas vazias não alteram os limites, então as do fim (removidas
+        # abaixo) podem entrar na contagem sem efeito
+        bounds.add(cells)
+
+    # linhas vazias no fim (só fazem parte da borda se não houver mais conteúdo)
+    if not more_rows:
+        while window and _is_row_empty(window[-1]):
+            window.pop()
+
+    if not window or bounds.top is None:
         return "_(aba vazia)_\n", meta
 
-    # aplica limites
-    rows = matrix[:max_rows]
-    cols_len = max((len(r) for r in rows), default=0)
-    cols_len = min(cols_len, max_cols)
-    rows = [r[:cols_len] + [""] * (cols_len - len(r[:cols_len])) for r in rows]
+    left = bounds.left
+    width = bounds.right - left + 1
+    cols_len = min(width, max_cols)
+    rows = [r[left : left + cols_len] for r in window]
+    rows = [r + [""] * (cols_len - len(r)) for r in rows]
 
     meta["rows"] = len(rows)
     meta["cols"] = cols_len
-    if len(matrix) > max_rows or any(len(r) > max_cols for r in matrix):
+    if more_rows or width > max_cols:
         meta["truncated"] = True
 
-    header = rows[0]
-    body = rows[1:] if len(rows) > 1 else []
-
-    header_cells = [_markdown_escape_cell(c) or " " for c in header]
-    sep_cells = ["---"] * cols_len
-
-    lines: List[str] = []
-    lines.append("| " + " | ".join(header_cells) + " |")
-    lines.append("| " + " | ".join(sep_cells) + " |")
-    for r in body:
-        cells = [_markdown_escape_cell(c) for c in r]
-        lines.append("| " + " | ".join(cells) + " |")
-
-    return "\n".join(lines) + "\n", meta
+    return _render_markdown_table(rows, cols_len), meta
 
 
 def convert_excel_to_markdown(
@@ -303,6 +309,7 @@ def convert_excel_to_markdown(
     if verbose:
         print(f"📊 Convertendo XLSX: {xlsx_file}", file=sys.stderr)
 
+    import openpyxl
     wb = openpyxl.load_workbook(filename=str(xlsx_file), data_only=True, read_only=True)
 
     md_parts: List[str] = []
@@ -324,13 +331,11 @@ def convert_excel_to_markdown(
         sheet_name = str(ws.title)
         md_parts.append(f"## Aba: {sheet_name}\n")
 
-        matrix: List[List[str]] = []
-        # read_only: ws.iter_rows é eficiente
-        # coletamos como string (para markdown)
-        for row in ws.iter_rows(values_only=True):
-            matrix.append(["" if v is None else str(v) for v in row])
-
-        table_md, table_meta = _sheet_to_markdown_table(matrix, max_rows=max_rows, max_cols=max_cols)
+        # read_only: ws.iter_rows é um gerador; só a janela exibida é lida
+        # e convertida para string (para markdown)
+        table_md, table_meta = _stream_sheet_to_markdown_table(
+            ws.iter_rows(values_only=True), max_rows=max_rows, max_cols=max_cols
+        )
         md_parts.append(table_md)
 
         if table_meta.get("truncated"):
@@ -364,6 +369,7 @@ def convert_excel_to_markdown(
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
     out_path.write_text(enhanced, encoding="utf-8")
+    _update_search_index(out_path)
 
     if verbose:
         print(f"✅ XLSX convertido para: {out_path}", file=sys.stderr)
@@ -401,13 +407,146 @@ def convert_file_to_markdown(
     raise ValueError(f"Extensão não suportada para conversão: {suffix}")
 
 
-def convert_with_docling(pdf_path: Path, output_path: Optional[Path] = None) -> Tuple[str, Dict[str, Any]]:
+# Conversor Docling reutilizável (um por processo e por conjunto de opções).
+# Construir um DocumentConverter carrega modelos/pipeline, o que domina o
+# tempo de conversão em lote quando feito a cada PDF.
+_DOCLING_CONVERTERS: Dict[str, Any] = {}
+
+
+def _build_docling_converter(docling_options: Dict[str, Any]) -> Any:
+    """
+    Cria um DocumentConverter aplicando `docling_options` do config.json.
+
+    Se a versão instalada do Docling não expuser as opções de pipeline,
+    usa o conversor padrão.
+    """
+    global DOCLING_AVAILABLE
+    try:
+        from docling.document_converter import DocumentConverter
+    except ImportError as e:
+        # Pacote presente, mas não importável (ex.: dependência quebrada):
+        # as próximas conversões do processo vão direto para o pypdf
+        DOCLING_AVAILABLE = False
+        raise ImportError(f"Docling não pôde ser carregado: {e}") from e
+
+    try:
+        from docling.datamodel.base_models import InputFormat
+        from docling.datamodel.pipeline_options import PdfPipelineOptions
+        from docling.document_converter import PdfFormatOption
+    except ImportError:
+        return DocumentConverter()
+
+    pipeline_options = PdfPipelineOptions()
+    pipeline_options.do_ocr = bool(docling_options.get("enable_ocr", True))
+    pipeline_options.do_table_structure = bool(docling_options.get("preserve_tables", True))
+    if hasattr(pipeline_options, "do_formula_enrichment"):
+        pipeline_options.do_formula_enrichment = bool(docling_options.get("preserve_formulas", True))
+
+    return DocumentConverter(
+        format_options={InputFormat.PDF: PdfFormatOption(pipeline_options=pipeline_options)}
+    )
+
+
+def get_docling_converter(docling_options: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    Retorna o conversor Docling compartilhado do processo.
+
+    O conversor é criado na primeira chamada e reutilizado pelas conversões
+    seguintes com as mesmas opções.
+
+    Args:
+        docling_options: Opções do Docling (padrão: `docling_options` do config.json)
+
+    Returns:
+        Instância de DocumentConverter
+    """
+    if not DOCLING_AVAILABLE:
+        raise ImportError("Docling não está disponível. Instale com: pip install docling")
+
+    if docling_options is None:
+        config = load_config()
+        docling_options = config.get("pdf_conversion", {}).get("docling_options", {})
+
+    key = json.dumps(docling_options, sort_keys=True)
+    converter = _DOCLING_CONVERTERS.get(key)
+    if converter is None:
+        converter = _build_docling_converter(docling_options)
+        _DOCLING_CONVERTERS[key] = converter
+    return converter
+
+
+# PDFs com menos páginas que isso por worker não compensam o custo de
+# iniciar processos para extração paralela
+PARALLEL_MIN_PAGES_PER_WORKER = 8
+
+
+def _split_page_ranges(total_pages: int, parts: int) -> List[Tuple[int, int]]:
+    """
+    Divide as páginas [0, total_pages) em até `parts` faixas contíguas
+    
+    Returns:
+        Lista de faixas (inicio, fim) com índices 0-based e fim exclusivo
+    """
+    parts = max(1, min(parts, total_pages))
+    size, extra = divmod(total_pages, parts)
+    ranges = []
+    start = 0
+    for i in range(parts):
+        end = start + size + (1 if i < extra else 0)
+        if end > start:
+            ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def _page_workers_for(total_pages: int, page_workers: int) -> int:
+    """Número efetivo de workers para um documento com `total_pages` páginas"""
+    if page_workers <= 1:
+        return 1
+    return max(1, min(page_workers, total_pages // PARALLEL_MIN_PAGES_PER_WORKER))
+
+
+def _count_pdf_pages(pdf_path: Path) -> Optional[int]:
+    """Conta as páginas de um PDF com pypdf (None se não for possível)"""
+    if not PYPDF_AVAILABLE:
+        return None
+    try:
+        import pypdf
+        with open(pdf_path, 'rb') as file:
+            return len(pypdf.PdfReader(file).pages)
+    except Exception:
+        return None
+
+
+def _docling_document_metadata(document: Any) -> Dict[str, Any]:
+    """Extrai título/autor de um documento Docling, se disponíveis"""
+    metadata: Dict[str, Any] = {}
+    if hasattr(document, 'metadata') and document.metadata:
+        doc_metadata = document.metadata
+        if hasattr(doc_metadata, 'title'):
+            metadata["title"] = str(doc_metadata.title)
+        if hasattr(doc_metadata, 'author'):
+            metadata["author"] = str(doc_metadata.author)
+    return metadata
+
+
+def _docling_range_worker(pdf_path: str, start: int, end: int, docling_options: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """Converte as páginas [start, end) de um PDF com Docling (em processo separado)"""
+    converter = get_docling_converter(docling_options)
+    # page_range do Docling é 1-based e inclusivo
+    result = converter.convert(pdf_path, page_range=(start + 1, end))
+    return result.document.export_to_markdown(), _docling_document_metadata(result.document)
+
+
+def convert_with_docling(pdf_path: Path, output_path: Optional[Path] = None, page_workers: int = 1) -> Tuple[str, Dict[str, Any]]:
     """
     Converte PDF para Markdown usando Docling
     
     Args:
         pdf_path: Caminho para o arquivo PDF
         output_path: Caminho de saída (opcional)
+        page_workers: Processos para converter faixas de páginas em paralelo
+            (requer pypdf para contar as páginas; 1 = conversão única)
         
     Returns:
         Tupla (markdown_content, metadata)
@@ -418,8 +557,36 @@ def convert_with_docling(pdf_path: Path, output_path: Optional[Path] = None) ->
     config = load_config()
     docling_options = config.get("pdf_conversion", {}).get("docling_options", {})
     
-    # Cria o conversor
-    converter = DocumentConverter()
+    # Extrai metadados
+    metadata = {
+        "engine": "docling",
+        "file_path": str(pdf_path.absolute()),
+        "file_name": pdf_path.name,
+        "conversion_date": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+    }
+    
+    total_pages = _count_pdf_pages(pdf_path) if page_workers > 1 else None
+    workers = _page_workers_for(total_pages or 0, page_workers)
+    
+    if workers > 1:
+        # Cada worker converte uma faixa de páginas com seu próprio conversor;
+        # as faixas são reunidas na ordem original
+        ranges = _split_page_ranges(total_pages, workers)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(
+                _docling_range_worker,
+                [str(pdf_path)] * len(ranges),
+                [r[0] for r in ranges],
+                [r[1] for r in ranges],
+                [docling_options] * len(ranges),
+            ))
+        markdown_content = "\n\n".join(md for md, _ in results if md.strip())
+        metadata.update(results[0][1])
+        metadata["page_workers"] = workers
+        return markdown_content, metadata
+    
+    # Reutiliza o conversor do processo (criado na primeira chamada)
+    converter = get_docling_converter(docling_options)
     
     # Converte o documento
     result = converter.convert(str(pdf_path))
@@ -427,32 +594,91 @@ def convert_with_docling(pdf_path: Path, output_path: Optional[Path] = None) ->
     # Extrai Markdown
     markdown_content = result.document.export_to_markdown()
     
-    # Extrai metadados
+    # Adiciona metadados do documento se disponíveis
+    metadata.update(_docling_document_metadata(result.document))
+    
+    return markdown_content, metadata
+
+
+def _pypdf_metadata(pdf_path: Path, pdf_reader: Any) -> Dict[str, Any]:
+    """Monta os metadados de um PDF aberto com pypdf"""
     metadata = {
-        "engine": "docling",
+        "engine": "pypdf",
         "file_path": str(pdf_path.absolute()),
         "file_name": pdf_path.name,
         "conversion_date": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
     }
     
-    # Adiciona metadados do documento se disponíveis
-    if hasattr(result.document, 'metadata') and result.document.metadata:
-        doc_metadata = result.document.metadata
-        if hasattr(doc_metadata, 'title'):
-            metadata["title"] = str(doc_metadata.title)
-        if hasattr(doc_metadata, 'author'):
-            metadata["author"] = str(doc_metadata.author)
+    # Extrair metadados do PDF
+    if pdf_reader.metadata:
+        pdf_metadata = pdf_reader.metadata
+        if pdf_metadata.get("/Title"):
+            metadata["title"] = str(pdf_metadata.get("/Title", ""))
+        if pdf_metadata.get("/Author"):
+            metadata["author"] = str(pdf_metadata.get("/Author", ""))
+        if pdf_metadata.get("/Subject"):
+            metadata["subject"] = str(pdf_metadata.get("/Subject", ""))
     
-    return markdown_content, metadata
+    metadata["total_pages"] = len(pdf_reader.pages)
+    return metadata
+
 
+def _iter_pypdf_pages(pdf_reader: Any, start: int = 0, end: Optional[int] = None):
+    """
+    Gera a seção Markdown de cada página com texto, uma por vez.
+    
+    Args:
+        pdf_reader: PdfReader aberto
+        start: Índice (0-based) da primeira página
+        end: Índice final exclusivo (padrão: última página)
+    
+    Yields:
+        Texto "## Página N" da página, sem acumular o documento em memória
+    """
+    if end is None:
+        end = len(pdf_reader.pages)
+    for page_num in range(start + 1, end + 1):
+        page = pdf_reader.pages[page_num - 1]
+        page_text = page.extract_text()
+        if page_text.strip():
+            # Limpa quebras de linha excessivas
+            cleaned_text = '\n'.join(line.strip() for line in page_text.split('\n') if line.strip())
+            yield f"## Página {page_num}\n\n{cleaned_text}\n"
+
+
+def _pypdf_range_worker(pdf_path: str, start: int, end: int) -> List[str]:
+    """Extrai as seções Markdown das páginas [start, end) (em processo separado)"""
+    import pypdf
+    with open(pdf_path, 'rb') as file:
+        return list(_iter_pypdf_pages(pypdf.PdfReader(file), start, end))
 
-def convert_with_pypdf(pdf_path: Path, output_path: Optional[Path] = None) -> Tuple[str, Dict[str, Any]]:
+
+def _iter_pypdf_pages_parallel(pdf_path: Path, total_pages: int, workers: int):
+    """
+    Extrai as páginas em paralelo por faixas e as gera na ordem original
+    
+    Cada faixa é processada por um worker que abre o PDF por conta própria.
+    Usa mais faixas que workers para equilibrar páginas de custo desigual.
+    """
+    ranges = _split_page_ranges(total_pages, workers * 4)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for parts in executor.map(
+            _pypdf_range_worker,
+            [str(pdf_path)] * len(ranges),
+            [r[0] for r in ranges],
+            [r[1] for r in ranges],
+        ):
+            yield from parts
+
+
+def convert_with_pypdf(pdf_path: Path, output_path: Optional[Path] = None, page_workers: int = 1) -> Tuple[str, Dict[str, Any]]:
     """
     Converte PDF para Markdown usando pypdf (fallback)
     
     Args:
         pdf_path: Caminho para o arquivo PDF
         output_path: Caminho de saída (opcional)
+        page_workers: Processos para extrair faixas de páginas em paralelo (1 = sequencial)
         
     Returns:
         Tupla (markdown_content, metadata)
@@ -460,43 +686,85 @@ def convert_with_pypdf(pdf_path: Path, output_path: Optional[Path] = None) -> Tu
     if not PYPDF_AVAILABLE:
         raise ImportError("pypdf não está disponível. Instale com: pip install pypdf")
     
-    text_parts = []
-    metadata = {
-        "engine": "pypdf",
-        "file_path": str(pdf_path.absolute()),
-        "file_name": pdf_path.name,
-        "conversion_date": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-    }
-    
+    import pypdf
     with open(pdf_path, 'rb') as file:
         pdf_reader = pypdf.PdfReader(file)
-        
-        # Extrair metadados do PDF
-        if pdf_reader.metadata:
-            pdf_metadata = pdf_reader.metadata
-            if pdf_metadata.get("/Title"):
-                metadata["title"] = str(pdf_metadata.get("/Title", ""))
-            if pdf_metadata.get("/Author"):
-                metadata["author"] = str(pdf_metadata.get("/Author", ""))
-            if pdf_metadata.get("/Subject"):
-                metadata["subject"] = str(pdf_metadata.get("/Subject", ""))
+        metadata = _pypdf_metadata(pdf_path, pdf_reader)
+        workers = _page_workers_for(metadata["total_pages"], page_workers)
         
         # Extrair texto de todas as páginas
-        total_pages = len(pdf_reader.pages)
-        metadata["total_pages"] = total_pages
-        
-        for page_num, page in enumerate(pdf_reader.pages, 1):
-            page_text = page.extract_text()
-            if page_text.strip():
-                # Limpa quebras de linha excessivas
-                cleaned_text = '\n'.join(line.strip() for line in page_text.split('\n') if line.strip())
-                text_parts.append(f"## Página {page_num}\n\n{cleaned_text}\n")
+        if workers > 1:
+            metadata["page_workers"] = workers
+            text_parts = list(_iter_pypdf_pages_parallel(pdf_path, metadata["total_pages"], workers))
+        else:
+            text_parts = list(_iter_pypdf_pages(pdf_reader))
     
     markdown_content = '\n'.join(text_parts)
     
     return markdown_content, metadata
 
 
+def stream_with_pypdf(
+    pdf_path: Path,
+    output_path: Path,
+    extra_metadata: Optional[Dict[str, Any]] = None,
+    page_workers: int = 1
+) -> Dict[str, Any]:
+    """
+    Converte PDF para Markdown com pypdf gravando a saída página a página
+    
+    O cabeçalho é escrito primeiro e cada página é gravada assim que extraída,
+    de modo que o uso de memória não cresce com o número de páginas. O
+    resultado é idêntico ao de `convert_with_pypdf` + `enhance_markdown_metadata`.
+    A saída é gravada em arquivo temporário e só substitui `output_path` ao final.
+    
+    Args:
+        pdf_path: Caminho para o arquivo PDF
+        output_path: Caminho do Markdown de saída
+        extra_metadata: Metadados adicionais para o cabeçalho (ex.: engine_used)
+        page_workers: Processos para extrair faixas de páginas em paralelo;
+            as páginas continuam sendo gravadas em ordem
+        
+    Returns:
+        Metadados do documento
+    """
+    if not PYPDF_AVAILABLE:
+        raise ImportError("pypdf não está disponível. Instale com: pip install pypdf")
+    
+    import pypdf
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    
+    try:
+        with open(pdf_path, 'rb') as file, open(tmp_path, 'w', encoding='utf-8') as out:
+            pdf_reader = pypdf.PdfReader(file)
+            metadata = _pypdf_metadata(pdf_path, pdf_reader)
+            if extra_metadata:
+                metadata.update(extra_metadata)
+            
+            workers = _page_workers_for(metadata["total_pages"], page_workers)
+            if workers > 1:
+                metadata["page_workers"] = workers
+                pages = _iter_pypdf_pages_parallel(pdf_path, metadata["total_pages"], workers)
+            else:
+                pages = _iter_pypdf_pages(pdf_reader)
+            
+            out.write(enhance_markdown_metadata("", metadata))
+            for index, part in enumerate(pages):
+                if index:
+                    out.write('\n')
+                out.write(part)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
+    
+    return metadata
+
+
 def enhance_markdown_metadata(markdown_content: str, metadata: Dict[str, Any]) -> str:
     """
     Adiciona cabeçalho com metadados ao Markdown
@@ -538,7 +806,12 @@ def convert_pdf_to_markdown(
     output_path: Optional[str] = None,
     engine: Optional[str] = None,
     fallback: bool = True,
-    verbose: bool = False
+    verbose: bool = False,
+    cache: Optional[Any] = None,
+    stream: Optional[bool] = None,
+    page_workers: Optional[int] = None,
+    profile_output: Optional[str] = None,
+    profile_memory: bool = False
 ) -> Tuple[str, Dict[str, Any]]:
     """
     Função principal unificada para conversão de PDF para Markdown
@@ -549,64 +822,161 @@ def convert_pdf_to_markdown(
         engine: Engine a usar ('docling', 'pypdf', 'auto')
         fallback: Se True, tenta fallback automático em caso de erro
         verbose: Se True, imprime informações sobre o processo
+        cache: ConversionCache opcional (conversion_cache.py); PDFs com o mesmo
+            conteúdo, engine e opções reutilizam o Markdown já gerado
+        stream: Se True, conversões com pypdf gravam a saída página a página
+            (memória constante). Padrão: `stream_pypdf` do config.json
+        page_workers: Processos para extrair faixas de páginas de um mesmo PDF
+            em paralelo. Padrão: `page_workers` do config.json (1 = sequencial)
+        profile_output: Arquivo ao qual acrescentar o perfil da conversão
+            (`.jsonl` ou Chrome trace). Padrão: `profile_output` do config.json
+        profile_memory: Se True, mede também a memória alocada pelo Python em
+            cada etapa (tracemalloc; deixa a conversão mais lenta)
         
     Returns:
-        Tupla (caminho_do_arquivo_md, metadata)
+        Tupla (caminho_do_arquivo_md, metadata). `metadata["etapas"]` traz tempo,
+        CPU e pico de memória de cada etapa (conversion_profiler.py)
     """
+    profiler = StageProfiler(trace_memory=profile_memory)
+    try:
+        return _convert_pdf_profiled(
+            profiler, pdf_path, output_path, engine, fallback, verbose,
+            cache, stream, page_workers, profile_output
+        )
+    finally:
+        # Encerra o tracemalloc também quando a conversão falha
+        profiler.finish()
+
+
+def _convert_pdf_profiled(
+    profiler: StageProfiler,
+    pdf_path: str,
+    output_path: Optional[str],
+    engine: Optional[str],
+    fallback: bool,
+    verbose: bool,
+    cache: Optional[Any],
+    stream: Optional[bool],
+    page_workers: Optional[int],
+    profile_output: Optional[str]
+) -> Tuple[str, Dict[str, Any]]:
+    """Corpo de convert_pdf_to_markdown, medido etapa a etapa por `profiler`"""
     # Encontra o arquivo PDF
-    pdf_file = find_pdf_file(pdf_path)
-    
-    if not pdf_file.exists():
-        raise FileNotFoundError(f"PDF não encontrado: {pdf_path}")
-    
-    if pdf_file.suffix.lower() != '.pdf':
-        raise ValueError(f"Arquivo não é um PDF: {pdf_path}")
-    
-    # Define caminho de saída
-    if output_path is None:
-        output_path = pdf_file.with_suffix('.md')
-    else:
-        output_path = Path(output_path)
+    with profiler.stage("resolucao_arquivo"):
+        pdf_file = find_pdf_file(pdf_path)
+        
+        if not pdf_file.exists():
+            raise FileNotFoundError(f"PDF não encontrado: {pdf_path}")
+        
+        if pdf_file.suffix.lower() != '.pdf':
+            raise ValueError(f"Arquivo não é um PDF: {pdf_path}")
+        
+        # Define caminho de saída
+        if output_path is None:
+            output_path = pdf_file.with_suffix('.md')
+        else:
+            output_path = Path(output_path)
     
     # Detecta engine disponível
-    engine_name, is_available = detect_available_engine(engine)
-    
-    if not is_available:
-        if fallback:
-            # Tenta o outro engine
-            if engine_name == "docling":
-                engine_name, is_available = detect_available_engine("pypdf")
-            else:
-                engine_name, is_available = detect_available_engine("docling")
+    with profiler.stage("deteccao_engine"):
+        engine_name, is_available = detect_available_engine(engine)
         
         if not is_available:
-            raise RuntimeError(
-                "Nenhum engine de conversão disponível. "
-                "Instale pelo menos um: pip install docling OU pip install pypdf"
-            )
+            if fallback:
+                # Tenta o outro engine
+                if engine_name == "docling":
+                    engine_name, is_available = detect_available_engine("pypdf")
+                else:
+                    engine_name, is_available = detect_available_engine("docling")
+            
+            if not is_available:
+                raise RuntimeError(
+                    "Nenhum engine de conversão disponível. "
+                    "Instale pelo menos um: pip install docling OU pip install pypdf"
+                )
     
     # Carrega configuração
-    config = load_config()
-    fallback_enabled = config.get("pdf_conversion", {}).get("fallback_to_pypdf", True)
-    if fallback is not None:
-        fallback_enabled = fallback
+    with profiler.stage("configuracao"):
+        config = load_config()
+        fallback_enabled = config.get("pdf_conversion", {}).get("fallback_to_pypdf", True)
+        if fallback is not None:
+            fallback_enabled = fallback
+        if stream is None:
+            stream = bool(config.get("pdf_conversion", {}).get("stream_pypdf", False))
+        if page_workers is None:
+            page_workers = int(config.get("pdf_conversion", {}).get("page_workers", 1))
+        if profile_output is None:
+            profile_output = config.get("pdf_conversion", {}).get("profile_output")
     
     markdown_content = None
     metadata = {}
     used_engine = engine_name
     fallback_used = False
+    streamed = False
+    
+    def finish_profile():
+        # As medições não vão para o cache: descrevem esta execução, não o conteúdo
+        metadata["etapas"] = profiler.finish()
+        metadata["tempo_total_s"] = profiler.total_seconds()
+        if profile_output:
+            export_profile(profile_output, pdf_file.name, profiler.started_at, metadata["etapas"],
+                           metadata["tempo_total_s"], {
+                               "engine": metadata.get("engine_used"),
+                               "fallback": metadata.get("fallback_used", False),
+                               "cache": metadata.get("cache_hit", False),
+                               "paginas": metadata.get("total_pages"),
+                           })
+        if verbose:
+            print(format_stages(metadata["etapas"]), file=sys.stderr)
+    
+    # Consulta o cache por conteúdo antes de converter
+    cache_key = None
+    if cache is not None:
+        with profiler.stage("cache"):
+            docling_options = config.get("pdf_conversion", {}).get("docling_options", {})
+            cache_key = cache.make_key(pdf_file, engine_name, docling_options)
+            cached = cache.get(cache_key)
+        if cached is not None:
+            markdown_content, cached_metadata = cached
+            metadata = dict(cached_metadata)
+            metadata["file_path"] = str(pdf_file.absolute())
+            metadata["file_name"] = pdf_file.name
+            metadata["conversion_date"] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            metadata["cache_hit"] = True
+            with profiler.stage("cabecalho"):
+                enhanced_markdown = enhance_markdown_metadata(markdown_content, metadata)
+            with profiler.stage("gravacao"):
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                output_path.write_text(enhanced_markdown, encoding='utf-8')
+            with profiler.stage("indices"):
+                _write_chunk_index(output_path)
+                _update_search_index(output_path)
+            if verbose:
+                print(f"♻️  Reutilizado do cache: {pdf_file.name}", file=sys.stderr)
+                print(f"📄 Arquivo salvo em: {output_path}", file=sys.stderr)
+            finish_profile()
+            return str(output_path), metadata
     
     # Tenta conversão com engine escolhido
     try:
         if verbose:
             print(f"Usando engine: {engine_name}", file=sys.stderr)
         
-        if engine_name == "docling":
-            markdown_content, metadata = convert_with_docling(pdf_file)
-        elif engine_name == "pypdf":
-            markdown_content, metadata = convert_with_pypdf(pdf_file)
-        else:
-            raise ValueError(f"Engine desconhecido: {engine_name}")
+        with profiler.stage("extracao") as stage:
+            stage["engine"] = engine_name
+            if engine_name == "docling":
+                markdown_content, metadata = convert_with_docling(pdf_file, page_workers=page_workers)
+            elif engine_name == "pypdf" and stream:
+                # No modo streaming a extração já grava o Markdown
+                metadata = stream_with_pypdf(
+                    pdf_file, output_path, {"engine_used": "pypdf", "fallback_used": False},
+                    page_workers=page_workers
+                )
+                streamed = True
+            elif engine_name == "pypdf":
+                markdown_content, metadata = convert_with_pypdf(pdf_file, page_workers=page_workers)
+            else:
+                raise ValueError(f"Engine desconhecido: {engine_name}")
             
     except Exception as e:
         if verbose:
@@ -617,9 +987,19 @@ def convert_pdf_to_markdown(
             try:
                 if verbose:
                     print("Tentando fallback para pypdf...", file=sys.stderr)
-                markdown_content, metadata = convert_with_pypdf(pdf_file)
+                with profiler.stage("fallback") as stage:
+                    stage["engine"] = "pypdf"
+                    if stream:
+                        metadata = stream_with_pypdf(
+                            pdf_file, output_path, {"engine_used": "pypdf", "fallback_used": True},
+                            page_workers=page_workers
+                        )
+                        streamed = True
+                    else:
+                        markdown_content, metadata = convert_with_pypdf(pdf_file, page_workers=page_workers)
                 used_engine = "pypdf"
                 fallback_used = True
+                metadata["fallback_reason"] = f"{type(e).__name__}: {e}"
             except Exception as fallback_error:
                 raise RuntimeError(
                     f"Falha na conversão com {engine_name} e fallback para pypdf também falhou. "
@@ -632,12 +1012,26 @@ def convert_pdf_to_markdown(
     metadata["engine_used"] = used_engine
     metadata["fallback_used"] = fallback_used
     
-    # Melhora o Markdown com metadados
-    enhanced_markdown = enhance_markdown_metadata(markdown_content, metadata)
+    metadata["streamed"] = streamed
     
-    # Salva o arquivo
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(enhanced_markdown, encoding='utf-8')
+    # Só guarda no cache conversões sem fallback (falhas podem ser transitórias);
+    # no modo streaming o conteúdo já está em disco e não é mantido em memória
+    if cache_key is not None and not fallback_used and not streamed:
+        cache.put(cache_key, markdown_content, metadata)
+    
+    if not streamed:
+        # Melhora o Markdown com metadados
+        with profiler.stage("cabecalho"):
+            enhanced_markdown = enhance_markdown_metadata(markdown_content, metadata)
+        
+        # Salva o arquivo
+        with profiler.stage("gravacao"):
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            output_path.write_text(enhanced_markdown, encoding='utf-8')
+    
+    with profiler.stage("indices"):
+        _write_chunk_index(output_path)
+        _update_search_index(output_path)
     
     if verbose:
         print(f"✅ Conversão concluída usando {used_engine}", file=sys.stderr)
@@ -645,4 +1039,5 @@ def convert_pdf_to_markdown(
             print(f"⚠️  Fallback usado: {engine_name} → pypdf", file=sys.stderr)
         print(f"📄 Arquivo salvo em: {output_path}", file=sys.stderr)
     
+    finish_profile()
     return str(output_path), metadata
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Índice de busca textual sobre o Markdown de `memories/`.
+
+Editais, certidões e projetos anteriores convertidos para Markdown são
+indexados em um banco SQLite FTS5 (`memories/cache/search_index.sqlite`),
+uma linha por página (`## Página N`) ou seção (`## ...`), para que a consulta
+devolva o trecho e a âncora da página em vez do arquivo inteiro.
+
+A atualização é incremental: só arquivos com mtime/tamanho diferentes do
+registrado são reindexados. `convert_pdf_to_markdown` e
+`convert_excel_to_markdown` (pdf_converter.py) atualizam o índice ao gravar
+uma saída dentro de `memories/`, então a consulta não varre o disco; arquivos
+editados ou removidos à mão são sincronizados com `--atualizar`.
+
+Uso:
+    python search_index.py "prazo de submissão"
+    python search_index.py certidão negativa --limit 5
+    python search_index.py --atualizar
+    python search_index.py --reindex
+"""
+
+import os
+import re
+import sys
+import json
+import sqlite3
+import argparse
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Tuple
+
+from path_index import get_path_index
+
+
+INDEX_DB = "memories/cache/search_index.sqlite"
+INDEX_ROOT = "memories"
+
+_PAGE_RE = re.compile(r'^## Página (\d+)\s*$')
+_SECTION_RE = re.compile(r'^## (.+?)\s*$')
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS chunks USING fts5(
+    path UNINDEXED,
+    pagina UNINDEXED,
+    secao,
+    texto,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+
+def split_sections(text: str) -> List[Tuple[Optional[int], str, str]]:
+    """
+    Divide o Markdown em páginas (`## Página N`) ou seções de título
+
+    Returns:
+        Lista de (número da página ou None, título da seção, texto)
+    """
+    sections = []
+    page: Optional[int] = None
+    title = ""
+    lines: List[str] = []
+
+    def flush():
+        body = "\n".join(lines).strip()
+        if body:
+            sections.append((page, title, body))
+
+    for line in text.split("\n"):
+        page_match = _PAGE_RE.match(line)
+        section_match = None if page_match else _SECTION_RE.match(line)
+        if page_match or section_match:
+            flush()
+            lines = []
+            if page_match:
+                page = int(page_match.group(1))
+                title = f"Página {page}"
+            else:
+                page = None
+                title = section_match.group(1)
+        else:
+            lines.append(line)
+    flush()
+    return sections
+
+
+def anchor_for(title: str) -> str:
+    """Âncora Markdown (estilo GitHub) de um título"""
+    slug = re.sub(r'[^\w\- ]', '', title.strip().lower(), flags=re.UNICODE)
+    return slug.replace(" ", "-")
+
+
+def _fts_query(terms: List[str], any_term: bool = False) -> str:
+    """Converte termos livres em consulta FTS5 (cada palavra entre aspas)"""
+    tokens = [f'"{t}"' for t in _TOKEN_RE.findall(" ".join(terms))]
+    return (" OR " if any_term else " ").join(tokens)
+
+
+class SearchIndex:
+    """Índice FTS5 incremental de arquivos Markdown"""
+
+    def __init__(self, db_path: str = INDEX_DB, workspace: Optional[Path] = None):
+        self.workspace = Path(workspace or Path.cwd())
+        self.db_path = self.workspace / db_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Vários processos do lote podem atualizar o índice ao mesmo tempo
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def is_empty(self) -> bool:
+        """True se nenhum arquivo foi indexado ainda"""
+        return self.conn.execute("SELECT 1 FROM files LIMIT 1").fetchone() is None
+
+    def _key(self, md_path: Path) -> str:
+        path = Path(md_path).absolute()
+        try:
+            return str(path.relative_to(self.workspace))
+        except ValueError:
+            return str(path)
+
+    def update_file(self, md_path: Path, force: bool = False) -> bool:
+        """
+        Indexa (ou reindexa) um arquivo Markdown se ele mudou
+
+        Returns:
+            True se o arquivo foi reindexado
+        """
+        key = self._key(md_path)
+        try:
+            st = os.stat(md_path)
+        except OSError:
+            self.remove_file(key)
+            return False
+
+        row = self.conn.execute("SELECT mtime_ns, size FROM files WHERE path = ?", (key,)).fetchone()
+        if not force and row == (st.st_mtime_ns, st.st_size):
+            return False
+
+        try:
+            text = Path(md_path).read_text(encoding='utf-8')
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Aviso: Não foi possível indexar {md_path}: {e}", file=sys.stderr)
+            return False
+
+        with self.conn:
+            self.conn.execute("DELETE FROM chunks WHERE path = ?", (key,))
+            self.conn.executemany(
+                "INSERT INTO chunks (path, pagina, secao, texto) VALUES (?, ?, ?, ?)",
+                [(key, page, title, body) for page, title, body in split_sections(text)]
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO files (path, mtime_ns, size) VALUES (?, ?, ?)",
+                (key, st.st_mtime_ns, st.st_size)
+            )
+        return True
+
+    def remove_file(self, key: str):
+        """Remove um arquivo do índice"""
+        with self.conn:
+            self.conn.execute("DELETE FROM chunks WHERE path = ?", (key,))
+            self.conn.execute("DELETE FROM files WHERE path = ?", (key,))
+
+    def refresh(self, root: str = INDEX_ROOT) -> Dict[str, int]:
+        """
+        Sincroniza o índice com os .md de `root` (padrão: memories/)
+
+        A listagem vem do índice de caminhos (path_index.py), que só relista
+        diretórios alterados.
+
+        Returns:
+            Contagem de arquivos reindexados e removidos
+        """
+        path_index = get_path_index(self.workspace)
+        path_index.refresh()
+        path_index.save()
+
+        root = os.path.normpath(root)
+        current = set()
+        for rel_dir, entry in path_index.dirs.items():
+            if rel_dir != root and not rel_dir.startswith(root + os.sep):
+                continue
+            for name in entry["files"]:
+                if name.lower().endswith(".md"):
+                    current.add(os.path.join(rel_dir, name))
+
+        updated = sum(1 for rel in sorted(current) if self.update_file(self.workspace / rel))
+
+        root_prefix = root + os.sep
+        stale = [
+            key for (key,) in self.conn.execute("SELECT path FROM files")
+            if key.startswith(root_prefix) and key not in current
+        ]
+        for key in stale:
+            self.remove_file(key)
+
+        return {"updated": updated, "removed": len(stale)}
+
+    def search(self, terms: List[str], limit: int = 10, any_term: bool = False) -> List[Dict[str, Any]]:
+        """
+        Busca termos no índice
+
+        Args:
+            terms: Palavras da consulta (acentos e maiúsculas são ignorados)
+            limit: Número máximo de resultados
+            any_term: Se True, basta um dos termos (OR); senão todos (AND)
+
+        Returns:
+            Resultados do mais ao menos relevante (BM25), com arquivo, página,
+            âncora e trecho
+        """
+        query = _fts_query(terms, any_term)
+        if not query:
+            return []
+        rows = self.conn.execute(
+            """
+            SELECT path, pagina, secao, bm25(chunks) AS score,
+                   snippet(chunks, 3, '**', '**', '…', 16)
+            FROM chunks WHERE chunks MATCH ?
+            ORDER BY score LIMIT ?
+            """,
+            (query, limit)
+        ).fetchall()
+        return [
+            {
+                "path": path,
+                "pagina": pagina,
+                "secao": secao,
+                "ancora": f"{path}#{anchor_for(secao)}" if secao else path,
+                "score": -score,
+                "trecho": " ".join(snippet.split()),
+            }
+            for path, pagina, secao, score, snippet in rows
+        ]
+
+
+def update_index_for(md_path: Path, workspace: Optional[Path] = None):
+    """
+    Atualiza o índice após uma conversão (somente saídas dentro de memories/)
+
+    Falhas são apenas avisadas: o índice é auxiliar e não deve interromper
+    a conversão.
+    """
+    workspace = Path(workspace or Path.cwd())
+    try:
+        Path(md_path).absolute().relative_to(workspace / INDEX_ROOT)
+    except ValueError:
+        return
+    if not (workspace / INDEX_ROOT).is_dir():
+        return
+    try:
+        index = SearchIndex(workspace=workspace)
+        try:
+            index.update_file(Path(md_path))
+        finally:
+            index.close()
+    except sqlite3.Error as e:
+        print(f"Aviso: Erro ao atualizar índice de busca: {e}", file=sys.stderr)
+
+
+def main():
+    """Função principal CLI"""
+    parser = argparse.ArgumentParser(
+        description="Busca termos no Markdown de memories/ (editais, certidões, projetos)",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Exemplos:
+  python search_index.py "prazo de submissão"
+  python search_index.py certidão negativa --limit 5
+  python search_index.py inelegível vedado --ou
+  python search_index.py --atualizar "prazo de submissão"
+  python search_index.py --reindex
+        """
+    )
+
+    parser.add_argument(
+        "termos",
+        nargs="*",
+        help="Termos da busca (todos devem aparecer, salvo com --ou)"
+    )
+
+    parser.add_argument(
+        "--limit", "-n",
+        type=int,
+        default=10,
+        help="Número máximo de resultados (padrão: 10)"
+    )
+
+    parser.add_argument(
+        "--ou",
+        action="store_true",
+        help="Retorna trechos com qualquer um dos termos"
+    )
+
+    parser.add_argument(
+        "--atualizar",
+        action="store_true",
+        help="Sincroniza o índice com arquivos editados ou removidos fora das conversões"
+    )
+
+    parser.add_argument(
+        "--reindex",
+        action="store_true",
+        help="Reconstrói o índice do zero"
+    )
+
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Imprime os resultados em JSON"
+    )
+
+    args = parser.parse_args()
+
+    if not args.termos and not args.reindex and not args.atualizar:
+        parser.error("informe os termos da busca, --atualizar ou --reindex")
+
+    if not Path(INDEX_ROOT).is_dir():
+        print(f"❌ Erro: Diretório {INDEX_ROOT}/ não encontrado (execute na raiz do workspace)")
+        sys.exit(1)
+
+    index = SearchIndex()
+    if args.reindex:
+        with index.conn:
+            index.conn.execute("DELETE FROM chunks")
+            index.conn.execute("DELETE FROM files")
+    # As conversões já mantêm o índice; a consulta só varre memories/ quando
+    # pedido ou na primeira vez
+    if args.reindex or args.atualizar or index.is_empty():
+        stats = index.refresh()
+        print(f"🔄 Índice atualizado: {stats['updated']} arquivo(s) indexado(s), {stats['removed']} removido(s)",
+              file=sys.stderr)
+
+    if not args.termos:
+        index.close()
+        return
+
+    hits = index.search(args.termos, limit=args.limit, any_term=args.ou)
+    index.close()
+
+    if args.json:
+        print(json.dumps(hits, ensure_ascii=False, indent=2))
+        return
+
+    if not hits:
+        print(f"🔍 Nenhum resultado para: {' '.join(args.termos)}")
+        sys.exit(1)
+
+    print(f"🔍 {len(hits)} resultado(s) para: {' '.join(args.termos)}")
+    print("-" * 70)
+    for position, hit in enumerate(hits, 1):
+        print(f"{position:>3}. {hit['ancora']}")
+        print(f"     {hit['trecho']}")
+    print("-" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Teste diferencial dos limites de células ocupadas (XLSX -> Markdown).
+
+Compara `_OccupiedBounds` e `_stream_sheet_to_markdown_table` com a
+implementação original (`_trim_empty_edges` / `_sheet_to_markdown_table`,
+reproduzida abaixo) em matrizes aleatórias esparsas, incluindo linhas e
+colunas totalmente vazias e linhas de tamanhos diferentes.
+"""
+
+import random
+import sys
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pdf_converter import _OccupiedBounds, _stream_sheet_to_markdown_table  # noqa: E402
+
+
+# --- Implementação original (antes da passada única) ------------------------
+
+def _is_row_empty(row: List[str]) -> bool:
+    return all((c or "").strip() == "" for c in row)
+
+
+def _baseline_trim_empty_edges(matrix: List[List[str]]) -> List[List[str]]:
+    if not matrix:
+        return []
+    top = 0
+    while top < len(matrix) and _is_row_empty(matrix[top]):
+        top += 1
+    bottom = len(matrix) - 1
+    while bottom >= top and _is_row_empty(matrix[bottom]):
+        bottom -= 1
+    if bottom < top:
+        return []
+    trimmed = matrix[top : bottom + 1]
+    max_cols = max((len(r) for r in trimmed), default=0)
+    if max_cols == 0:
+        return []
+    normalized = [r + [""] * (max_cols - len(r)) for r in trimmed]
+    left = 0
+    while left < max_cols and all((row[left] or "").strip() == "" for row in normalized):
+        left += 1
+    right = max_cols - 1
+    while right >= left and all((row[right] or "").strip() == "" for row in normalized):
+        right -= 1
+    if right < left:
+        return []
+    return [row[left : right + 1] for row in normalized]
+
+
+def _markdown_escape_cell(value: str) -> str:
+    return (value or "").replace("|", "\\|").replace("\n", " ").strip()
+
+
+def _baseline_sheet_to_markdown_table(matrix, max_rows, max_cols):
+    meta = {"truncated": False, "rows": 0, "cols": 0}
+    if not matrix:
+        return "_(aba vazia)_\n", meta
+    matrix = _baseline_trim_empty_edges(matrix)
+    if not matrix:
+        return "_(aba vazia)_\n", meta
+    rows = matrix[:max_rows]
+    cols_len = min(max((len(r) for r in rows), default=0), max_cols)
+    rows = [r[:cols_len] + [""] * (cols_len - len(r[:cols_len])) for r in rows]
+    meta["rows"] = len(rows)
+    meta["cols"] = cols_len
+    if len(matrix) > max_rows or any(len(r) > max_cols for r in matrix):
+        meta["truncated"] = True
+    lines = ["| " + " | ".join(_markdown_escape_cell(c) or " " for c in rows[0]) + " |",
+             "| " + " | ".join(["---"] * cols_len) + " |"]
+    for r in rows[1:]:
+        lines.append("| " + " | ".join(_markdown_escape_cell(c) for c in r) + " |")
+    return "\n".join(lines) + "\n", meta
+
+
+# --- Geração das matrizes ---------------------------------------------------
+
+def _random_raw_rows(rng: random.Random) -> List[tuple]:
+    """Linhas como as de `ws.iter_rows(values_only=True)`, mas possivelmente irregulares"""
+    n_rows = rng.randint(0, 12)
+    width = rng.randint(0, 9)
+    density = rng.choice([0.0, 0.05, 0.2, 0.6])
+    empty_col = rng.randrange(width) if width and rng.random() < 0.5 else None
+    rows = []
+    for _ in range(n_rows):
+        row_width = width if rng.random() < 0.6 else rng.randint(0, width + 3)
+        if rng.random() < 0.25:
+            # linha totalmente vazia
+            rows.append(tuple(rng.choice([None, "", "  "]) for _ in range(row_width)))
+            continue
+        row = []
+        for c in range(row_width):
+            if c == empty_col or rng.random() >= density:
+                row.append(rng.choice([None, "", " "]))
+            else:
+                row.append(rng.choice(["x", "a|b", 0, 12.5, "linha\nquebrada", " y "]))
+        rows.append(tuple(row))
+    return rows
+
+
+def _as_matrix(raw_rows: List[tuple]) -> List[List[str]]:
+    return [["" if v is None else str(v) for v in row] for row in raw_rows]
+
+
+def _trim_with_bounds(matrix: List[List[str]]) -> List[List[str]]:
+    bounds = _OccupiedBounds()
+    for row in matrix:
+        bounds.add(row)
+    if bounds.top is None:
+        return []
+    width = bounds.right - bounds.left + 1
+    trimmed = []
+    for row in matrix[bounds.top : bounds.bottom + 1]:
+        cells = row[bounds.left : bounds.right + 1]
+        trimmed.append(cells + [""] * (width - len(cells)))
+    return trimmed
+
+
+# --- Testes -------------------------------------------------------------------
+
+def test_bounds_match_baseline_trim():
+    rng = random.Random(20240501)
+    for _ in range(5000):
+        matrix = _as_matrix(_random_raw_rows(rng))
+        assert _trim_with_bounds(matrix) == _baseline_trim_empty_edges(matrix), matrix
+
+
+def test_stream_renderer_matches_baseline_without_row_truncation():
+    rng = random.Random(7)
+    for _ in range(5000):
+        raw_rows = _random_raw_rows(rng)
+        max_cols = rng.randint(1, 10)
+        # Sem truncamento de linhas, a janela lida é a planilha inteira
+        max_rows = len(raw_rows) + 1
+        expected = _baseline_sheet_to_markdown_table(_as_matrix(raw_rows), max_rows, max_cols)
+        assert _stream_sheet_to_markdown_table(iter(raw_rows), max_rows, max_cols) == expected, raw_rows
+
+
+def test_stream_renderer_row_truncation():
+    rng = random.Random(11)
+    for _ in range(2000):
+        raw_rows = _random_raw_rows(rng)
+        max_rows = rng.randint(1, 4)
+        table, meta = _stream_sheet_to_markdown_table(iter(raw_rows), max_rows, 30)
+        _, baseline_meta = _baseline_sheet_to_markdown_table(_as_matrix(raw_rows), max_rows, 30)
+        # Mesmas linhas exibidas e mesmo aviso de truncamento de linhas; as colunas
+        # vazias são removidas só com base na janela exibida (podem ser menos)
+        assert meta["rows"] == baseline_meta["rows"]
+        assert meta["cols"] <= baseline_meta["cols"] or baseline_meta["cols"] == 0
+        if baseline_meta["rows"] and len(_baseline_trim_empty_edges(_as_matrix(raw_rows))) > max_rows:
+            assert meta["truncated"]
+
+
+def test_all_empty_sheets():
+    for raw_rows in ([], [()], [(None, None)], [("", " "), (None,)], [(None,)] * 5):
+        assert _stream_sheet_to_markdown_table(iter(raw_rows), 200, 30)[0] == "_(aba vazia)_\n"
+        assert _trim_with_bounds(_as_matrix(raw_rows)) == []
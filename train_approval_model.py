@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Treina o modelo calibrado de aprovação a partir do histórico de editais.
+
+Lê as tabelas "Editais Aprovados" e "Editais Não Aprovados" de cada
+HISTORICO_EDITAIS.md, localiza os arquivos de fase arquivados na coluna
+"Pasta" e calcula os scores por critério do approval_predictor.py. Com esses
+scores (features) e o resultado de cada edital (rótulo), ajusta uma regressão
+logística regularizada (L2) e salva os coeficientes em JSON, carregados pelo
+ApprovalPredictor com `--model`. Os limiares de classificação (BAIXA, MÉDIA,
+MÉDIA-ALTA, ALTA) continuam absolutos, sobre a probabilidade calibrada, e são
+gravados junto com os coeficientes.
+
+Uso:
+    python train_approval_model.py
+    python train_approval_model.py memories/organizations/minha-org --l2 0.5
+"""
+
+import re
+import sys
+import argparse
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
+
+from approval_predictor import (
+    CRITERIA,
+    DEFAULT_MODEL_FILE,
+    DEFAULT_SCORE_CACHE,
+    MISSING_SCORE,
+    NUMPY_AVAILABLE,
+    PROBABILITY_THRESHOLDS,
+    ApprovalModel,
+    ApprovalPredictor,
+    ScoreCache,
+    find_proposal_files,
+    resolve_score_cache,
+)
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+
+HISTORY_FILE = "HISTORICO_EDITAIS.md"
+
+# Pastas onde o workflow arquivar-projeto guarda os editais concluídos
+ARCHIVE_DIRS = ["editais-anteriores", "projetos_anteriores"]
+
+_LINK_RE = re.compile(r'\[[^\]]*\]\(([^)]+)\)')
+
+
+def _history_label(heading: str) -> Optional[int]:
+    """Rótulo de uma seção do histórico: 1 aprovado, 0 não aprovado, None ignorada"""
+    heading = heading.lower()
+    if "não aprovad" in heading or "nao aprovad" in heading or "reprovad" in heading:
+        return 0
+    if "aprovad" in heading:
+        return 1
+    return None
+
+
+def _split_row(line: str) -> List[str]:
+    return [cell.strip() for cell in line.strip().strip("|").split("|")]
+
+
+def parse_history(history_file: Path) -> List[Dict]:
+    """
+    Extrai os editais com resultado conhecido de um HISTORICO_EDITAIS.md
+
+    Returns:
+        Lista de {"edital", "pasta", "aprovado"} (linhas de exemplo "-" são ignoradas)
+    """
+    entries = []
+    label = None
+    header = None
+
+    for line in history_file.read_text(encoding='utf-8').splitlines():
+        stripped = line.strip()
+        if stripped.startswith("#"):
+            label = _history_label(stripped) if stripped.startswith("## ") else label
+            header = None
+            continue
+        if not stripped.startswith("|"):
+            header = None
+            continue
+        if label is None:
+            continue
+
+        cells = _split_row(stripped)
+        if header is None:
+            header = [c.lower() for c in cells]
+            continue
+        if all(set(c) <= set("-: ") for c in cells):
+            continue  # separador ou linha de exemplo
+        row = dict(zip(header, cells))
+        if "pasta" not in row:
+            continue
+        entries.append({
+            "edital": row.get("edital", ""),
+            "pasta": row["pasta"],
+            "aprovado": label,
+        })
+
+    return entries
+
+
+def resolve_project_dir(pasta: str, org_dir: Path) -> Optional[Path]:
+    """
+    Localiza a pasta arquivada de um edital a partir da célula "Pasta"
+
+    Aceita link Markdown, caminho entre crases ou texto simples, relativo à
+    organização, às pastas de arquivo ou ao diretório atual.
+    """
+    link = _LINK_RE.search(pasta)
+    target = (link.group(1) if link else pasta).strip().strip("`").strip()
+    if not target or target == "-":
+        return None
+
+    candidates = [Path(target), org_dir / target]
+    candidates += [org_dir / archive / target for archive in ARCHIVE_DIRS]
+    candidates += [Path("memories") / archive / target for archive in ARCHIVE_DIRS]
+
+    for candidate in candidates:
+        for project_dir in (candidate / "projeto", candidate):
+            if project_dir.is_dir() and find_proposal_files(project_dir):
+                return project_dir
+    return None
+
+
+def build_dataset(
+    roots: List[str],
+    cache_path: Optional[str] = DEFAULT_SCORE_CACHE
+) -> Tuple[List[Dict[str, float]], List[int], List[Dict]]:
+    """
+    Monta o conjunto de treino a partir dos históricos encontrados em `roots`
+
+    Returns:
+        Tupla (scores por critério, rótulos, descrição de cada amostra)
+    """
+    history_files = []
+    for root in roots:
+        root_path = Path(root)
+        if root_path.is_file():
+            history_files.append(root_path)
+        elif root_path.is_dir():
+            history_files.extend(sorted(root_path.rglob(HISTORY_FILE)))
+
+    cache = ScoreCache(cache_path) if cache_path else None
+    predictor = ApprovalPredictor(cache=cache)
+
+    features, labels, samples = [], [], []
+    for history_file in history_files:
+        org_dir = history_file.parent
+        for entry in parse_history(history_file):
+            project_dir = resolve_project_dir(entry["pasta"], org_dir)
+            if project_dir is None:
+                print(f"⚠️  Pasta não encontrada para '{entry['edital']}' ({history_file})")
+                continue
+            features.append(predictor._score_criteria(find_proposal_files(project_dir)))
+            labels.append(entry["aprovado"])
+            samples.append({"edital": entry["edital"], "projeto": str(project_dir), "aprovado": entry["aprovado"]})
+
+    if cache is not None:
+        cache.save()
+    return features, labels, samples
+
+
+def fit_logistic(features: List[Dict[str, float]], labels: List[int], l2: float = 1.0, max_iter: int = 50):
+    """
+    Ajusta uma regressão logística com regularização L2 (método de Newton)
+
+    O intercepto não é regularizado. Critérios ausentes recebem MISSING_SCORE.
+
+    Returns:
+        Tupla (coeficientes por critério, intercepto)
+    """
+    X = np.array([[f.get(c, MISSING_SCORE) for c in CRITERIA] for f in features], dtype=float)
+    X = np.hstack([np.ones((len(X), 1)), X])
+    y = np.asarray(labels, dtype=float)
+
+    penalty = np.full(X.shape[1], float(l2))
+    penalty[0] = 0.0
+    beta = np.zeros(X.shape[1])
+
+    for _ in range(max_iter):
+        p = 0.5 * (1.0 + np.tanh(0.5 * (X @ beta)))
+        gradient = X.T @ (p - y) + penalty * beta
+        hessian = (X * (p * (1.0 - p))[:, None]).T @ X + np.diag(penalty)
+        # Pequeno reforço na diagonal evita matriz singular com poucos editais
+        step = np.linalg.solve(hessian + 1e-9 * np.eye(len(beta)), gradient)
+        beta -= step
+        if np.max(np.abs(step)) < 1e-8:
+            break
+
+    return dict(zip(CRITERIA, beta[1:].tolist())), float(beta[0])
+
+
+def evaluate(model: ApprovalModel, features: List[Dict[str, float]], labels: List[int]) -> Dict[str, float]:
+    """Métricas no conjunto de treino: log-loss, Brier e acurácia (limiar 50%)"""
+    p = np.clip(np.asarray(model.predict_batch(features)), 1e-12, 1 - 1e-12)
+    y = np.asarray(labels, dtype=float)
+    return {
+        "log_loss": float(-np.mean(y * np.log(p) + (1 - y) * np.log(1 - p))),
+        "brier": float(np.mean((p - y) ** 2)),
+        "accuracy": float(np.mean((p >= 0.5) == (y == 1))),
+    }
+
+
+def main():
+    """Função principal CLI"""
+    parser = argparse.ArgumentParser(
+        description="Treina o modelo calibrado de aprovação com o histórico de editais",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Exemplos:
+  python train_approval_model.py
+  python train_approval_model.py memories/organizations/minha-org
+  python train_approval_model.py memories/organizations --l2 0.5 --output modelo.json
+        """
+    )
+
+    parser.add_argument(
+        "historicos",
+        nargs="*",
+        default=["memories/organizations"],
+        help=f"Arquivos {HISTORY_FILE} ou diretórios onde procurá-los (padrão: memories/organizations)"
+    )
+
+    parser.add_argument(
+        "--output", "-o",
+        default=DEFAULT_MODEL_FILE,
+        help=f"Arquivo do modelo treinado (padrão: {DEFAULT_MODEL_FILE})"
+    )
+
+    parser.add_argument(
+        "--l2",
+        type=float,
+        default=1.0,
+        help="Força da regularização L2; maior = coeficientes mais conservadores (padrão: 1.0)"
+    )
+
+    parser.add_argument(
+        "--cache",
+        default=DEFAULT_SCORE_CACHE,
+        help=f"Cache de scores por conteúdo dos arquivos de fase (padrão: {DEFAULT_SCORE_CACHE} no workspace)"
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Reanalisa todos os arquivos, sem usar o cache de scores"
+    )
+
+    args = parser.parse_args()
+
+    if not NUMPY_AVAILABLE:
+        print("❌ Erro: NumPy não está disponível. Instale com: pip install numpy")
+        sys.exit(1)
+
+    cache_path = None if args.no_cache else resolve_score_cache(args.cache, args.historicos)
+    features, labels, samples = build_dataset(args.historicos, cache_path)
+
+    positives = sum(labels)
+    print(f"📊 Editais com resultado: {len(labels)} ({positives} aprovados, {len(labels) - positives} não aprovados)")
+    if positives == 0 or positives == len(labels):
+        print("❌ Erro: São necessários editais aprovados e não aprovados com pasta arquivada para treinar")
+        sys.exit(1)
+
+    coefficients, intercept = fit_logistic(features, labels, l2=args.l2)
+    model = ApprovalModel(coefficients, intercept, {
+        "samples": len(labels),
+        "approved": positives,
+        "l2": args.l2,
+        "trained_at": datetime.now().isoformat(),
+    })
+    metrics = evaluate(model, features, labels)
+    model.info["metrics"] = metrics
+    model.thresholds = dict(PROBABILITY_THRESHOLDS)
+
+    print("")
+    print("🧮 COEFICIENTES")
+    print("-" * 50)
+    print(f"{'intercepto':.<35} {intercept:+.3f}")
+    for criterion, coef in coefficients.items():
+        print(f"{criterion:.<35} {coef:+.3f}")
+    print("-" * 50)
+    print(f"Log-loss: {metrics['log_loss']:.3f}  Brier: {metrics['brier']:.3f}  Acurácia: {metrics['accuracy']*100:.0f}%")
+    print("Limiares: " + "  ".join(f"{name} {value*100:.1f}%" for name, value in model.thresholds.items()))
+
+    try:
+        model.save(args.output)
+    except OSError as e:
+        print(f"❌ Erro ao salvar modelo: {e}")
+        sys.exit(1)
+    print(f"💾 Modelo salvo em: {args.output}")
+
+
+if __name__ == "__main__":
+    main()